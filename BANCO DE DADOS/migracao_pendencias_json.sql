@@ -0,0 +1,101 @@
+--
+-- Migração: tabelas/colunas exigidas pelo formato JSON das pendências
+-- (usadas por NEXUS/gerenciador_pendencias_postgres.py)
+--
+-- Rodar depois de estrutura.sql:
+--   psql -U postgres -d "Nexus_DB" -f migracao_pendencias_json.sql
+--
+-- Pode ser executada mais de uma vez.
+--
+
+BEGIN;
+
+--
+-- Clientes (objeto "cliente" do JSON). CNPJ único quando informado.
+--
+
+CREATE TABLE IF NOT EXISTS nexus.clientes (
+    id_cliente serial PRIMARY KEY,
+    cnpj character varying(20) UNIQUE,
+    razao_social text,
+    telefone text,
+    cidade text,
+    contato text,
+    email text,
+    inscricao_estadual text,
+    endereco text
+);
+
+ALTER TABLE nexus.clientes OWNER TO postgres;
+
+--
+-- Colunas novas em pendencias:
+--   pasta           -> pasta de status (ATIVAS, ARQUIVADAS, ...)
+--   total_propostas -> quantidade de propostas vinculadas (lista sem abrir o documento)
+--   documento       -> JSON completo da pendência, sem o histórico
+--   id_cliente      -> cliente da pendência
+--   versao_seq      -> contador de gravações (metadata.versao_seq), usado no
+--                      compare-and-swap de cada gravação
+--
+
+ALTER TABLE nexus.pendencias
+    ADD COLUMN IF NOT EXISTS pasta character varying(20) NOT NULL DEFAULT 'ATIVAS',
+    ADD COLUMN IF NOT EXISTS total_propostas integer NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS documento jsonb,
+    ADD COLUMN IF NOT EXISTS id_cliente integer,
+    ADD COLUMN IF NOT EXISTS versao_seq integer NOT NULL DEFAULT 0;
+
+-- Pendências importadas antes da coluna existir
+UPDATE nexus.pendencias
+   SET versao_seq = (documento->'metadata'->>'versao_seq')::integer
+ WHERE versao_seq = 0 AND documento->'metadata'->>'versao_seq' ~ '^[0-9]+$';
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_pend_cliente') THEN
+        ALTER TABLE nexus.pendencias
+            ADD CONSTRAINT fk_pend_cliente FOREIGN KEY (id_cliente) REFERENCES nexus.clientes(id_cliente);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_pend_usuario') THEN
+        ALTER TABLE nexus.pendencias
+            ADD CONSTRAINT fk_pend_usuario FOREIGN KEY (id_usuario) REFERENCES nexus.usuarios(codigo_usuario);
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_pendencias_pasta_numero ON nexus.pendencias (pasta, numero);
+CREATE INDEX IF NOT EXISTS idx_pendencias_situacao ON nexus.pendencias (situacao);
+CREATE INDEX IF NOT EXISTS idx_pendencias_status ON nexus.pendencias (status);
+CREATE INDEX IF NOT EXISTS idx_pendencias_id_usuario ON nexus.pendencias (id_usuario);
+CREATE INDEX IF NOT EXISTS idx_pendencias_id_setor ON nexus.pendencias (id_setor);
+CREATE INDEX IF NOT EXISTS idx_pendencias_data_criacao ON nexus.pendencias (data_criacao);
+
+--
+-- Histórico (lista "historico" do JSON), uma linha por entrada
+--
+
+CREATE TABLE IF NOT EXISTS nexus.pendencias_historico (
+    id bigserial PRIMARY KEY,
+    id_pendencia integer NOT NULL REFERENCES nexus.pendencias(id) ON DELETE CASCADE,
+    seq integer NOT NULL,
+    data timestamp without time zone,
+    usuario character varying(100),
+    status_anterior text,
+    status_novo text,
+    entrada jsonb NOT NULL,
+    CONSTRAINT pendencias_historico_seq_key UNIQUE (id_pendencia, seq)
+);
+
+ALTER TABLE nexus.pendencias_historico OWNER TO postgres;
+
+--
+-- Contador diário de números (AAMMDD -> último sufixo)
+--
+
+CREATE TABLE IF NOT EXISTS nexus.pendencias_sequencial (
+    prefixo character(6) PRIMARY KEY,
+    ultimo integer NOT NULL
+);
+
+ALTER TABLE nexus.pendencias_sequencial OWNER TO postgres;
+
+COMMIT;
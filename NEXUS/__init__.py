@@ -3,9 +3,11 @@
 Módulo de Gerenciadores de Negócio
 """
 
-from .gerenciador_pendencias_json import GerenciadorPendenciasJSON
+from .gerenciador_pendencias_json import GerenciadorPendenciasJSON, obter_gerenciador_pendencias
+from .gerenciador_pendencias_sqlite import GerenciadorPendenciasSQLite
+from .gerenciador_pendencias_postgres import GerenciadorPendenciasPostgres
 # RastreadorPropostas removido - funcionalidade de rastreamento de propostas foi descontinuada
 # GerenciadorPrecos removido - funcionalidade de busca de preços no Excel foi descontinuada
 
-__all__ = ['GerenciadorPendenciasJSON']
+__all__ = ['GerenciadorPendenciasJSON', 'GerenciadorPendenciasSQLite', 'GerenciadorPendenciasPostgres', 'obter_gerenciador_pendencias']
 
@@ -6,7 +6,7 @@ Responsável por alterar o status/situação de uma pendência selecionada
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from gerenciador_pendencias_json import GerenciadorPendenciasJSON
+from gerenciador_pendencias_json import obter_gerenciador_pendencias
 from datetime import datetime
 
 class AtualizadorSituacao:
@@ -102,7 +102,7 @@ class AtualizadorSituacao:
                 try:
                     # Suportar tanto 'usuario' (canônico) quanto 'vendedor' (compatibilidade)
                     usuario = (dados_pendencia.get('usuario') or dados_pendencia.get('vendedor') or '').strip() or 'Sistema'
-                    ger_pend = GerenciadorPendenciasJSON()
+                    ger_pend = obter_gerenciador_pendencias()
                     sucesso = ger_pend.atualizar_status(numero_pendencia, nova_situacao, '', usuario)
                     if sucesso:
                         messagebox.showinfo("Sucesso", f"Situação alterada com sucesso!\n\n{numero_pendencia}: {situacao_atual} → {nova_situacao}")
@@ -135,7 +135,7 @@ def atualizar_situacao(numero_pendencia: str, nova_situacao: str, observacao: st
     if not (nova_situacao and nova_situacao.strip()):
         return False
     try:
-        ger = GerenciadorPendenciasJSON()
+        ger = obter_gerenciador_pendencias()
         return ger.atualizar_status(numero_pendencia, nova_situacao.strip(), observacao or '', usuario or 'Sistema')
     except Exception:
         return False
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de Documentos de Pendências
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Cache LRU dos JSON já interpretados, validado por os.stat (mtime_ns +
+tamanho). Um arquivo que não mudou custa um stat em vez de
+open + read + json.load a cada ciclo de atualização automática.
+
+ListagemDiretorios guarda os nomes dos arquivos de cada pasta em uma lista
+ordenada, revalidada pelo mtime do diretório. Como os nomes começam pela
+data (AAMMDD), um período vira uma busca binária (bisect) na lista, e
+navegar entre semanas não relista a pasta.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+
+class CacheDocumentos:
+    """Cache LRU de documentos JSON validado por (tamanho, mtime_ns)"""
+
+    # Limite padrão, medido pelo tamanho dos arquivos JSON em disco
+    LIMITE_BYTES_PADRAO = 32 * 1024 * 1024
+
+    _compartilhado = None
+    _compartilhado_lock = threading.Lock()
+
+    def __init__(self, limite_bytes=None):
+        """
+        Inicializa o cache
+
+        Args:
+            limite_bytes: Soma máxima do tamanho (em disco) dos documentos mantidos
+        """
+        self.limite_bytes = int(limite_bytes or self.LIMITE_BYTES_PADRAO)
+        # caminho -> (tamanho, mtime_ns, documento)
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.acertos = 0
+        self.falhas = 0
+
+    @classmethod
+    def compartilhado(cls, limite_bytes=None):
+        """
+        Retorna o cache único do processo
+
+        Args:
+            limite_bytes: Limite aplicado na criação (ignorado depois)
+
+        Returns:
+            CacheDocumentos: Cache compartilhado
+        """
+        with cls._compartilhado_lock:
+            if cls._compartilhado is None:
+                cls._compartilhado = cls(limite_bytes)
+            return cls._compartilhado
+
+    def obter(self, caminho, st):
+        """
+        Retorna o documento em cache se o arquivo não mudou
+
+        Args:
+            caminho: Path do arquivo
+            st: os.stat_result atual do arquivo
+
+        Returns:
+            dict: Documento (compartilhado, não alterar) ou None
+        """
+        chave = str(caminho)
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] == st.st_size and item[1] == st.st_mtime_ns:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return item[2]
+            self.falhas += 1
+            return None
+
+    def guardar(self, caminho, st, documento):
+        """
+        Guarda um documento recém-lido ou gravado
+
+        Args:
+            caminho: Path do arquivo
+            st: os.stat_result do arquivo correspondente ao documento
+            documento: Dict interpretado (não deve ser alterado depois)
+        """
+        chave = str(caminho)
+        tamanho = st.st_size
+        if tamanho > self.limite_bytes:
+            return
+
+        with self._lock:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[0]
+
+            self._itens[chave] = (tamanho, st.st_mtime_ns, documento)
+            self._bytes += tamanho
+
+            # Descartar os menos usados até caber no limite
+            while self._bytes > self.limite_bytes and self._itens:
+                _, (tamanho_antigo, _, _) = self._itens.popitem(last=False)
+                self._bytes -= tamanho_antigo
+
+    def invalidar(self, caminho):
+        """Remove um arquivo do cache (movido/apagado)"""
+        with self._lock:
+            item = self._itens.pop(str(caminho), None)
+            if item is not None:
+                self._bytes -= item[0]
+
+    def limpar(self):
+        """Esvazia o cache e zera os contadores"""
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+            self.acertos = 0
+            self.falhas = 0
+
+    def estatisticas(self):
+        """
+        Retorna os contadores do cache
+
+        Returns:
+            dict: {'acertos', 'falhas', 'taxa_acerto', 'documentos', 'bytes', 'limite_bytes'}
+        """
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': (self.acertos / total) if total else 0.0,
+                'documentos': len(self._itens),
+                'bytes': self._bytes,
+                'limite_bytes': self.limite_bytes,
+            }
+
+
+class ArquivoListado:
+    """Arquivo vindo da listagem em memória (mesma interface usada do os.DirEntry)"""
+
+    __slots__ = ('name', 'path', '_stat')
+
+    def __init__(self, diretorio, nome):
+        self.name = nome
+        self.path = os.path.join(diretorio, nome)
+        self._stat = None
+
+    def stat(self):
+        """os.stat do arquivo (consultado na primeira chamada)"""
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+
+class ListagemDiretorios:
+    """Nomes .json ordenados por diretório, relistados só quando o diretório muda"""
+
+    # Listagem feita a menos de N segundos do mtime do diretório não é
+    # considerada definitiva (resolução do mtime em compartilhamentos de rede)
+    MARGEM_MTIME = 2.0
+
+    _compartilhado = None
+    _compartilhado_lock = threading.Lock()
+
+    def __init__(self):
+        # diretório -> (mtime_ns, definitiva, [nomes ordenados])
+        self._listas = {}
+        self._lock = threading.Lock()
+
+        self.relistagens = 0
+
+    @classmethod
+    def compartilhado(cls):
+        """Retorna a listagem única do processo"""
+        with cls._compartilhado_lock:
+            if cls._compartilhado is None:
+                cls._compartilhado = cls()
+            return cls._compartilhado
+
+    def listar(self, diretorio, inicio=None, fim=None):
+        """
+        Arquivos .json do diretório cujo nome está no intervalo [inicio, fim]
+
+        Custa um stat do diretório; a pasta só é relistada se o mtime mudou.
+
+        Args:
+            diretorio: Path do diretório
+            inicio: Prefixo mínimo do nome (ex.: '260112'); None = sem limite
+            fim: Prefixo máximo do nome (inclusivo); None = sem limite
+
+        Returns:
+            list: os.DirEntry (se relistou agora) ou ArquivoListado, em ordem de nome
+
+        Raises:
+            OSError: Se o diretório não puder ser lido
+        """
+        chave = str(diretorio)
+        mtime_ns = os.stat(chave).st_mtime_ns
+
+        with self._lock:
+            lista = self._listas.get(chave)
+        if lista is not None and lista[0] == mtime_ns and lista[1]:
+            nomes = lista[2]
+            de, ate = self._faixa(nomes, inicio, fim)
+            return [ArquivoListado(chave, nome) for nome in nomes[de:ate]]
+
+        # Diretório mudou: relistar (scandir já traz o stat, sem ida extra à rede no Windows)
+        with os.scandir(chave) as it:
+            itens = sorted((item for item in it if item.name.endswith('.json')),
+                           key=lambda item: item.name)
+        nomes = [item.name for item in itens]
+        definitiva = (time.time() - mtime_ns / 1e9) > self.MARGEM_MTIME
+
+        with self._lock:
+            self._listas[chave] = (mtime_ns, definitiva, nomes)
+            self.relistagens += 1
+
+        de, ate = self._faixa(nomes, inicio, fim)
+        return itens[de:ate]
+
+    @staticmethod
+    def _faixa(nomes, inicio, fim):
+        """Índices [de, ate) dos nomes dentro do intervalo de prefixos"""
+        de = bisect_left(nomes, inicio) if inicio else 0
+        # '\uffff' após o prefixo: inclui todos os nomes que começam com 'fim'
+        ate = bisect_right(nomes, fim + '\uffff') if fim else len(nomes)
+        return de, ate
+
+    def invalidar(self, diretorio=None):
+        """Descarta a listagem de um diretório (ou de todos)"""
+        with self._lock:
+            if diretorio is None:
+                self._listas.clear()
+            else:
+                self._listas.pop(str(diretorio), None)
@@ -0,0 +1,585 @@
+# -*- coding: utf-8 -*-
+"""
+Catálogo e Índices Persistentes de Pendências
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+CatalogoPendencias mantém um índice numero → pasta/arquivo (com tamanho,
+mtime e versão) para que a localização de uma pendência seja uma consulta em
+dicionário, sem testar exists() em cada pasta de status (cada teste é uma
+ida e volta na rede).
+
+IndiceResumo guarda, para cada arquivo, os campos exibidos na lista de
+pendências (número, datas, situação...) validados por (mtime_ns, tamanho).
+A lista só precisa abrir os arquivos que mudaram desde a última leitura.
+Dele derivam os índices secundários (usuario/setor/situacao/status →
+números), refeitos a partir de resumo.json ao carregar, usados para
+filtrar e contar sem abrir documentos.
+
+Os índices são apenas dicas: se o arquivo apontado não existir mais ou
+tiver mudado (outro computador alterou), o gerenciador relê o arquivo e
+corrige a entrada.
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    from layout_pendencias import LayoutPlano
+    from serializacao_json import carregar_json
+    from travas_arquivo import escrever_json_atomico
+except ImportError:
+    from .layout_pendencias import LayoutPlano
+    from .serializacao_json import carregar_json
+    from .travas_arquivo import escrever_json_atomico
+
+
+# Instâncias compartilhadas por arquivo de índice (várias instâncias do
+# gerenciador no mesmo processo reaproveitam os mesmos índices em memória)
+_INSTANCIAS = {}
+_INSTANCIAS_LOCK = threading.Lock()
+
+
+def chave_stat(st):
+    """Retorna (tamanho, mtime_ns) de um os.stat_result (ou (0, 0))"""
+    if st is None:
+        return 0, 0
+    return st.st_size, st.st_mtime_ns
+
+
+class IndicePersistente:
+    """Base para índices mantidos em memória e gravados em _INDICES"""
+
+    NOME_ARQUIVO = None
+    VERSAO_FORMATO = 1
+    DESCRICAO = "índice"
+
+    # Intervalo mínimo (segundos) entre gravações em disco. As alterações
+    # ficam em memória e são gravadas na próxima alteração após o
+    # intervalo ou ao encerrar o programa.
+    INTERVALO_PERSISTENCIA = 5.0
+
+    def __init__(self, pasta_indices):
+        """
+        Inicializa o índice
+
+        Args:
+            pasta_indices: Path da pasta onde o índice é persistido
+        """
+        self.arquivo = Path(pasta_indices) / self.NOME_ARQUIVO
+        self._lock = threading.RLock()
+        self._sujo = False
+        self._ultima_persistencia = 0.0
+
+    @classmethod
+    def _obter_compartilhado(cls, pasta_indices, fabrica):
+        """Retorna a instância compartilhada (cria com fabrica() na primeira vez)"""
+        chave = (cls.__name__, str((Path(pasta_indices) / cls.NOME_ARQUIVO).resolve()))
+        with _INSTANCIAS_LOCK:
+            instancia = _INSTANCIAS.get(chave)
+            if instancia is None:
+                instancia = fabrica()
+                _INSTANCIAS[chave] = instancia
+                atexit.register(instancia.salvar)
+            return instancia
+
+    def _dados_persistidos(self):
+        """Conteúdo a gravar (sem o cabeçalho de versão)"""
+        raise NotImplementedError
+
+    def _aplicar_persistidos(self, dados):
+        """Carrega o conteúdo lido do disco"""
+        raise NotImplementedError
+
+    def _carregar(self):
+        """Carrega o índice persistido (se existir e for compatível)"""
+        try:
+            with open(self.arquivo, 'rb') as f:
+                dados = carregar_json(f.read())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"⚠️ {self.DESCRICAO.capitalize()} inválido, será reconstruído: {e}")
+            return
+
+        if dados.get('versao_formato') != self.VERSAO_FORMATO:
+            return
+        self._aplicar_persistidos(dados)
+
+    def _marcar_alterado(self):
+        """Marca o índice como alterado e grava se o intervalo já passou"""
+        with self._lock:
+            self._sujo = True
+        if time.monotonic() - self._ultima_persistencia >= self.INTERVALO_PERSISTENCIA:
+            self.salvar()
+
+    def salvar(self):
+        """
+        Grava o índice em disco (gravação atômica)
+
+        Returns:
+            bool: True se gravou
+        """
+        with self._lock:
+            if not self._sujo:
+                return False
+            dados = {'versao_formato': self.VERSAO_FORMATO}
+            dados.update(self._dados_persistidos())
+            self._sujo = False
+            self._ultima_persistencia = time.monotonic()
+
+        try:
+            self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+            escrever_json_atomico(self.arquivo, dados, ensure_ascii=False, separators=(',', ':'))
+            return True
+        except Exception as e:
+            print(f"⚠️ Erro ao salvar {self.DESCRICAO}: {e}")
+            with self._lock:
+                self._sujo = True
+            return False
+
+
+class CatalogoPendencias(IndicePersistente):
+    """Índice persistente numero → localização do arquivo JSON"""
+
+    NOME_ARQUIVO = "catalogo.json"
+    VERSAO_FORMATO = 2
+    DESCRICAO = "catálogo"
+
+    def __init__(self, pasta_registros, pastas_status, pasta_indices, layout=None):
+        """
+        Inicializa o catálogo
+
+        Args:
+            pasta_registros: Path da pasta PENDENCIAS
+            pastas_status: Lista de pastas de status a catalogar
+            pasta_indices: Path da pasta onde o catálogo é persistido
+            layout: Layout das pastas (None = LayoutPlano)
+        """
+        super().__init__(pasta_indices)
+        self.pasta_registros = Path(pasta_registros)
+        self.pastas_status = list(pastas_status)
+        self.layout = layout or LayoutPlano(self.pasta_registros)
+
+        # numero -> {'pasta', 'arquivo' (relativo à PENDENCIAS), 'tamanho', 'mtime_ns', 'versao'}
+        self.entradas = {}
+        # diretório (relativo) -> mtime_ns na última sincronização
+        self._mtime_pastas = {}
+
+        self._carregar()
+        self.sincronizar()
+
+    @classmethod
+    def obter(cls, pasta_registros, pastas_status, pasta_indices, layout=None):
+        """
+        Retorna a instância compartilhada do catálogo para a pasta
+
+        Returns:
+            CatalogoPendencias: Catálogo carregado e sincronizado
+        """
+        return cls._obter_compartilhado(
+            pasta_indices, lambda: cls(pasta_registros, pastas_status, pasta_indices, layout)
+        )
+
+    def _relativo(self, caminho):
+        """Caminho relativo à pasta PENDENCIAS (com '/')"""
+        try:
+            return Path(caminho).relative_to(self.pasta_registros).as_posix()
+        except ValueError:
+            return Path(caminho).as_posix()
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def localizar(self, numero):
+        """
+        Retorna a pasta de status registrada para a pendência
+
+        Args:
+            numero: Número da pendência
+
+        Returns:
+            str: Nome da pasta ou None se não catalogada
+        """
+        entrada = self.entradas.get(str(numero))
+        return entrada['pasta'] if entrada else None
+
+    def caminho(self, numero):
+        """
+        Retorna o caminho registrado do arquivo da pendência
+
+        Args:
+            numero: Número da pendência
+
+        Returns:
+            Path: Caminho do arquivo ou None se não catalogada
+        """
+        entrada = self.entradas.get(str(numero))
+        return self.pasta_registros / entrada['arquivo'] if entrada else None
+
+    def obter_entrada(self, numero):
+        """Retorna uma cópia da entrada do catálogo (ou None)"""
+        entrada = self.entradas.get(str(numero))
+        return dict(entrada) if entrada else None
+
+    def entradas_copia(self):
+        """
+        Cópia consistente de todas as entradas (para percorrer sem segurar a trava)
+
+        Returns:
+            dict: numero -> cópia da entrada ({'pasta', 'arquivo', 'tamanho', 'mtime_ns'})
+        """
+        with self._lock:
+            return {numero: dict(entrada) for numero, entrada in self.entradas.items()}
+
+    def numeros(self, pasta=None):
+        """
+        Lista os números catalogados
+
+        Args:
+            pasta: Se informado, apenas os números desta pasta
+
+        Returns:
+            list: Números de pendência
+        """
+        with self._lock:
+            if pasta is None:
+                return list(self.entradas)
+            return [n for n, e in self.entradas.items() if e['pasta'] == pasta]
+
+    # ------------------------------------------------------------------
+    # Manutenção (chamada em todo caminho de escrita do gerenciador)
+    # ------------------------------------------------------------------
+
+    def registrar(self, numero, pasta, caminho=None, st=None):
+        """
+        Registra (ou atualiza) a localização de uma pendência
+
+        Args:
+            numero: Número da pendência
+            pasta: Pasta de status onde o arquivo está
+            caminho: Path do arquivo (None = calcular pelo layout)
+            st: os.stat_result já obtido (None = consultar o arquivo)
+        """
+        numero = str(numero)
+        if caminho is None:
+            caminho = self.layout.caminho(pasta, numero)
+        if st is None:
+            try:
+                st = os.stat(caminho)
+            except OSError:
+                st = None
+        tamanho, mtime_ns = chave_stat(st)
+
+        with self._lock:
+            anterior = self.entradas.get(numero)
+            self.entradas[numero] = {
+                'pasta': pasta,
+                'arquivo': self._relativo(caminho),
+                'tamanho': tamanho,
+                'mtime_ns': mtime_ns,
+                'versao': (anterior['versao'] + 1) if anterior else 1,
+            }
+        self._marcar_alterado()
+
+    def remover(self, numero):
+        """Remove uma pendência do catálogo"""
+        with self._lock:
+            removida = self.entradas.pop(str(numero), None) is not None
+        if removida:
+            self._marcar_alterado()
+
+    def sincronizar(self, forcar=False):
+        """
+        Reconcilia o catálogo com as pastas de status (incremental)
+
+        Só relista os diretórios (pasta de status ou subpasta do layout)
+        cujo mtime mudou desde a última sincronização. Arquivos novos são
+        adicionados, ausentes removidos.
+
+        Args:
+            forcar: Se True, relista todos os diretórios
+
+        Returns:
+            int: Quantidade de diretórios relistados
+        """
+        relistadas = 0
+        for pasta in self.pastas_status:
+            diretorios = self.layout.diretorios(pasta)
+            atuais = set()
+            for diretorio in diretorios:
+                relativo = self._relativo(diretorio)
+                atuais.add(relativo)
+                try:
+                    mtime_pasta = os.stat(diretorio).st_mtime_ns
+                except OSError:
+                    continue
+
+                if not forcar and self._mtime_pastas.get(relativo) == mtime_pasta:
+                    continue
+
+                try:
+                    self._reconciliar_pasta(pasta, diretorio, relativo)
+                    self._mtime_pastas[relativo] = mtime_pasta
+                    relistadas += 1
+                except OSError as e:
+                    print(f"⚠️ Erro ao sincronizar catálogo ({relativo}): {e}")
+
+            # Subpastas que deixaram de existir (ex.: migração de layout)
+            relistadas += self._descartar_diretorios_ausentes(pasta, atuais)
+
+        if relistadas:
+            self._marcar_alterado()
+        return relistadas
+
+    def _descartar_diretorios_ausentes(self, pasta, atuais):
+        """Remove entradas/mtimes de diretórios da pasta que não existem mais"""
+        prefixo = pasta + '/'
+        with self._lock:
+            ausentes = [d for d in self._mtime_pastas
+                        if (d == pasta or d.startswith(prefixo)) and d not in atuais]
+            for diretorio in ausentes:
+                del self._mtime_pastas[diretorio]
+            if ausentes:
+                ausentes = set(ausentes)
+                for numero in [n for n, e in self.entradas.items()
+                               if e['arquivo'].rsplit('/', 1)[0] in ausentes]:
+                    del self.entradas[numero]
+        return len(ausentes)
+
+    def _reconciliar_pasta(self, pasta, diretorio, relativo):
+        """Aplica ao catálogo o conteúdo atual de um diretório da pasta de status"""
+        presentes = {}
+        with os.scandir(diretorio) as it:
+            for item in it:
+                if not item.name.endswith('.json') or not item.is_file():
+                    continue
+                presentes[item.name[:-5]] = item
+
+        with self._lock:
+            # Remover entradas deste diretório cujo arquivo sumiu
+            for numero in [n for n, e in self.entradas.items()
+                           if e['arquivo'].rsplit('/', 1)[0] == relativo]:
+                if numero not in presentes:
+                    del self.entradas[numero]
+
+            # Adicionar/atualizar arquivos presentes
+            for numero, item in presentes.items():
+                entrada = self.entradas.get(numero)
+                arquivo = f"{relativo}/{item.name}"
+                try:
+                    # No Windows o scandir já traz o stat (sem ida extra à rede)
+                    tamanho, mtime_ns = chave_stat(item.stat())
+                except OSError:
+                    tamanho, mtime_ns = 0, 0
+
+                if (entrada and entrada['arquivo'] == arquivo and
+                        entrada['tamanho'] == tamanho and entrada['mtime_ns'] == mtime_ns):
+                    continue
+
+                self.entradas[numero] = {
+                    'pasta': pasta,
+                    'arquivo': arquivo,
+                    'tamanho': tamanho,
+                    'mtime_ns': mtime_ns,
+                    'versao': (entrada['versao'] + 1) if entrada else 1,
+                }
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def _dados_persistidos(self):
+        return {
+            'mtime_pastas': dict(self._mtime_pastas),
+            'entradas': {n: dict(e) for n, e in self.entradas.items()},
+        }
+
+    def _aplicar_persistidos(self, dados):
+        self.entradas = dados.get('entradas', {})
+        self._mtime_pastas = dados.get('mtime_pastas', {})
+
+
+class IndiceResumo(IndicePersistente):
+    """Índice lateral com os campos-chave de cada pendência (projeção de lista)"""
+
+    NOME_ARQUIVO = "resumo.json"
+    DESCRICAO = "índice de resumo"
+    INTERVALO_PERSISTENCIA = 30.0
+
+    # Campos copiados do documento para a linha de resumo
+    CAMPOS = ('numero', 'data_criacao', 'data_atualizacao', 'usuario', 'setor',
+              'situacao', 'status', 'prioridade')
+
+    # Campos com índice secundário (valor → números)
+    CAMPOS_INDEXADOS = ('usuario', 'setor', 'situacao', 'status')
+
+    def __init__(self, pasta_indices):
+        """
+        Inicializa o índice de resumo
+
+        Args:
+            pasta_indices: Path da pasta onde o índice é persistido
+        """
+        super().__init__(pasta_indices)
+        # numero -> {'pasta', 'tamanho', 'mtime_ns', 'resumo': {...}}
+        self.entradas = {}
+        # campo -> valor -> set(numeros)
+        self._secundarios = {campo: {} for campo in self.CAMPOS_INDEXADOS}
+        self._carregar()
+
+    @classmethod
+    def obter(cls, pasta_indices):
+        """Retorna a instância compartilhada do índice para a pasta"""
+        return cls._obter_compartilhado(pasta_indices, lambda: cls(pasta_indices))
+
+    @classmethod
+    def resumir(cls, pendencia, pasta=None):
+        """
+        Extrai a linha de resumo de um documento completo
+
+        Args:
+            pendencia: Dict da pendência
+            pasta: Pasta de status onde o arquivo está
+
+        Returns:
+            dict: Linha com os campos de CAMPOS (+ 'pasta' e 'total_propostas')
+        """
+        resumo = {campo: pendencia.get(campo, '') for campo in cls.CAMPOS}
+        # Suportar tanto 'usuario' (canônico) quanto 'vendedor' (compatibilidade)
+        if not resumo['usuario']:
+            resumo['usuario'] = pendencia.get('vendedor', '')
+        resumo['pasta'] = pasta
+        resumo['total_propostas'] = len(pendencia.get('propostas_vinculadas') or [])
+        return resumo
+
+    def consultar(self, numero, pasta, st):
+        """
+        Retorna a linha de resumo se o arquivo não mudou desde a indexação
+
+        Args:
+            numero: Número da pendência
+            pasta: Pasta onde o arquivo foi encontrado
+            st: os.stat_result atual do arquivo
+
+        Returns:
+            dict: Cópia da linha de resumo ou None (entrada ausente/desatualizada)
+        """
+        entrada = self.entradas.get(str(numero))
+        if not entrada or entrada['pasta'] != pasta:
+            return None
+        if (entrada['tamanho'], entrada['mtime_ns']) != chave_stat(st):
+            return None
+        return dict(entrada['resumo'])
+
+    def atualizar(self, numero, pasta, pendencia, st):
+        """
+        Registra a linha de resumo de um documento recém-lido ou gravado
+
+        Args:
+            numero: Número da pendência
+            pasta: Pasta de status do arquivo
+            pendencia: Dict completo da pendência
+            st: os.stat_result do arquivo gravado/lido
+        """
+        tamanho, mtime_ns = chave_stat(st)
+        numero = str(numero)
+        with self._lock:
+            entrada = self.entradas.get(numero)
+            if (entrada and entrada['pasta'] == pasta and
+                    (entrada['tamanho'], entrada['mtime_ns']) == (tamanho, mtime_ns)):
+                return
+            if entrada:
+                self._desindexar(numero, entrada['resumo'])
+            resumo = self.resumir(pendencia, pasta)
+            self.entradas[numero] = {
+                'pasta': pasta,
+                'tamanho': tamanho,
+                'mtime_ns': mtime_ns,
+                'resumo': resumo,
+            }
+            self._indexar(numero, resumo)
+        self._marcar_alterado()
+
+    def remover(self, numero):
+        """Remove uma pendência do índice"""
+        with self._lock:
+            entrada = self.entradas.pop(str(numero), None)
+            if entrada is not None:
+                self._desindexar(str(numero), entrada['resumo'])
+        if entrada is not None:
+            self._marcar_alterado()
+
+    # ------------------------------------------------------------------
+    # Índices secundários
+    # ------------------------------------------------------------------
+
+    def _indexar(self, numero, resumo):
+        """Inclui o número nos índices secundários (chamar com o lock)"""
+        for campo in self.CAMPOS_INDEXADOS:
+            self._secundarios[campo].setdefault(resumo.get(campo, ''), set()).add(numero)
+
+    def _desindexar(self, numero, resumo):
+        """Retira o número dos índices secundários (chamar com o lock)"""
+        for campo in self.CAMPOS_INDEXADOS:
+            valores = self._secundarios[campo]
+            valor = resumo.get(campo, '')
+            numeros = valores.get(valor)
+            if numeros is not None:
+                numeros.discard(numero)
+                if not numeros:
+                    del valores[valor]
+
+    def pasta_indexada(self, numero):
+        """Pasta registrada no índice para o número (None se não indexado)"""
+        entrada = self.entradas.get(str(numero))
+        return entrada['pasta'] if entrada else None
+
+    def valores(self, campo):
+        """
+        Valores distintos de um campo indexado com a quantidade de pendências
+
+        Args:
+            campo: Um dos CAMPOS_INDEXADOS
+
+        Returns:
+            dict: valor -> quantidade
+        """
+        with self._lock:
+            return {valor: len(numeros) for valor, numeros in self._secundarios[campo].items()}
+
+    def filtrar(self, filtros):
+        """
+        Números cujos campos indexados têm os valores pedidos (sem abrir arquivos)
+
+        Args:
+            filtros: Dict campo -> valor (apenas CAMPOS_INDEXADOS)
+
+        Returns:
+            set: Números que atendem a todos os filtros, ou None se não há filtro
+        """
+        resultado = None
+        with self._lock:
+            # Começar pelo conjunto menor reduz o custo das interseções
+            conjuntos = sorted(
+                (self._secundarios[campo].get(valor, set()) for campo, valor in filtros.items()),
+                key=len
+            )
+            for numeros in conjuntos:
+                resultado = set(numeros) if resultado is None else resultado & numeros
+                if not resultado:
+                    break
+        return resultado
+
+    def _dados_persistidos(self):
+        return {'entradas': {n: dict(e) for n, e in self.entradas.items()}}
+
+    def _aplicar_persistidos(self, dados):
+        self.entradas = dados.get('entradas', {})
+        # Índices secundários são derivados das linhas de resumo
+        self._secundarios = {campo: {} for campo in self.CAMPOS_INDEXADOS}
+        for numero, entrada in self.entradas.items():
+            self._indexar(numero, entrada['resumo'])
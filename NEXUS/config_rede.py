@@ -28,6 +28,73 @@ class ConfiguracaoRede:
     ARQUIVO_SITUACOES = Path(__file__).parent / "valores_situacao.txt"
     ARQUIVO_CAMPOS_JSON = Path(__file__).parent / "mapeamento_campos.json"
     
+    # NUMERAÇÃO DE PENDÊNCIAS
+    # Sufixos reservados por computador a cada acesso ao contador compartilhado
+    TAMANHO_BLOCO_NUMERACAO = 10
+    
+    # CACHE DE DOCUMENTOS
+    # Soma máxima (MB, tamanho em disco) dos JSON mantidos interpretados em memória
+    LIMITE_CACHE_DOCUMENTOS_MB = 32
+    
+    # LEITURA PARALELA
+    # Threads lendo JSON ao mesmo tempo em listar_pendencias (0 = sequencial).
+    # Ajuda quando a pasta está em compartilhamento de rede com alta latência.
+    LEITORES_PARALELOS_PENDENCIAS = 0
+    # Threads gravando ao mesmo tempo nas operações em lote (transferir/arquivar/atualizar várias)
+    GRAVACOES_PARALELAS_PENDENCIAS = 4
+    # Tentativas ao reaplicar uma alteração quando outro usuário gravou a pendência
+    # no meio (mudar situação, transferir, arquivar, vincular proposta)
+    TENTATIVAS_CONFLITO_PENDENCIAS = 3
+    
+    # GRAVAÇÃO DOS JSON
+    # As pendências são gravadas em arquivo temporário e trocadas com os.replace
+    # (quem lista a pasta nunca lê um arquivo pela metade). True = fsync antes da
+    # troca: mais lento, mas o arquivo não fica vazio após queda de energia.
+    SINCRONIZAR_DISCO_PENDENCIAS = False
+    # Entradas de histórico mantidas dentro do JSON; as mais antigas vão para o diário
+    # _HISTORICO/AAMM/<numero>.jsonl (só acréscimos). 0 = histórico inteiro no JSON
+    HISTORICO_NO_DOCUMENTO = 50
+    # Formato dos arquivos por pasta de status: 'json' (indentado, padrão), 'compacto'
+    # (JSON sem espaços), 'gzip' ou 'lzma'. A leitura reconhece qualquer um; gzip/lzma
+    # não abrem em editores de texto. Ex.: {'ARQUIVADAS': 'gzip', 'CONCLUÍDAS': 'gzip'}
+    # Para converter os arquivos existentes: python formato_pendencias.py recodificar
+    CODEC_PENDENCIAS = {}
+    # Biblioteca JSON: 'auto' (msgspec ou orjson se instalados, senão json), 'orjson',
+    # 'msgspec' ou 'json' (pip install msgspec). Os arquivos gravados são os mesmos em qualquer uma.
+    SERIALIZADOR_JSON = 'auto'
+    # Diário de eventos _EVENTOS/AAAAMMDD/*.jsonl: uma linha por gravação (criação, situação,
+    # transferência, movimentação...). O monitor da interface e a replicação leem só o
+    # final do diário em vez de varrer as pastas. Dias mantidos antes de apagar.
+    DIARIO_EVENTOS_PENDENCIAS = True
+    DIAS_DIARIO_EVENTOS = 30
+    # Arquivadas sem gravação há mais de N dias são empacotadas num segmento por mês
+    # (_SEGMENTOS/ARQUIVADAS/AAMM-NNNN.seg, lido com mmap) ao rodar:
+    #   python segmentos_pendencias.py compactar [dias]
+    DIAS_COMPACTAR_ARQUIVADAS = 90
+    
+    # LAYOUT DAS PASTAS DE PENDÊNCIAS
+    # 'plano'  = ATIVAS/2601150001.json
+    # 'mensal' = ATIVAS/2601/2601150001.json (consulta por período lista só os meses envolvidos)
+    # Para converter os arquivos existentes: python layout_pendencias.py mensal
+    LAYOUT_PENDENCIAS = 'plano'
+    
+    # BACKEND DE PENDÊNCIAS
+    # 'json'   = um arquivo JSON por pendência (PASTA_REGISTROS_JSON)
+    # 'sqlite' = banco único em ARQUIVO_BANCO_PENDENCIAS (WAL: usar em disco local,
+    #            não em compartilhamento de rede)
+    # 'postgres' = schema nexus do Nexus_DB (ver "BANCO DE DADOS/migracao_pendencias_json.sql")
+    # Para importar os JSON existentes: python gerenciador_pendencias_sqlite.py importar
+    #                                   python gerenciador_pendencias_postgres.py importar
+    BACKEND_PENDENCIAS = 'json'
+    ARQUIVO_BANCO_PENDENCIAS = PASTA_GERENCIAMENTO / "pendencias.sqlite3"
+    
+    # POSTGRESQL (backend 'postgres')
+    # String de conexão libpq; a senha vem de PGPASSWORD ou do arquivo .pgpass
+    DSN_POSTGRES_PENDENCIAS = "host=localhost port=5432 dbname=Nexus_DB user=postgres"
+    CONEXOES_POSTGRES_PENDENCIAS = 8
+    # Segundos entre ciclos de replicacao_pendencias.py (cópia JSON → PostgreSQL)
+    INTERVALO_REPLICACAO_POSTGRES = 30
+    
     @classmethod
     def inicializar_estrutura(cls):
         """
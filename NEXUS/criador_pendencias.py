@@ -196,8 +196,8 @@ class CriadorPendencias:
                 prioridade_mapeada = 'normal'
             
             # Criar pendência
-            from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-            ger_pend = GerenciadorPendenciasJSON()
+            from gerenciador_pendencias_json import obter_gerenciador_pendencias
+            ger_pend = obter_gerenciador_pendencias()
             
             resultado = ger_pend.criar_pendencia(
                 cliente='',  # Removido
@@ -31,8 +31,8 @@ def renderizar_painel_detalhes(interface, numero_pendencia):
 
     try:
         # Carregar dados completos do JSON
-        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-        ger = GerenciadorPendenciasJSON()
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
         pendencia = ger.ler_pendencia(numero_pendencia)
 
         if not pendencia:
@@ -166,6 +166,9 @@ def renderizar_painel_detalhes(interface, numero_pendencia):
         hist_frame = ttk.LabelFrame(interface.detail_frame, text=" 📊 Histórico ", padding="8")
         hist_frame.pack(fill='x', pady=(0, 8))
         historico = pendencia.get('historico', [])
+        if pendencia.get('historico_anterior'):
+            # Entradas antigas ficam fora do JSON, no diário da pendência
+            historico = ger.obter_historico(numero_pendencia)
         if historico and len(historico) > 0:
             altura = max(3, min(len(historico) + 1, 8))
             hist_text = tk.Text(hist_frame, height=altura, wrap='word', font=('Arial', 9))
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Diário de Eventos das Pendências
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Toda gravação do GerenciadorPendenciasJSON acrescenta um evento (uma linha
+JSON) ao diário em _EVENTOS: criação, mudança de situação, transferência,
+movimentação entre pastas, edição de observações, vínculo de proposta e
+remoção. Os arquivos JSON das pendências continuam sendo o estado
+materializado (o "snapshot" de cada número); o diário diz o que mudou,
+quando, por quem e em qual versão (versao_seq), com os valores novos dos
+campos alterados.
+
+Organização:
+    _EVENTOS/AAAAMMDD/<computador>-<pid>-<n>.jsonl
+
+Cada processo escreve só nos próprios segmentos (nunca há duas escritas
+intercaladas no mesmo arquivo do compartilhamento) e troca de segmento a
+cada dia ou ao atingir TAMANHO_SEGMENTO. Segmentos de dias anteriores não
+mudam mais; os mais antigos que DIAS_DIARIO_EVENTOS são apagados e o último
+dia apagado fica em _EVENTOS/compactado.txt.
+
+Quem acompanha o diário (monitor da interface, replicação) guarda um
+cursor ({'dia', 'segmentos': {segmento: bytes lidos}}) e a cada consulta lê
+só o que foi acrescentado desde então: uma listagem da pasta do dia em vez
+de relistar todas as pastas de status. Se o cursor for mais antigo que a
+compactação, ler_novos() avisa que houve lacuna e quem chamou volta a
+varrer as pastas.
+"""
+
+import os
+import re
+import socket
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    from serializacao_json import carregar_json, gerar_json
+except ImportError:
+    from .serializacao_json import carregar_json, gerar_json
+
+
+def _dia(quando=None):
+    """Nome da pasta do dia (AAAAMMDD)"""
+    return (quando or datetime.now()).strftime("%Y%m%d")
+
+
+def _obter_configuracao(nome, padrao=None):
+    """Lê um parâmetro de ConfiguracaoRede (padrão se indisponível)"""
+    try:
+        from config_rede import ConfiguracaoRede
+    except ImportError:
+        try:
+            from .config_rede import ConfiguracaoRede
+        except ImportError:
+            return padrao
+    return getattr(ConfiguracaoRede, nome, padrao)
+
+
+class DiarioEventos:
+    """Diário de eventos segmentado, só com acréscimos"""
+
+    # Bytes por segmento antes de abrir o próximo
+    TAMANHO_SEGMENTO = 8 * 1024 * 1024
+    # Dias mantidos (segmentos mais antigos são apagados)
+    DIAS_RETENCAO = 30
+    ARQUIVO_COMPACTACAO = "compactado.txt"
+
+    _instancias = {}
+    _instancias_lock = threading.Lock()
+
+    def __init__(self, pasta, sincronizar=False, dias_retencao=None):
+        """
+        Inicializa o diário
+
+        Args:
+            pasta: Path da pasta _EVENTOS
+            sincronizar: fsync após cada evento
+            dias_retencao: Dias mantidos (None = DIAS_RETENCAO)
+        """
+        self.pasta = Path(pasta)
+        self.sincronizar = bool(sincronizar)
+        self.dias_retencao = int(dias_retencao or self.DIAS_RETENCAO)
+        computador = re.sub(r'[^A-Za-z0-9_.-]', '_', socket.gethostname() or 'local')
+        self.origem = f"{computador}-{os.getpid()}"
+        self._lock = threading.Lock()
+        # Segmento aberto por este processo: (dia, Path, tamanho)
+        self._segmento = None
+        self._sequencia = 0
+
+    @classmethod
+    def obter(cls, pasta):
+        """
+        Retorna o diário compartilhado do processo para a pasta
+
+        A configuração vem sempre de ConfiguracaoRede (SINCRONIZAR_DISCO_PENDENCIAS,
+        DIAS_DIARIO_EVENTOS): gerenciador e monitor recebem o mesmo diário,
+        configurado igual, qualquer que seja o primeiro a pedir.
+        """
+        chave = str(Path(pasta).resolve())
+        with cls._instancias_lock:
+            diario = cls._instancias.get(chave)
+            if diario is None:
+                diario = cls(
+                    pasta,
+                    _obter_configuracao('SINCRONIZAR_DISCO_PENDENCIAS', False),
+                    _obter_configuracao('DIAS_DIARIO_EVENTOS', cls.DIAS_RETENCAO)
+                )
+                cls._instancias[chave] = diario
+            return diario
+
+    def registrar(self, tipo, numero, **dados):
+        """
+        Acrescenta um evento ao segmento deste processo
+
+        Args:
+            tipo: 'criacao', 'situacao', 'transferencia', 'observacoes',
+                  'proposta', 'alteracao', 'movimentacao' ou 'remocao'
+            numero: Número da pendência
+            **dados: Demais campos do evento (pasta, versao_seq, usuario, campos, valores...)
+
+        Returns:
+            dict: Evento gravado
+        """
+        evento = {'data': datetime.now().isoformat(), 'origem': self.origem, 'tipo': tipo,
+                  'numero': str(numero)}
+        evento.update(dados)
+        linha = (gerar_json(evento, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+        with self._lock:
+            caminho = self._segmento_para(len(linha))
+            # Uma única escrita por evento, sempre no final
+            fd = os.open(caminho, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+            try:
+                os.write(fd, linha)
+                if self.sincronizar:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            dia, caminho, tamanho = self._segmento
+            self._segmento = (dia, caminho, tamanho + len(linha))
+        return evento
+
+    def _segmento_para(self, tamanho_linha):
+        """Path do segmento onde cabe a próxima linha (abre outro no novo dia ou se cheio)"""
+        dia = _dia()
+        if self._segmento is not None:
+            dia_aberto, caminho, tamanho = self._segmento
+            if dia_aberto == dia and tamanho + tamanho_linha <= self.TAMANHO_SEGMENTO:
+                return caminho
+
+        pasta_dia = self.pasta / dia
+        pasta_dia.mkdir(parents=True, exist_ok=True)
+        while True:
+            self._sequencia += 1
+            caminho = pasta_dia / f"{self.origem}-{self._sequencia:03d}.jsonl"
+            if not caminho.exists():
+                break
+        if self._segmento is None or self._segmento[0] != dia:
+            # Primeiro segmento do dia: aproveita para apagar os dias vencidos
+            self.compactar()
+        self._segmento = (dia, caminho, 0)
+        return caminho
+
+    def compactar(self, dias=None):
+        """
+        Apaga as pastas de dias mais antigos que a retenção
+
+        Args:
+            dias: Dias mantidos (None = dias_retencao)
+
+        Returns:
+            int: Pastas de dia apagadas
+        """
+        limite = _dia(datetime.now() - timedelta(days=dias or self.dias_retencao))
+        apagadas = []
+        for dia in self._dias():
+            if dia >= limite:
+                break
+            try:
+                for segmento in (self.pasta / dia).iterdir():
+                    segmento.unlink()
+                (self.pasta / dia).rmdir()
+            except OSError as e:
+                print(f"⚠️ Não foi possível compactar o diário de eventos ({dia}): {e}")
+                break
+            apagadas.append(dia)
+        if apagadas and apagadas[-1] > self._ultimo_dia_compactado():
+            try:
+                (self.pasta / self.ARQUIVO_COMPACTACAO).write_text(apagadas[-1], encoding='utf-8')
+            except OSError as e:
+                print(f"⚠️ Erro ao registrar compactação do diário de eventos: {e}")
+        return len(apagadas)
+
+    def _dias(self):
+        """Pastas de dia existentes, em ordem"""
+        try:
+            return sorted(entrada.name for entrada in os.scandir(self.pasta)
+                          if entrada.is_dir() and len(entrada.name) == 8 and entrada.name.isdigit())
+        except FileNotFoundError:
+            return []
+
+    def _ultimo_dia_compactado(self):
+        """Último dia apagado pela compactação ('' se nunca houve)"""
+        try:
+            return (self.pasta / self.ARQUIVO_COMPACTACAO).read_text(encoding='utf-8').strip()
+        except OSError:
+            return ''
+
+    def cursor_atual(self):
+        """
+        Cursor no fim do diário (para acompanhar só o que acontecer daqui em diante)
+
+        Returns:
+            dict: Cursor para ler_novos()
+        """
+        _, cursor, _ = self.ler_novos({'dia': _dia(), 'segmentos': {}}, apenas_posicionar=True)
+        return cursor
+
+    def ler_novos(self, cursor=None, apenas_posicionar=False):
+        """
+        Eventos acrescentados depois do cursor
+
+        Só são lidas as pastas do dia do cursor em diante (a partir da
+        véspera, para tolerar relógios um pouco adiantados/atrasados) e, em
+        cada segmento, só os bytes novos. Uma linha ainda sendo escrita
+        (sem '\\n') fica para a próxima leitura.
+
+        Args:
+            cursor: Retornado pela leitura anterior (None = desde o início do diário)
+            apenas_posicionar: Se True, só avança o cursor (não interpreta os eventos)
+
+        Returns:
+            tuple: (eventos em ordem de data, cursor novo, completo)
+                   completo=False quando parte do que faltava ler já foi
+                   apagada pela compactação (quem chamou deve varrer as pastas)
+        """
+        if cursor:
+            inicio = _dia(datetime.strptime(cursor['dia'], "%Y%m%d") - timedelta(days=1))
+            lidos = cursor.get('segmentos', {})
+            completo = inicio > self._ultimo_dia_compactado()
+        else:
+            inicio = ''
+            lidos = {}
+            completo = not self._ultimo_dia_compactado()
+
+        eventos = []
+        novos = {}
+        for dia in self._dias():
+            if dia < inicio:
+                continue
+            try:
+                entradas = sorted(os.scandir(self.pasta / dia), key=lambda entrada: entrada.name)
+            except FileNotFoundError:
+                continue
+            for entrada in entradas:
+                if not entrada.name.endswith('.jsonl'):
+                    continue
+                segmento = f"{dia}/{entrada.name}"
+                posicao = lidos.get(segmento, 0)
+                try:
+                    tamanho = entrada.stat().st_size
+                    if tamanho > posicao:
+                        with open(entrada.path, 'rb') as f:
+                            f.seek(posicao)
+                            dados = f.read(tamanho - posicao)
+                        fim = dados.rfind(b'\n') + 1
+                        if not apenas_posicionar:
+                            eventos.extend(self._interpretar(dados[:fim], segmento))
+                        posicao += fim
+                except OSError as e:
+                    print(f"⚠️ Erro ao ler segmento {segmento} do diário de eventos: {e}")
+                novos[segmento] = posicao
+
+        eventos.sort(key=lambda evento: evento.get('data', ''))
+        return eventos, {'dia': _dia(), 'segmentos': novos}, completo
+
+    @staticmethod
+    def _interpretar(dados, segmento):
+        """Eventos das linhas completas lidas de um segmento (linhas corrompidas são ignoradas)"""
+        eventos = []
+        for linha in dados.splitlines():
+            if not linha.strip():
+                continue
+            try:
+                eventos.append(carregar_json(linha))
+            except ValueError:
+                print(f"⚠️ Linha inválida no diário de eventos ({segmento})")
+        return eventos
@@ -27,8 +27,10 @@ class EditorPendencias:
             callback_atualizacao (function): Função para ser chamada após atualização
         """
         try:
-            from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-            ger = GerenciadorPendenciasJSON()
+            from gerenciador_pendencias_json import (
+                ConflitoEdicao, PendenciaNaoEncontrada, obter_gerenciador_pendencias
+            )
+            ger = obter_gerenciador_pendencias()
             
             pendencia = ger.ler_pendencia(numero_pendencia)
             if not pendencia:
@@ -257,27 +259,26 @@ class EditorPendencias:
                     
                     usuario = self.vendedor_detectado['nome'] if self.vendedor_detectado else 'Sistema'
                     
-                    # Aplicar atualizações
-                    if atualizacoes:
-                        resultado = ger.atualizar_pendencia(
-                            numero=numero_pendencia,
-                            atualizacoes=atualizacoes,
-                            usuario=usuario
-                        )
-                        
-                        if not resultado.get('sucesso'):
-                            messagebox.showerror("Erro", f"Erro ao atualizar: {resultado.get('mensagem', 'Erro desconhecido')}")
-                            return
-                    
-                    # Atualizar observações se alteradas
-                    if obs_alterada:
-                        ger.atualizar_observacoes(numero_pendencia, obs_texto, usuario)
-                    
                     # Verificar se houve alguma alteração
                     if not atualizacoes and not obs_alterada:
                         messagebox.showinfo("Informação", "Nenhuma alteração foi feita.")
                         return
                     
+                    # Campos e observações numa única gravação sobre a versão aberta no
+                    # editor; o que outros gravaram depois é mesclado (só o mesmo campo conflita)
+                    try:
+                        with ger.transacao(numero_pendencia, usuario, base=pendencia) as alteracao:
+                            if atualizacoes:
+                                alteracao.atualizar(atualizacoes)
+                            if obs_alterada:
+                                alteracao.editar_observacoes(obs_texto)
+                    except ConflitoEdicao as e:
+                        messagebox.showerror("Conflito", str(e))
+                        return
+                    except PendenciaNaoEncontrada:
+                        messagebox.showerror("Erro", "Pendência não encontrada")
+                        return
+                    
                     # Mensagem de sucesso
                     mensagem = "✅ Pendência atualizada com sucesso!\n\n"
                     if setor_alterado:
@@ -314,8 +315,8 @@ class EditorPendencias:
                 """Arquiva a pendência"""
                 if messagebox.askyesno("Confirmar", f"Arquivar pendência {numero_pendencia}?"):
                     try:
-                        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-                        ger_pend = GerenciadorPendenciasJSON()
+                        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+                        ger_pend = obter_gerenciador_pendencias()
                         
                         resultado = ger_pend.arquivar_pendencia(numero_pendencia, "Venda Perdida via editor")
                         
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Formato dos Arquivos de Pendências (Codec por Pasta de Status)
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Os JSON são gravados com indent=2: uma pendência antiga, com histórico
+longo, vira dezenas de KB de espaços trafegando pela rede a cada leitura.
+Cada pasta de status pode usar outro formato (ConfiguracaoRede.CODEC_PENDENCIAS):
+
+    'json'      JSON indentado (padrão; o formato de sempre)
+    'compacto'  JSON sem espaços (ainda legível por qualquer programa)
+    'gzip'      JSON compacto comprimido com gzip
+    'lzma'      JSON compacto comprimido com lzma/xz (menor, leitura mais lenta)
+
+O nome continua <numero>.json e a leitura reconhece o formato pelos
+primeiros bytes: pastas com formatos diferentes convivem, e um arquivo
+muda de formato quando é regravado (ou movido para outra pasta). Para
+converter de uma vez os arquivos que não foram regravados:
+
+    python formato_pendencias.py recodificar [PASTA ...]
+
+Tamanho e tempo de gravação/leitura de cada codec, sobre as pendências de
+uma pasta PENDENCIAS (o corpus real) ou sobre N documentos gerados com
+histórico longo:
+
+    python formato_pendencias.py medir [PENDENCIAS | quantidade]
+"""
+
+import gzip
+import lzma
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from serializacao_json import carregar_json, gerar_json
+except ImportError:
+    from .serializacao_json import carregar_json, gerar_json
+
+
+CODECS = ('json', 'compacto', 'gzip', 'lzma')
+
+_MAGICA_GZIP = b'\x1f\x8b'
+_MAGICA_LZMA = b'\xfd7zXZ\x00'
+
+
+def codificar_documento(documento, codec='json'):
+    """
+    Serializa o documento de uma pendência no formato pedido
+
+    Args:
+        documento: Dict da pendência
+        codec: Um de CODECS
+
+    Returns:
+        bytes: Conteúdo do arquivo
+
+    Raises:
+        ValueError: Se o codec não existir
+    """
+    if codec == 'json':
+        return gerar_json(documento, ensure_ascii=False, indent=2).encode('utf-8')
+    if codec not in CODECS:
+        raise ValueError(f"Codec de pendências desconhecido: {codec}")
+    dados = gerar_json(documento, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if codec == 'gzip':
+        # mtime=0: o mesmo documento gera sempre os mesmos bytes
+        return gzip.compress(dados, 6, mtime=0)
+    if codec == 'lzma':
+        return lzma.compress(dados)
+    return dados
+
+
+def detectar_codec(dados):
+    """
+    Formato de um conteúdo gravado (pelos primeiros bytes)
+
+    Returns:
+        str: 'gzip', 'lzma', 'compacto' ou 'json'
+    """
+    if dados[:2] == _MAGICA_GZIP:
+        return 'gzip'
+    if dados[:6] == _MAGICA_LZMA:
+        return 'lzma'
+    return 'json' if dados[1:2] in (b'\n', b'\r') else 'compacto'
+
+
+def decodificar_documento(dados):
+    """
+    Interpreta o conteúdo de um arquivo de pendência em qualquer um dos CODECS
+
+    Args:
+        dados: bytes lidos do arquivo
+
+    Returns:
+        dict: Documento da pendência
+
+    Raises:
+        ValueError: Conteúdo inválido
+    """
+    if dados[:2] == _MAGICA_GZIP:
+        dados = gzip.decompress(dados)
+    elif dados[:6] == _MAGICA_LZMA:
+        dados = lzma.decompress(dados)
+    return carregar_json(dados)
+
+
+def corpus_sintetico(quantidade=1000, entradas_historico=50, semente=1):
+    """
+    Documentos parecidos com pendências antigas (histórico longo, observações em texto)
+
+    Returns:
+        list: Dicts de pendência
+    """
+    aleatorio = random.Random(semente)
+    usuarios = ['Ana Souza', 'Bruno Lima', 'Carla Dias', 'Diego Alves']
+    situacoes = ['Novo contato', 'Proposta enviada', 'Retorno pendente', 'Em negociação', 'Proposta aprovada']
+    palavras = ['cliente', 'pediu', 'retorno', 'guindaste', 'orçamento', 'visita', 'técnica', 'prazo', 'frete']
+    documentos = []
+    for i in range(quantidade):
+        historico = []
+        for j in range(entradas_historico):
+            usuario = aleatorio.choice(usuarios)
+            anterior, novo = aleatorio.sample(situacoes, 2)
+            historico.append({
+                'data': f"2025-{j % 12 + 1:02d}-{j % 28 + 1:02d}T10:{j % 60:02d}:00",
+                'status_anterior': aleatorio.choice([anterior, '']),
+                'status_novo': aleatorio.choice([novo, f"Observações editadas por {usuario}",
+                                                 f"TRANSFERIDO de {usuario} para {aleatorio.choice(usuarios)}"]),
+                'usuario': usuario,
+            })
+        documentos.append({
+            'numero': f"2501{i // 9999 + 1:02d}{i % 9999 + 1:04d}",
+            'data_criacao': f"2025-01-{i % 28 + 1:02d}T09:00:00",
+            'data_atualizacao': f"2025-06-{i % 28 + 1:02d}T17:30:00",
+            'cliente': {'razao_social': f"Cliente {i} Ltda", 'cnpj': f"{i:014d}", 'telefone': '(54) 3000-0000',
+                        'cidade': 'Caxias do Sul', 'contato': aleatorio.choice(usuarios), 'email': ''},
+            'equipamento': f"OG-{aleatorio.randint(10, 99)}",
+            'usuario': aleatorio.choice(usuarios),
+            'setor': 'Vendas',
+            'situacao': aleatorio.choice(situacoes),
+            'status': 'Arquivada',
+            'prioridade': 'normal',
+            'observacoes': ' '.join(aleatorio.choice(palavras) for _ in range(120)),
+            'propostas_vinculadas': [],
+            'historico': historico,
+            'metadata': {'versao': '2.0', 'versao_seq': entradas_historico,
+                         'ultima_modificacao': '2025-06-01T17:30:00', 'modificado_por': 'Sistema'},
+        })
+    return documentos
+
+
+def ler_corpus(pasta_registros):
+    """Documentos de todas as pendências de uma pasta PENDENCIAS (qualquer codec)"""
+    raiz = Path(pasta_registros)
+    documentos = []
+    for arquivo in sorted(raiz.glob('*/**/*.json')):
+        # Índices/eventos/segmentos (_PASTA) e temporários (.arquivo) não são pendências
+        if any(parte[:1] in ('.', '_') for parte in arquivo.relative_to(raiz).parts):
+            continue
+        try:
+            documentos.append(decodificar_documento(arquivo.read_bytes()))
+        except (OSError, ValueError):
+            pass
+    return documentos
+
+
+def medir_codecs(documentos, repeticoes=3):
+    """
+    Tamanho e tempos por documento de cada codec (arquivos numa pasta temporária)
+
+    Returns:
+        list: Dicts {'codec', 'bytes', 'media_bytes', 'gravar_us', 'ler_us'} na ordem de CODECS
+    """
+    pasta = Path(tempfile.mkdtemp(prefix="nexus_codecs_"))
+    resultados = []
+    try:
+        for codec in CODECS:
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                conteudos = [codificar_documento(documento, codec) for documento in documentos]
+            gravar = (time.perf_counter() - inicio) / repeticoes / len(documentos)
+
+            caminhos = []
+            for i, dados in enumerate(conteudos):
+                caminho = pasta / f"{codec}-{i}.json"
+                caminho.write_bytes(dados)
+                caminhos.append(caminho)
+            # Leitura como em _ler_documento: abrir, ler e decodificar
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                for caminho in caminhos:
+                    with open(caminho, 'rb') as f:
+                        decodificar_documento(f.read())
+            ler = (time.perf_counter() - inicio) / repeticoes / len(documentos)
+
+            total = sum(map(len, conteudos))
+            resultados.append({'codec': codec, 'bytes': total, 'media_bytes': total / len(conteudos),
+                               'gravar_us': gravar * 1e6, 'ler_us': ler * 1e6})
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+    return resultados
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ('recodificar', 'medir'):
+        print(f"Uso: python {Path(__file__).name} recodificar [PASTA ...]")
+        print(f"     python {Path(__file__).name} medir [PENDENCIAS | quantidade]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'medir':
+        origem = sys.argv[2] if len(sys.argv) > 2 else '1000'
+        if origem.isdigit():
+            documentos = corpus_sintetico(int(origem))
+            print(f"{len(documentos)} documentos gerados (histórico de 50 entradas)")
+        else:
+            documentos = ler_corpus(origem)
+            print(f"{len(documentos)} documentos lidos de {origem}")
+        if not documentos:
+            sys.exit(1)
+        print(f"{'codec':9} {'total KB':>9} {'média B':>8} {'gravar µs':>10} {'ler µs':>8}")
+        for linha in medir_codecs(documentos):
+            print(f"{linha['codec']:9} {linha['bytes'] / 1024:9.0f} {linha['media_bytes']:8.0f} "
+                  f"{linha['gravar_us']:10.1f} {linha['ler_us']:8.1f}")
+        sys.exit(0)
+
+    try:
+        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
+    except ImportError:
+        from .gerenciador_pendencias_json import GerenciadorPendenciasJSON
+    GerenciadorPendenciasJSON().recodificar_pendencias(sys.argv[2:] or None)
@@ -8,13 +8,153 @@ Cada pendência é um arquivo JSON separado, permitindo:
 - Anexos e observações ilimitadas
 - Flexibilidade para novos campos
 - Versionamento individual
+
+Medição das leituras paralelas de listar_pendencias (pasta temporária,
+com uma latência artificial por arquivo lido, como num compartilhamento lento):
+
+    python gerenciador_pendencias_json.py medir_leitores [quantidade] [latencia_ms] [leitores,...]
 """
 
-import json
+import copy
+import io
 import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from cache_pendencias import CacheDocumentos, ListagemDiretorios
+    from catalogo_pendencias import CatalogoPendencias, IndiceResumo
+    from diario_eventos import DiarioEventos
+    from formato_pendencias import CODECS, codificar_documento, decodificar_documento, detectar_codec
+    from intervalos_pendencias import IndiceIntervalos, estado_nos_intervalos, instante_iso
+    from layout_pendencias import obter_layout
+    from mesclagem_pendencias import mesclar_pendencias
+    from numeracao_pendencias import AlocadorNumeros
+    from segmentos_pendencias import RegistroSegmento, SegmentosPendencias, comprimir_documento
+    from serializacao_json import carregar_json, gerar_json
+    from travas_arquivo import TravaArquivo, escrever_bytes_atomico, escrever_json_atomico, substituir_arquivo
+except ImportError:
+    from .cache_pendencias import CacheDocumentos, ListagemDiretorios
+    from .catalogo_pendencias import CatalogoPendencias, IndiceResumo
+    from .diario_eventos import DiarioEventos
+    from .formato_pendencias import CODECS, codificar_documento, decodificar_documento, detectar_codec
+    from .intervalos_pendencias import IndiceIntervalos, estado_nos_intervalos, instante_iso
+    from .layout_pendencias import obter_layout
+    from .mesclagem_pendencias import mesclar_pendencias
+    from .numeracao_pendencias import AlocadorNumeros
+    from .segmentos_pendencias import RegistroSegmento, SegmentosPendencias, comprimir_documento
+    from .serializacao_json import carregar_json, gerar_json
+    from .travas_arquivo import TravaArquivo, escrever_bytes_atomico, escrever_json_atomico, substituir_arquivo
+
+
+def _obter_configuracao(nome, padrao=None):
+    """Lê um parâmetro de ConfiguracaoRede (padrão se indisponível)"""
+    try:
+        from config_rede import ConfiguracaoRede
+    except ImportError:
+        try:
+            from .config_rede import ConfiguracaoRede
+        except ImportError:
+            return padrao
+    return getattr(ConfiguracaoRede, nome, padrao)
+
+
+def _versao_seq(metadata):
+    """Contador de gravações de metadata.versao_seq (0 em registros anteriores a ele)"""
+    try:
+        return int((metadata or {}).get('versao_seq') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+@contextmanager
+def _versao_provisoria(*pendencias):
+    """Devolve metadata.versao_seq ao valor de entrada se a gravação do bloco falhar"""
+    lidas = [(pendencia, _versao_seq(pendencia.get('metadata'))) for pendencia in pendencias]
+    try:
+        yield
+    except BaseException:
+        for pendencia, lida in lidas:
+            pendencia.setdefault('metadata', {})['versao_seq'] = lida
+        raise
+
+
+class PendenciaNaoEncontrada(LookupError):
+    """A pendência não existe em nenhuma pasta de status"""
+
+
+class ConflitoEdicao(Exception):
+    """Outro usuário gravou a pendência depois da leitura"""
+    
+    def __init__(self, numero, modificado_por, quando, campos=()):
+        if campos:
+            mensagem = (f"CONFLITO: {modificado_por} alterou {', '.join(campos)} ao mesmo tempo. "
+                        f"Atualize e tente novamente.")
+        else:
+            mensagem = f"CONFLITO: {modificado_por} modificou esta pendência há pouco. Atualize e tente novamente."
+        super().__init__(mensagem)
+        self.numero = numero
+        self.modificado_por = modificado_por
+        self.quando = quando
+        # Campos alterados pelos dois lados (vazio = a versão mudou, sem mesclagem)
+        self.campos = list(campos)
+
+
+class AlteracaoPendencia:
+    """
+    Alterações acumuladas sobre uma pendência dentro de transacao()
+    
+    Todas as operações mexem na mesma cópia do documento, com o mesmo
+    horário; a gravação acontece uma única vez, ao sair do bloco.
+    """
+    
+    def __init__(self, gerenciador, numero, pendencia, usuario, timestamp_iso):
+        self._gerenciador = gerenciador
+        self.numero = numero
+        self.pendencia = pendencia
+        self.usuario = usuario
+        self.timestamp_iso = timestamp_iso
+        self.alterada = False
+    
+    def atualizar(self, atualizacoes):
+        """Aplica campos (situação/status vão para o histórico), como atualizar_pendencia"""
+        self._gerenciador._aplicar_atualizacoes(self.pendencia, dict(atualizacoes), self.usuario, self.timestamp_iso)
+        self.alterada = True
+    
+    def editar_observacoes(self, novo_texto):
+        """Troca as observações (registra no histórico se mudou)"""
+        if self._gerenciador._anotar_observacoes(self.pendencia, novo_texto, self.usuario, self.timestamp_iso):
+            self.alterada = True
+    
+    def transferir(self, usuario_destino, motivo=''):
+        """Troca o usuário responsável, como transferir_pendencia"""
+        self._gerenciador._anotar_transferencia(self.pendencia, usuario_destino, motivo, self.usuario,
+                                                self.timestamp_iso)
+        self.alterada = True
+    
+    def vincular_proposta(self, codigo_proposta, arquivo_pdf=''):
+        """Vincula uma proposta gerada, como vincular_proposta"""
+        self._gerenciador._anotar_proposta(self.pendencia, codigo_proposta, arquivo_pdf, self.usuario,
+                                           self.timestamp_iso)
+        self.alterada = True
+    
+    def registrar_historico(self, status_novo, status_anterior=''):
+        """Acrescenta uma entrada livre ao histórico"""
+        self.pendencia.setdefault('historico', []).append({
+            "data": self.timestamp_iso,
+            "status_anterior": status_anterior,
+            "status_novo": status_novo,
+            "usuario": self.usuario
+        })
+        self.alterada = True
+
 
 class GerenciadorPendenciasJSON:
     """Gerencia pendências usando arquivos JSON individuais"""
@@ -22,6 +162,27 @@ class GerenciadorPendenciasJSON:
     # Pastas de status disponíveis
     PASTAS_STATUS = ["ATIVAS", "ARQUIVADAS", "CANCELADAS", "CONCLUÍDAS", "EM ATRASO"]
     
+    # Pasta interna para catálogo/índices (não é uma pasta de status)
+    PASTA_INDICES = "_INDICES"
+    
+    # Diário do histórico antigo (_HISTORICO/AAMM/<numero>.jsonl, só acréscimos)
+    PASTA_HISTORICO = "_HISTORICO"
+    
+    # Diário de eventos de todas as gravações (_EVENTOS/AAAAMMDD/*.jsonl, ver diario_eventos.py)
+    PASTA_EVENTOS = "_EVENTOS"
+    
+    # Segmentos compactados (_SEGMENTOS/<PASTA>/AAMM-NNNN.seg, ver segmentos_pendencias.py)
+    PASTA_SEGMENTOS = "_SEGMENTOS"
+    # Única pasta de status empacotada (só cresce e raramente muda)
+    PASTA_COMPACTADA = "ARQUIVADAS"
+    
+    # Campo alterado → tipo do evento (vale o primeiro da lista que mudou)
+    TIPOS_EVENTO = (('situacao', 'situacao'), ('status', 'situacao'), ('usuario', 'transferencia'),
+                    ('propostas_vinculadas', 'proposta'), ('observacoes', 'observacoes'))
+    
+    # Fora de 'campos'/'valores' dos eventos (controle, ou já guardado no histórico)
+    CAMPOS_FORA_DO_EVENTO = ('data_atualizacao', 'metadata', 'historico', 'historico_anterior')
+    
     def __init__(self, pasta_registros=None):
         """
         Inicializa o gerenciador de pendências JSON
@@ -43,6 +204,58 @@ class GerenciadorPendenciasJSON:
         
         # Criar estrutura de pastas
         self._inicializar_estrutura()
+        
+        pasta_indices = self.pasta_registros / self.PASTA_INDICES
+        
+        # Onde fica cada arquivo dentro da pasta de status ('plano' ou 'mensal')
+        self.layout = obter_layout(_obter_configuracao('LAYOUT_PENDENCIAS', 'plano'), self.pasta_registros)
+        
+        # Catálogo numero → pasta (evita testar exists() em cada pasta)
+        self.catalogo = CatalogoPendencias.obter(self.pasta_registros, self.PASTAS_STATUS, pasta_indices, self.layout)
+        
+        # Índice lateral de resumo (linhas da lista sem abrir cada arquivo)
+        self.indice_resumo = IndiceResumo.obter(pasta_indices)
+        
+        # fsync antes de publicar cada gravação (mais lento; protege contra queda de energia)
+        self.sincronizar_disco = bool(_obter_configuracao('SINCRONIZAR_DISCO_PENDENCIAS', False))
+        
+        # Formato dos arquivos por pasta de status (ver formato_pendencias.py; padrão 'json')
+        self.codecs = {}
+        for pasta, codec in (_obter_configuracao('CODEC_PENDENCIAS', None) or {}).items():
+            if codec in CODECS:
+                self.codecs[pasta] = codec
+            else:
+                print(f"⚠️ Codec '{codec}' desconhecido para {pasta}, usando 'json'")
+        
+        # Entradas de histórico mantidas no próprio JSON (o resto vai para o diário; 0 = tudo no JSON)
+        self.historico_no_documento = int(_obter_configuracao('HISTORICO_NO_DOCUMENTO', 50) or 0)
+        
+        # Diário de eventos (None = não registrar)
+        self.diario_eventos = None
+        if _obter_configuracao('DIARIO_EVENTOS_PENDENCIAS', True):
+            # Configurado por ConfiguracaoRede (o mesmo diário do monitor_mudancas)
+            self.diario_eventos = DiarioEventos.obter(self.pasta_registros / self.PASTA_EVENTOS)
+        
+        # Arquivadas antigas empacotadas em segmentos mensais (lidas com mmap)
+        self.segmentos = SegmentosPendencias.obter(
+            self.pasta_registros / self.PASTA_SEGMENTOS / self.PASTA_COMPACTADA, self.sincronizar_disco
+        )
+        
+        # Cache LRU de documentos já interpretados (validado por os.stat)
+        limite_cache_mb = _obter_configuracao('LIMITE_CACHE_DOCUMENTOS_MB', None)
+        self.cache_documentos = CacheDocumentos.compartilhado(
+            limite_cache_mb * 1024 * 1024 if limite_cache_mb else None
+        )
+        
+        # Nomes de arquivo por pasta, ordenados (período = busca binária, sem relistar)
+        self.listagem_diretorios = ListagemDiretorios.compartilhado()
+        
+        # Contador diário de números (AAMMDD → último sufixo), reservado em blocos
+        self.alocador_numeros = AlocadorNumeros.obter(
+            pasta_indices,
+            self._maior_sufixo_existente,
+            _obter_configuracao('TAMANHO_BLOCO_NUMERACAO', AlocadorNumeros.TAMANHO_BLOCO)
+        )
     
     def _inicializar_estrutura(self):
         """Cria a estrutura de pastas necessária"""
@@ -53,6 +266,8 @@ class GerenciadorPendenciasJSON:
             for pasta_status in self.PASTAS_STATUS:
                 (self.pasta_registros / pasta_status).mkdir(exist_ok=True)
             
+            (self.pasta_registros / self.PASTA_INDICES).mkdir(exist_ok=True)
+            
             # Log detalhado removido para evitar poluir o console a cada refresh
         except Exception as e:
             print(f"⚠️ Erro ao criar estrutura: {e}")
@@ -157,16 +372,15 @@ class GerenciadorPendenciasJSON:
                 "tags": [],
                 "metadata": {
                     "versao": "1.0",
+                    "versao_seq": 1,
                     "ultima_modificacao": timestamp_iso,
                     "modificado_por": vendedor_nome
                 }
             }
             
-            # Salvar arquivo JSON
-            arquivo_path = self.pasta_registros / "ATIVAS" / f"{numero_pendencia}.json"
-            
-            with open(arquivo_path, 'w', encoding='utf-8') as f:
-                json.dump(pendencia, f, ensure_ascii=False, indent=2)
+            # Gravar (o número pode ser trocado se já estiver em uso)
+            arquivo_path = self._gravar_nova_pendencia(pendencia)
+            numero_pendencia = pendencia['numero']
             
             print(f"✓ Pendência criada: {numero_pendencia} → {arquivo_path.name}")
             print(f"✓ Histórico criado: {timestamp_iso} - Pendência criada por {vendedor_nome} - Vendedor responsável")
@@ -184,10 +398,424 @@ class GerenciadorPendenciasJSON:
             traceback.print_exc()
             return None
     
+    def _escrever_documento(self, arquivo, pendencia, modo='substituir', pasta=None):
+        """
+        Grava o JSON de uma pendência (temporário + os.replace)
+        
+        Quem lista as pastas ao mesmo tempo nunca encontra um arquivo pela metade.
+        
+        Args:
+            arquivo: Path de destino
+            pendencia: Dict completo
+            modo: 'substituir', 'criar' ou 'atualizar' (ver escrever_json_atomico)
+            pasta: Pasta de status cujo formato é usado (None = 'json')
+        """
+        codec = self.codecs.get(pasta, 'json')
+        if codec == 'json':
+            escrever_json_atomico(
+                arquivo, pendencia, sincronizar=self.sincronizar_disco, modo=modo,
+                ensure_ascii=False, indent=2
+            )
+        else:
+            escrever_bytes_atomico(
+                arquivo, codificar_documento(pendencia, codec), sincronizar=self.sincronizar_disco, modo=modo
+            )
+    
+    def _caminho_diario(self, numero):
+        """Path do diário de histórico de uma pendência (_HISTORICO/AAMM/<numero>.jsonl)"""
+        return self.pasta_registros / self.PASTA_HISTORICO / str(numero)[:4] / f"{numero}.jsonl"
+    
+    def _separar_historico(self, numero, pendencia):
+        """
+        Documento a gravar: só as últimas entradas do histórico, o resto no diário
+        
+        As entradas que saem do JSON são acrescentadas ao diário da
+        pendência e o JSON guarda o ponteiro 'historico_anterior'
+        ({'arquivo', 'entradas', 'bytes'}). Assim a gravação de uma mudança
+        de situação custa o mesmo numa pendência nova ou com anos de histórico.
+        
+        O diário é cortado em 'bytes' antes de acrescentar: o que sobrou de
+        uma gravação que não chegou a publicar o JSON é descartado. Deve ser
+        chamado com a trava da pendência (ou para um número novo).
+        
+        Args:
+            numero: Número da pendência
+            pendencia: Dict completo (não é alterado)
+            
+        Returns:
+            dict: O próprio `pendencia` ou uma cópia rasa com histórico cortado e ponteiro novo
+        """
+        historico = pendencia.get('historico')
+        limite = self.historico_no_documento
+        if limite <= 0 or not isinstance(historico, list) or len(historico) <= limite:
+            return pendencia
+        
+        anterior = pendencia.get('historico_anterior') or {}
+        caminho = self._caminho_diario(numero)
+        inicio = int(anterior.get('bytes', 0))
+        dados = ''.join(
+            gerar_json(entrada, ensure_ascii=False, separators=(',', ':')) + '\n'
+            for entrada in historico[:-limite]
+        ).encode('utf-8')
+        
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(caminho, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0))
+        try:
+            os.ftruncate(fd, inicio)
+            os.lseek(fd, inicio, os.SEEK_SET)
+            os.write(fd, dados)
+            if self.sincronizar_disco:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        
+        documento = dict(pendencia)
+        documento['historico'] = historico[-limite:]
+        documento['historico_anterior'] = {
+            'arquivo': caminho.relative_to(self.pasta_registros).as_posix(),
+            'entradas': int(anterior.get('entradas', 0)) + len(historico) - limite,
+            'bytes': inicio + len(dados),
+        }
+        return documento
+    
+    def _historico_anterior(self, pendencia):
+        """
+        Entradas do histórico que estão no diário (as mais antigas)
+        
+        Lê só os 'bytes' confirmados pelo ponteiro do JSON.
+        
+        Returns:
+            list: Entradas, da mais antiga para a mais recente ([] se não houver diário)
+        """
+        ponteiro = pendencia.get('historico_anterior')
+        if not ponteiro:
+            return []
+        try:
+            with open(self.pasta_registros / ponteiro['arquivo'], 'rb') as f:
+                dados = f.read(int(ponteiro.get('bytes', 0)))
+        except OSError as e:
+            print(f"⚠️ Diário de histórico de {pendencia.get('numero')} indisponível: {e}")
+            return []
+        return [carregar_json(linha) for linha in dados.splitlines() if linha.strip()]
+    
+    def _expandir_historico(self, pendencia):
+        """
+        Documento com o histórico completo (diário + JSON) e sem o ponteiro
+        
+        Usado para copiar pendências para outro armazenamento (importação/replicação).
+        
+        Returns:
+            dict: O próprio `pendencia` (sem diário) ou uma cópia rasa expandida
+        """
+        if not pendencia.get('historico_anterior'):
+            return pendencia
+        documento = {campo: valor for campo, valor in pendencia.items() if campo != 'historico_anterior'}
+        documento['historico'] = self._historico_anterior(pendencia) + list(pendencia.get('historico') or [])
+        return documento
+    
+    def _gravar_nova_pendencia(self, pendencia):
+        """
+        Grava uma pendência nova em ATIVAS (nunca sobrescreve um número já usado)
+        
+        Se o número já existir, gera outro e atualiza pendencia['numero'].
+        
+        Returns:
+            Path: Arquivo gravado
+            
+        Raises:
+            FileExistsError: Se nenhum número livre for obtido
+        """
+        numero_pendencia = pendencia['numero']
+        for _ in range(5):
+            arquivo_path = self.layout.caminho("ATIVAS", numero_pendencia)
+            self.layout.preparar(arquivo_path)
+            try:
+                documento = self._separar_historico(numero_pendencia, pendencia)
+                self._escrever_documento(arquivo_path, documento, modo='criar', pasta="ATIVAS")
+                self._registrar_evento('criacao', numero_pendencia, "ATIVAS", documento)
+                break
+            except FileExistsError:
+                print(f"⚠️ Número {numero_pendencia} já existe, gerando outro")
+                self.catalogo.registrar(numero_pendencia, "ATIVAS", arquivo_path)
+                numero_pendencia = self._gerar_numero_sequencial()
+                pendencia['numero'] = numero_pendencia
+        else:
+            raise FileExistsError(f"Não foi possível reservar um número livre ({numero_pendencia})")
+        self._registrar_escrita(numero_pendencia, "ATIVAS", arquivo_path, documento)
+        return arquivo_path
+    
+    def _gravar_pendencia(self, numero, pasta, arquivo, pendencia):
+        """
+        Grava o documento completo de uma pendência já existente
+        
+        Args:
+            numero: Número da pendência
+            pasta: Pasta de status lida (relocalizada com a trava; pode ser None)
+            arquivo: Path do arquivo lido (relocalizado com a trava; pode ser None)
+            pendencia: Dict completo a gravar (versao_seq de quando foi lido é conferida e avançada)
+            
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência sumiu das pastas
+            ConflitoEdicao: Se outra gravação aconteceu depois da leitura
+        """
+        with self._trava_pendencia(numero), _versao_provisoria(pendencia):
+            arquivo, pasta, anterior = self._conferir_versao_gravada(numero, pendencia)
+            documento = self._separar_historico(numero, pendencia)
+            arquivo = self._regravar_documento(numero, pasta, arquivo, documento)
+            self._registrar_evento(None, numero, pasta, documento, anterior)
+        self._registrar_escrita(numero, pasta, arquivo, documento)
+    
+    def _gravar_movimentacao(self, numero, pendencia, arquivo_origem, pasta_destino):
+        """
+        Grava a pendência e a move para a pasta de destino
+        
+        O histórico novo é gravado no próprio arquivo de origem (troca
+        atômica) e o arquivo é renomeado para o destino com um único
+        os.replace: em nenhum momento existem duas cópias do número.
+        
+        Args:
+            numero: Número da pendência
+            pendencia: Dict completo (já com o histórico da movimentação)
+            arquivo_origem: Path atual do arquivo
+            pasta_destino: Pasta de status de destino
+            
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência sumiu das pastas
+            ConflitoEdicao: Se outra gravação aconteceu depois da leitura
+        """
+        arquivo_destino = self.layout.caminho(pasta_destino, numero)
+        with self._trava_pendencia(numero), _versao_provisoria(pendencia):
+            arquivo_origem, pasta_origem, anterior = self._conferir_versao_gravada(numero, pendencia)
+            documento = self._separar_historico(numero, pendencia)
+            # Já no formato da pasta de destino: a troca de pasta é só um rename
+            arquivo_gravado = self._regravar_documento(numero, pasta_origem, arquivo_origem, documento,
+                                                       pasta_destino)
+            
+            # Mesmo caminho = mesma pasta no mesmo layout
+            if arquivo_gravado != arquivo_destino:
+                self.layout.preparar(arquivo_destino)
+                substituir_arquivo(arquivo_gravado, arquivo_destino)
+            self._registrar_evento('movimentacao', numero, pasta_destino, documento, anterior,
+                                   pasta_origem=pasta_origem)
+        self.cache_documentos.invalidar(arquivo_origem)
+        self._registrar_escrita(numero, pasta_destino, arquivo_destino, documento)
+    
+    def _regravar_documento(self, numero, pasta, arquivo, documento, pasta_formato=None):
+        """
+        Regrava o JSON de uma pendência existente (com a trava da pendência)
+        
+        Uma pendência empacotada num segmento volta a ser arquivo solto na
+        pasta dela; a cópia do segmento passa a ser ignorada.
+        
+        Args:
+            numero: Número da pendência
+            pasta: Pasta de status atual
+            arquivo: Path atual do arquivo (ou RegistroSegmento)
+            documento: Dict a gravar
+            pasta_formato: Pasta cujo formato é usado (None = pasta)
+            
+        Returns:
+            Path: Arquivo gravado
+        """
+        pasta_formato = pasta_formato or pasta
+        if not isinstance(arquivo, RegistroSegmento):
+            self._escrever_documento(arquivo, documento, modo='atualizar', pasta=pasta_formato)
+            return arquivo
+        
+        solto = self.layout.caminho(pasta, numero)
+        self.layout.preparar(solto)
+        self._escrever_documento(solto, documento, modo='criar', pasta=pasta_formato)
+        self.cache_documentos.invalidar(arquivo)
+        return solto
+    
+    def _gravar_movimentacoes(self, itens):
+        """
+        Grava várias movimentações (arquivos independentes, em paralelo)
+        
+        Args:
+            itens: Lista de (numero, pendencia, arquivo_origem, pasta_destino)
+            
+        Returns:
+            tuple: (números movidos, lista de (numero, exceção))
+        """
+        por_numero = {item[0]: item for item in itens}
+        
+        def mover(numero):
+            try:
+                self._gravar_movimentacao(*por_numero[numero])
+            except Exception as e:
+                return False, e
+            return True, ""
+        
+        relatorio = self._executar_em_lote(list(por_numero), mover)
+        movidas = [r['numero'] for r in relatorio if r['sucesso']]
+        falhas = [(r['numero'], r['mensagem']) for r in relatorio if not r['sucesso']]
+        return movidas, falhas
+    
+    def _trava_pendencia(self, numero):
+        """
+        Trava de gravação de uma pendência (_INDICES/travas/<numero>.lock)
+        
+        Pelo número e não pelo arquivo: continua valendo quando a pendência muda de pasta.
+        """
+        return TravaArquivo(self.pasta_registros / self.PASTA_INDICES / "travas" / f"{numero}.lock")
+    
+    def _conferir_versao_gravada(self, numero, pendencia):
+        """
+        Compare-and-swap (com a trava da pendência): relê a versão gravada e avança versao_seq
+        
+        O arquivo é relido do disco, sem confiar no cache: tamanho e mtime
+        podem não mudar entre duas gravações rápidas no compartilhamento.
+        
+        Returns:
+            tuple: (Path atual do arquivo, nome da pasta atual, documento gravado (somente leitura))
+            
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência sumiu das pastas
+            ConflitoEdicao: Se a versão gravada não é a que foi lida
+        """
+        arquivo, pasta = self._localizar_pendencia(numero, verificar=False)
+        for _ in range(2):
+            if arquivo is None:
+                break
+            try:
+                documento = self._ler_documento(arquivo, copiar=False, recarregar=True)
+            except FileNotFoundError:
+                self.cache_documentos.invalidar(arquivo)
+                arquivo, pasta = self._procurar_pendencia(numero)
+                continue
+            self._conferir_versao(numero, pendencia, documento.get('metadata'))
+            return arquivo, pasta, documento
+        raise PendenciaNaoEncontrada(numero)
+    
+    @staticmethod
+    def _conferir_versao(numero, pendencia, metadata_atual):
+        """
+        Confere se `pendencia` foi lida da versão gravada agora e avança metadata.versao_seq
+        
+        Args:
+            numero: Número da pendência
+            pendencia: Dict a gravar (com a versao_seq de quando foi lido)
+            metadata_atual: metadata da versão gravada (None = pendência não existe mais)
+            
+        Raises:
+            PendenciaNaoEncontrada: Se metadata_atual for None
+            ConflitoEdicao: Se as versões forem diferentes
+        """
+        if metadata_atual is None:
+            raise PendenciaNaoEncontrada(numero)
+        lida = _versao_seq(pendencia.get('metadata'))
+        if lida != _versao_seq(metadata_atual):
+            raise ConflitoEdicao(numero, metadata_atual.get('modificado_por') or 'Outro usuário',
+                                 metadata_atual.get('ultima_modificacao', ''))
+        pendencia.setdefault('metadata', {})['versao_seq'] = lida + 1
+    
+    def _repetir_em_conflito(self, funcao, tentativas=None):
+        """
+        Chama funcao() de novo, após uma pausa curta, enquanto ela levantar ConflitoEdicao
+        
+        Args:
+            funcao: Função sem argumentos que relê a pendência, altera e grava
+            tentativas: Máximo de chamadas (None = ConfiguracaoRede.TENTATIVAS_CONFLITO_PENDENCIAS)
+            
+        Returns:
+            O retorno de funcao()
+        """
+        if tentativas is None:
+            tentativas = _obter_configuracao('TENTATIVAS_CONFLITO_PENDENCIAS', 3)
+        tentativas = max(1, int(tentativas))
+        for tentativa in range(1, tentativas + 1):
+            try:
+                return funcao()
+            except ConflitoEdicao:
+                if tentativa >= tentativas:
+                    raise
+                # Pausa aleatória: dois clientes em conflito não repetem juntos
+                time.sleep(random.uniform(0.01, 0.05 * tentativa))
+    
+    def _remover_documento(self, numero, arquivo):
+        """Remove o arquivo de uma pendência (e o diário do histórico) e suas entradas nos índices"""
+        if not isinstance(arquivo, RegistroSegmento):
+            arquivo.unlink()
+        # Cópia empacotada (a própria pendência ou uma cópia vencida): não pode reaparecer
+        if self.segmentos.localizar(numero) is not None:
+            self.segmentos.remover(numero)
+        try:
+            self._caminho_diario(numero).unlink()
+        except OSError:
+            pass
+        self._registrar_evento('remocao', numero, None, None)
+        self._registrar_remocao(numero, arquivo)
+    
+    def _remover_pendencia(self, numero):
+        """
+        Lê e remove uma pendência com a trava (como as demais gravações)
+        
+        Sem a trava, uma edição concorrente que já conferiu a existência do
+        arquivo o recriaria depois do unlink, com o evento de remoção já no diário.
+        
+        Returns:
+            tuple: (documento removido, nome da pasta) ou (None, None) se não existir
+            
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência sumiu entre a leitura e a conferência
+            ConflitoEdicao: Se outra gravação aconteceu depois da leitura
+        """
+        with self._trava_pendencia(numero):
+            pendencia, _, _ = self._carregar_pendencia(numero)
+            if pendencia is None:
+                return None, None
+            arquivo, pasta, _ = self._conferir_versao_gravada(numero, pendencia)
+            self._remover_documento(numero, arquivo)
+        return pendencia, pasta
+    
+    def _registrar_evento(self, tipo, numero, pasta, documento, anterior=None, **dados):
+        """
+        Acrescenta ao diário de eventos a gravação que acabou de ser publicada
+        
+        Chamado com a trava da pendência, logo após o arquivo ser trocado:
+        os eventos de um número ficam na ordem das versões. Uma falha no
+        diário não desfaz a gravação (só é avisada).
+        
+        Args:
+            tipo: 'criacao', 'movimentacao', 'remocao' ou None (deduzido dos campos alterados)
+            numero: Número da pendência
+            pasta: Pasta de status onde o documento ficou (None na remoção)
+            documento: Dict gravado (None na remoção)
+            anterior: Documento que estava gravado (None = todos os campos são novos)
+            **dados: Campos extras do evento (ex.: pasta_origem)
+        """
+        if self.diario_eventos is None:
+            return
+        
+        valores = {}
+        if documento is not None:
+            for campo, valor in documento.items():
+                if campo in self.CAMPOS_FORA_DO_EVENTO:
+                    continue
+                if anterior is None or campo not in anterior or anterior[campo] != valor:
+                    valores[campo] = valor
+            for campo in anterior or ():
+                if campo not in documento and campo not in self.CAMPOS_FORA_DO_EVENTO:
+                    valores[campo] = None
+            metadata = documento.get('metadata') or {}
+            dados['versao_seq'] = _versao_seq(metadata)
+            dados['usuario'] = metadata.get('modificado_por') or documento.get('usuario', '')
+        
+        if tipo is None:
+            tipo = next((tipo_campo for campo, tipo_campo in self.TIPOS_EVENTO if campo in valores), 'alteracao')
+        try:
+            self.diario_eventos.registrar(tipo, numero, pasta=pasta, campos=list(valores),
+                                          valores=valores, **dados)
+        except OSError as e:
+            print(f"⚠️ Erro ao registrar evento de {numero} no diário: {e}")
+    
     def _gerar_numero_sequencial(self):
         """
         Gera número sequencial único (AAMMDDSSSS)
-        Verifica todos os arquivos JSON existentes
+        Usa o bloco de sufixos reservado por este cliente no contador diário
+        compartilhado; as pastas só são consultadas quando o contador do dia
+        ainda não existe
         
         Returns:
             str: Número sequencial
@@ -195,55 +823,209 @@ class GerenciadorPendenciasJSON:
         agora = datetime.now()
         prefixo = agora.strftime("%y%m%d")  # AAMMDD
         
-        # Buscar último número em todos os arquivos JSON
-        numeros_existentes = []
+        try:
+            return self.alocador_numeros.proximo(prefixo)
+        except TimeoutError as e:
+            # Trava presa (rede instável): manter o comportamento antigo
+            print(f"⚠️ {e} - gerando número pela varredura das pastas")
+            return f"{prefixo}{self._maior_sufixo_existente(prefixo) + 1:04d}"
+    
+    def _maior_sufixo_existente(self, prefixo):
+        """
+        Maior sufixo já usado no dia (AAMMDD), consultando o catálogo
+        
+        O catálogo é sincronizado antes, relistando apenas as pastas que
+        mudaram desde a última sincronização.
+        
+        Returns:
+            int: Maior sufixo (0 se nenhum)
+        """
+        self.catalogo.sincronizar()
+        
+        sufixos = []
+        for nome in self.catalogo.numeros():
+            if len(nome) == 10 and nome.startswith(prefixo):
+                try:
+                    sufixos.append(int(nome[-4:]))
+                except ValueError:
+                    pass
+        
+        return max(sufixos) if sufixos else 0
+    
+    def _registrar_escrita(self, numero, pasta, arquivo, pendencia):
+        """
+        Atualiza catálogo e índices após gravar o arquivo de uma pendência
         
-        # Verificar todas as pastas consideradas no sequencial
+        Args:
+            numero: Número da pendência
+            pasta: Pasta de status onde o arquivo foi gravado
+            arquivo: Path do arquivo gravado
+            pendencia: Dict gravado
+        """
+        try:
+            st = os.stat(arquivo)
+        except OSError:
+            st = None
+        self.catalogo.registrar(numero, pasta, arquivo, st=st)
+        self.indice_resumo.atualizar(numero, pasta, pendencia, st)
+        if st is not None:
+            # Cópia: o chamador pode continuar alterando o dict gravado
+            self.cache_documentos.guardar(arquivo, st, copy.deepcopy(pendencia))
+    
+    def _registrar_remocao(self, numero, arquivo=None):
+        """Remove a pendência do catálogo, dos índices e do cache"""
+        self.catalogo.remover(numero)
+        self.indice_resumo.remover(numero)
+        if arquivo is not None:
+            self.cache_documentos.invalidar(arquivo)
+    
+    def _ler_documento(self, caminho, st=None, copiar=True, recarregar=False):
+        """
+        Lê e interpreta o JSON de uma pendência usando o cache de documentos
+        
+        Args:
+            caminho: Path do arquivo (ou RegistroSegmento de uma pendência empacotada)
+            st: os.stat_result já obtido (None = consultar o arquivo)
+            copiar: Se False, devolve o objeto do cache (somente leitura)
+            recarregar: Se True, lê o arquivo mesmo com o cache válido (e atualiza o cache)
+            
+        Returns:
+            dict: Documento da pendência
+            
+        Raises:
+            FileNotFoundError: Se o arquivo não existir
+        """
+        empacotado = isinstance(caminho, RegistroSegmento)
+        if st is None:
+            st = caminho.stat() if empacotado else os.stat(caminho)
+        
+        documento = None if recarregar else self.cache_documentos.obter(caminho, st)
+        if documento is None:
+            if empacotado:
+                documento = caminho.ler()
+            else:
+                # Formato reconhecido pelo conteúdo (ver formato_pendencias.py)
+                with open(caminho, 'rb') as f:
+                    documento = decodificar_documento(f.read())
+            self.cache_documentos.guardar(caminho, st, documento)
+        
+        return copy.deepcopy(documento) if copiar else documento
+    
+    def obter_estatisticas_cache(self):
+        """
+        Retorna os contadores do cache de documentos
+        
+        Returns:
+            dict: {'acertos', 'falhas', 'taxa_acerto', 'documentos', 'bytes', 'limite_bytes'}
+        """
+        return self.cache_documentos.estatisticas()
+    
+    def _localizar_pendencia(self, numero, verificar=True):
+        """
+        Localiza o arquivo de uma pendência pelo catálogo (busca completa como fallback)
+        
+        Args:
+            numero: Número da pendência
+            verificar: Se False, confia no catálogo sem testar se o arquivo existe
+            
+        Returns:
+            tuple: (Path do arquivo, nome da pasta) ou (None, None)
+        """
+        pasta = self.catalogo.localizar(numero)
+        if pasta:
+            arquivo = self.catalogo.caminho(numero)
+            if not verificar or arquivo.exists():
+                return arquivo, pasta
+        return self._procurar_pendencia(numero)
+    
+    def _procurar_pendencia(self, numero):
+        """
+        Procura a pendência em todas as pastas de status e corrige o catálogo
+        
+        Sem arquivo solto, procura nos segmentos (pendências empacotadas
+        não ficam no catálogo).
+        
+        Returns:
+            tuple: (Path do arquivo ou RegistroSegmento, nome da pasta) ou (None, None)
+        """
         for pasta in self.PASTAS_STATUS:
-            pasta_path = self.pasta_registros / pasta
-            if pasta_path.exists():
-                for arquivo in pasta_path.glob("*.json"):
-                    nome = arquivo.stem  # Nome sem extensão
-                    if len(nome) == 10 and nome.startswith(prefixo):
-                        try:
-                            sufixo = int(nome[-4:])
-                            numeros_existentes.append(sufixo)
-                        except ValueError:
-                            pass
+            for arquivo in self.layout.caminhos_possiveis(pasta, numero):
+                if arquivo.exists():
+                    self.catalogo.registrar(numero, pasta, arquivo)
+                    return arquivo, pasta
         
-        # Próximo número
-        proximo = max(numeros_existentes) + 1 if numeros_existentes else 1
+        self.catalogo.remover(numero)
+        registro = self.segmentos.localizar(numero)
+        if registro is not None:
+            return registro, self.PASTA_COMPACTADA
+        return None, None
+    
+    def _carregar_pendencia(self, numero):
+        """
+        Lê o JSON de uma pendência (consulta ao catálogo + cache/leitura de arquivo)
+        
+        Se o catálogo estiver desatualizado (arquivo movido por outro usuário),
+        refaz a busca completa uma vez. O dict retornado é uma cópia própria.
         
-        # Formatar: AAMMDD + SSSS
-        numero = f"{prefixo}{proximo:04d}"
+        Returns:
+            tuple: (pendencia, Path do arquivo, nome da pasta) ou (None, None, None)
+        """
+        arquivo, pasta = self._localizar_pendencia(numero, verificar=False)
+        if arquivo is None:
+            return None, None, None
         
-        return numero
+        try:
+            return self._ler_documento(arquivo), arquivo, pasta
+        except FileNotFoundError:
+            self.cache_documentos.invalidar(arquivo)
+            arquivo, pasta = self._procurar_pendencia(numero)
+            if arquivo is None:
+                return None, None, None
+            return self._ler_documento(arquivo), arquivo, pasta
     
     def ler_pendencia(self, numero):
         """
         Lê uma pendência específica
         
+        O 'historico' traz as últimas HISTORICO_NO_DOCUMENTO entradas; o
+        histórico completo está em obter_historico().
+        
         Args:
             numero: Número da pendência
             
         Returns:
             dict: Dados da pendência ou None
         """
-        # Procurar em todas as pastas existentes
-        for pasta in self.PASTAS_STATUS:
-            arquivo = self.pasta_registros / pasta / f"{numero}.json"
-            if arquivo.exists():
-                try:
-                    with open(arquivo, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-                except Exception as e:
-                    print(f"❌ Erro ao ler {arquivo.name}: {e}")
-                    return None
+        try:
+            pendencia, _, _ = self._carregar_pendencia(numero)
+        except Exception as e:
+            print(f"❌ Erro ao ler {numero}.json: {e}")
+            return None
         
-        print(f"⚠️ Pendência {numero} não encontrada")
-        return None
+        if pendencia is None:
+            print(f"⚠️ Pendência {numero} não encontrada")
+        return pendencia
+    
+    def obter_historico(self, numero):
+        """
+        Histórico completo de uma pendência
+        
+        ler_pendencia traz só as últimas HISTORICO_NO_DOCUMENTO entradas; as
+        anteriores ficam no diário e são lidas aqui.
+        
+        Args:
+            numero: Número da pendência
+            
+        Returns:
+            list: Entradas, da mais antiga para a mais recente ([] se não encontrada)
+        """
+        pendencia, _, _ = self._carregar_pendencia(numero)
+        if pendencia is None:
+            return []
+        return self._historico_anterior(pendencia) + list(pendencia.get('historico') or [])
     
-    def atualizar_pendencia(self, numero, atualizacoes, usuario='Sistema', timestamp_ultima_leitura=None):
+    def atualizar_pendencia(self, numero, atualizacoes, usuario='Sistema', timestamp_ultima_leitura=None,
+                            base=None):
         """
         Atualiza uma pendência existente com proteção contra edições simultâneas
         
@@ -252,108 +1034,218 @@ class GerenciadorPendenciasJSON:
             atualizacoes: Dict com campos a atualizar
             usuario: Nome do usuário fazendo a alteração
             timestamp_ultima_leitura: Timestamp da última vez que leu (para detectar conflito)
+            base: Documento lido ao abrir a tela (mescla com o que outros gravaram depois;
+                  só recusa se o mesmo campo foi alterado)
             
         Returns:
             dict: {'sucesso': bool, 'mensagem': str, 'conflito': bool}
+                  (em conflito, também 'modificado_por', 'quando' e 'campos')
         """
-        # Encontrar arquivo
-        arquivo_path = None
-        for pasta in self.PASTAS_STATUS:
-            temp_path = self.pasta_registros / pasta / f"{numero}.json"
-            if temp_path.exists():
-                arquivo_path = temp_path
-                break
+        try:
+            with self.transacao(numero, usuario, timestamp_ultima_leitura, base=base) as alteracao:
+                alteracao.atualizar(atualizacoes)
+            
+            print(f"✓ Pendência {numero} atualizada por {usuario}")
+            print(f"✓ Histórico atualizado com {len(alteracao.pendencia.get('historico', []))} registros")
+            return {'sucesso': True, 'mensagem': 'Atualizado com sucesso', 'conflito': False}
         
-        if not arquivo_path:
+        except PendenciaNaoEncontrada:
             print(f"⚠️ Pendência {numero} não encontrada")
             return {'sucesso': False, 'mensagem': 'Pendência não encontrada', 'conflito': False}
+        except ConflitoEdicao as e:
+            print(f"⚠️ CONFLITO: {e.modificado_por} modificou esta pendência enquanto você editava!")
+            return {
+                'sucesso': False, 
+                'mensagem': str(e),
+                'conflito': True,
+                'modificado_por': e.modificado_por,
+                'quando': e.quando,
+                'campos': e.campos
+            }
+        except Exception as e:
+            print(f"❌ Erro ao atualizar pendência: {e}")
+            return {'sucesso': False, 'mensagem': f'Erro: {e}', 'conflito': False}
+    
+    @contextmanager
+    def transacao(self, numero, usuario='Sistema', timestamp_ultima_leitura=None, versao_lida=None, base=None):
+        """
+        Agrupa várias alterações de uma pendência numa única gravação
         
-        try:
-            # Ler dados atuais
-            with open(arquivo_path, 'r', encoding='utf-8') as f:
-                pendencia = json.load(f)
+        Lê o documento uma vez; ao sair do bloco sem erro, grava uma vez só
+        com compare-and-swap de metadata.versao_seq. Se alguém gravou a
+        pendência nesse meio tempo, as duas edições são mescladas campo a
+        campo (mesclar_pendencias) e só o mesmo campo alterado pelos dois
+        lados é recusado. Se o bloco levantar exceção ou nada for alterado,
+        nada é gravado.
+        
+            with ger.transacao(numero, usuario) as alteracao:
+                alteracao.atualizar({'situacao': 'Em negociação'})
+                alteracao.editar_observacoes('Cliente pediu revisão')
+        
+        Telas de edição passam o documento carregado ao abrir (base): as
+        alterações são aplicadas sobre ele e mescladas com o que foi
+        gravado desde então.
+        
+        Args:
+            numero: Número da pendência
+            usuario: Nome do usuário fazendo as alterações
+            timestamp_ultima_leitura: ultima_modificacao vista pelo usuário ao abrir a tela
+                                      (compatibilidade; prefira versao_lida)
+            versao_lida: metadata.versao_seq vista pelo usuário ao abrir a tela
+                         (recusa sem mesclar se mudou; None = conferir só desde a leitura feita aqui)
+            base: Documento lido ao abrir a tela (as alterações são mescladas com as gravadas depois)
             
-            # VERIFICAR CONFLITO: Se outro usuário modificou desde que você leu
-            if timestamp_ultima_leitura:
-                ultima_modificacao = pendencia['metadata'].get('ultima_modificacao', '')
-                
-                if ultima_modificacao > timestamp_ultima_leitura:
-                    # CONFLITO DETECTADO!
-                    modificador = pendencia['metadata'].get('modificado_por', 'Outro usuário')
-                    print(f"⚠️ CONFLITO: {modificador} modificou esta pendência enquanto você editava!")
-                    
-                    return {
-                        'sucesso': False, 
-                        'mensagem': f'CONFLITO: {modificador} modificou esta pendência há pouco. Atualize e tente novamente.',
-                        'conflito': True,
-                        'modificado_por': modificador,
-                        'quando': ultima_modificacao
-                    }
+        Yields:
+            AlteracaoPendencia: Documento e operações de alteração
             
-            # Timestamp
-            agora = datetime.now()
-            timestamp_iso = agora.isoformat()
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência não existir
+            ConflitoEdicao: Se os dois lados alteraram o mesmo campo (e.campos)
+        """
+        if base is not None:
+            # Alterações sobre o que o usuário viu; a leitura atual fica para a mesclagem
+            pendencia, arquivo, pasta = copy.deepcopy(base), None, None
+        else:
+            pendencia, arquivo, pasta = self._carregar_pendencia(numero)
+            if pendencia is None:
+                raise PendenciaNaoEncontrada(numero)
+            
+            metadata = pendencia.get('metadata', {})
+            if ((versao_lida is not None and _versao_seq(metadata) != int(versao_lida)) or
+                    (timestamp_ultima_leitura and metadata.get('ultima_modificacao', '') > timestamp_ultima_leitura)):
+                raise ConflitoEdicao(numero, metadata.get('modificado_por', 'Outro usuário'),
+                                     metadata.get('ultima_modificacao', ''))
+            base = copy.deepcopy(pendencia)
+        
+        alteracao = AlteracaoPendencia(self, numero, pendencia, usuario, datetime.now().isoformat())
+        yield alteracao
+        
+        if alteracao.alterada:
+            alteracao.pendencia = self._gravar_mesclando(numero, base, alteracao.pendencia, pasta, arquivo)
+    
+    def _gravar_mesclando(self, numero, base, nossa, pasta=None, arquivo=None):
+        """
+        Grava `nossa` (editada a partir de `base`); se a versão mudou, mescla e grava de novo
+        
+        Returns:
+            dict: Documento gravado (o nosso ou o mesclado)
             
-            # Migrar campo 'vendedor' para 'usuario' se necessário (compatibilidade)
-            if 'vendedor' in atualizacoes:
-                atualizacoes['usuario'] = atualizacoes.pop('vendedor')
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência não existir mais
+            ConflitoEdicao: Se os dois lados alteraram o mesmo campo, ou a
+                            versão mudou em todas as TENTATIVAS_CONFLITO_PENDENCIAS
+        """
+        tentativas = max(1, int(_obter_configuracao('TENTATIVAS_CONFLITO_PENDENCIAS', 3)))
+        for tentativa in range(1, tentativas + 1):
+            try:
+                self._gravar_pendencia(numero, pasta, arquivo, nossa)
+                return nossa
+            except ConflitoEdicao:
+                if tentativa >= tentativas:
+                    raise
             
-            # Atualizar campos (situação e status diferenciados)
-            for campo, valor in atualizacoes.items():
-                if campo == 'situacao':
-                    if not (isinstance(valor, str) and valor.strip()):
-                        # ignorar updates vazios
-                        continue
-                    situacao_atual = pendencia.get('situacao', '')
-                    if situacao_atual != valor:
-                        pendencia['historico'].append({
-                            "data": timestamp_iso,
-                            "status_anterior": situacao_atual,
-                            "status_novo": valor,
-                            "usuario": usuario
-                        })
-                        print(f"✓ Histórico atualizado (Situação): {situacao_atual} → {valor} ({usuario})")
-                    pendencia['situacao'] = valor
-                elif campo == 'status':
-                    status_atual = pendencia.get('status', '')
-                    if status_atual != valor:
-                        pendencia['historico'].append({
-                            "data": timestamp_iso,
-                            "status_anterior": status_atual,
-                            "status_novo": f"Status: {status_atual} → {valor} ({usuario})",
-                            "usuario": usuario
-                        })
-                        print(f"✓ Histórico atualizado (Status): {status_atual} → {valor} ({usuario})")
-                    pendencia['status'] = valor
-                elif campo == 'usuario':
-                    # Migrar de 'vendedor' para 'usuario' se necessário
-                    if 'vendedor' in pendencia:
-                        del pendencia['vendedor']
-                    pendencia['usuario'] = valor
-                else:
-                    pendencia[campo] = valor
-            
-            # Migrar campo 'vendedor' para 'usuario' se ainda existir (compatibilidade)
-            if 'vendedor' in pendencia and 'usuario' not in pendencia:
-                pendencia['usuario'] = pendencia['vendedor']
-                del pendencia['vendedor']
-            
-            # Atualizar metadata
-            pendencia['data_atualizacao'] = timestamp_iso
-            pendencia['metadata']['ultima_modificacao'] = timestamp_iso
-            pendencia['metadata']['modificado_por'] = usuario
-            
-            # Salvar
-            with open(arquivo_path, 'w', encoding='utf-8') as f:
-                json.dump(pendencia, f, ensure_ascii=False, indent=2)
+            deles, _, _ = self._carregar_pendencia(numero)
+            if deles is None:
+                raise PendenciaNaoEncontrada(numero)
+            mesclada, conflitos = mesclar_pendencias(base, nossa, deles)
+            metadata = deles.get('metadata', {})
+            if conflitos:
+                raise ConflitoEdicao(numero, metadata.get('modificado_por') or 'Outro usuário',
+                                     metadata.get('ultima_modificacao', ''), conflitos)
+            print(f"✓ Pendência {numero}: edição mesclada com a de {metadata.get('modificado_por', 'outro usuário')}")
+            # Próxima tentativa: compare-and-swap contra a versão que acabou de ser lida
+            base, nossa = deles, mesclada
+    
+    def alterar_com_repeticao(self, numero, aplicar, usuario='Sistema', tentativas=None):
+        """
+        Executa aplicar(alteracao) numa transacao(); em conflito, relê e aplica de novo
+        
+        Para alterações que não dependem do que o usuário viu na tela (mudar
+        situação, transferir, anotar histórico, vincular proposta): refeitas
+        sobre a versão nova, dão o mesmo resultado que feitas em sequência.
+        Edições de um formulário aberto usam transacao(versao_lida=...) e
+        mostram o conflito ao usuário.
+        
+            ger.alterar_com_repeticao(numero, lambda a: a.transferir('Fulano'), usuario)
+        
+        Args:
+            numero: Número da pendência
+            aplicar: Função AlteracaoPendencia -> None (pode ser chamada mais de uma vez)
+            usuario: Nome do usuário fazendo as alterações
+            tentativas: Máximo de tentativas (None = ConfiguracaoRede.TENTATIVAS_CONFLITO_PENDENCIAS)
             
-            print(f"✓ Pendência {numero} atualizada por {usuario}")
-            print(f"✓ Histórico atualizado com {len(pendencia.get('historico', []))} registros")
-            return {'sucesso': True, 'mensagem': 'Atualizado com sucesso', 'conflito': False}
+        Returns:
+            AlteracaoPendencia: Alteração gravada
+            
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência não existir
+            ConflitoEdicao: Se todas as tentativas encontrarem conflito
+        """
+        def tentar():
+            with self.transacao(numero, usuario) as alteracao:
+                aplicar(alteracao)
+            return alteracao
         
-        except Exception as e:
-            print(f"❌ Erro ao atualizar pendência: {e}")
-            return {'sucesso': False, 'mensagem': f'Erro: {e}', 'conflito': False}
+        return self._repetir_em_conflito(tentar, tentativas)
+    
+    def _aplicar_atualizacoes(self, pendencia, atualizacoes, usuario, timestamp_iso):
+        """
+        Aplica campos alterados à pendência, registrando situação/status no histórico
+        
+        Args:
+            pendencia: Dict completo (alterado no lugar)
+            atualizacoes: Dict com campos a atualizar
+            usuario: Nome do usuário fazendo a alteração
+            timestamp_iso: Horário da alteração
+        """
+        # Migrar campo 'vendedor' para 'usuario' se necessário (compatibilidade)
+        if 'vendedor' in atualizacoes:
+            atualizacoes['usuario'] = atualizacoes.pop('vendedor')
+        
+        # Atualizar campos (situação e status diferenciados)
+        for campo, valor in atualizacoes.items():
+            if campo == 'situacao':
+                if not (isinstance(valor, str) and valor.strip()):
+                    # ignorar updates vazios
+                    continue
+                situacao_atual = pendencia.get('situacao', '')
+                if situacao_atual != valor:
+                    pendencia['historico'].append({
+                        "data": timestamp_iso,
+                        "status_anterior": situacao_atual,
+                        "status_novo": valor,
+                        "usuario": usuario
+                    })
+                    print(f"✓ Histórico atualizado (Situação): {situacao_atual} → {valor} ({usuario})")
+                pendencia['situacao'] = valor
+            elif campo == 'status':
+                status_atual = pendencia.get('status', '')
+                if status_atual != valor:
+                    pendencia['historico'].append({
+                        "data": timestamp_iso,
+                        "status_anterior": status_atual,
+                        "status_novo": f"Status: {status_atual} → {valor} ({usuario})",
+                        "usuario": usuario
+                    })
+                    print(f"✓ Histórico atualizado (Status): {status_atual} → {valor} ({usuario})")
+                pendencia['status'] = valor
+            elif campo == 'usuario':
+                # Migrar de 'vendedor' para 'usuario' se necessário
+                if 'vendedor' in pendencia:
+                    del pendencia['vendedor']
+                pendencia['usuario'] = valor
+            else:
+                pendencia[campo] = valor
+        
+        # Migrar campo 'vendedor' para 'usuario' se ainda existir (compatibilidade)
+        if 'vendedor' in pendencia and 'usuario' not in pendencia:
+            pendencia['usuario'] = pendencia['vendedor']
+            del pendencia['vendedor']
+        
+        # Atualizar metadata
+        pendencia['data_atualizacao'] = timestamp_iso
+        pendencia['metadata']['ultima_modificacao'] = timestamp_iso
+        pendencia['metadata']['modificado_por'] = usuario
     
     def atualizar_observacoes(self, numero, novo_texto, usuario='Sistema'):
         """
@@ -367,17 +1259,34 @@ class GerenciadorPendenciasJSON:
         Returns:
             bool: True se sucesso
         """
-        pendencia = self.ler_pendencia(numero)
-        if not pendencia:
+        try:
+            with self.transacao(numero, usuario) as alteracao:
+                alteracao.editar_observacoes(novo_texto)
+        except (PendenciaNaoEncontrada, ConflitoEdicao) as e:
+            print(f"⚠️ Observações de {numero} não salvas: {e}")
             return False
+        except Exception as e:
+            print(f"❌ Erro ao salvar: {e}")
+            return False
+        
+        if alteracao.alterada:
+            print(f"✓ Pendência {numero} salva com histórico atualizado")
+            print(f"✓ Histórico tem {len(alteracao.pendencia.get('historico', []))} registros")
+        return True
+    
+    def _anotar_observacoes(self, pendencia, novo_texto, usuario, timestamp_iso):
+        """
+        Troca as observações e registra no histórico
         
+        Returns:
+            bool: True se o texto mudou
+        """
         # Verificar se houve mudança
         texto_anterior = pendencia.get('observacoes', '')
         if texto_anterior == novo_texto:
-            return True  # Nenhuma mudança
+            return False  # Nenhuma mudança
         
         # Registrar mudança no histórico
-        timestamp_iso = datetime.now().isoformat()
         pendencia['historico'].append({
             "data": timestamp_iso,
             "status_anterior": "",
@@ -392,13 +1301,7 @@ class GerenciadorPendenciasJSON:
         pendencia['data_atualizacao'] = timestamp_iso
         pendencia['metadata']['ultima_modificacao'] = timestamp_iso
         pendencia['metadata']['modificado_por'] = usuario
-        
-        # Salvar arquivo
-        resultado = self._salvar_pendencia(numero, pendencia)
-        if resultado:
-            print(f"✓ Pendência {numero} salva com histórico atualizado")
-            print(f"✓ Histórico tem {len(pendencia.get('historico', []))} registros")
-        return resultado
+        return True
     
     def vincular_proposta(self, numero_pendencia, codigo_proposta, arquivo_pdf='', usuario='Sistema'):
         """
@@ -413,31 +1316,54 @@ class GerenciadorPendenciasJSON:
         Returns:
             bool: True se sucesso
         """
-        pendencia = self.ler_pendencia(numero_pendencia)
-        if not pendencia:
+        # Só acrescenta às listas: em conflito, basta refazer sobre a versão nova
+        try:
+            self.alterar_com_repeticao(
+                numero_pendencia, lambda alteracao: alteracao.vincular_proposta(codigo_proposta, arquivo_pdf), usuario
+            )
+        except PendenciaNaoEncontrada:
+            print(f"⚠️ Pendência {numero_pendencia} não encontrada")
             return False
-        
-        # Adicionar proposta vinculada
-        timestamp_iso = datetime.now().isoformat()
-        pendencia['propostas_vinculadas'].append({
+        except Exception as e:
+            print(f"❌ Erro ao vincular proposta: {e}")
+            return False
+        # Mudança de situação, quando aplicável, será feita pelo chamador via API central
+        return True
+    
+    def _anotar_proposta(self, pendencia, codigo_proposta, arquivo_pdf, usuario, timestamp_iso):
+        """Acrescenta a proposta às vinculadas e registra no histórico"""
+        pendencia.setdefault('propostas_vinculadas', []).append({
             "codigo": codigo_proposta,
             "data": timestamp_iso,
             "arquivo": arquivo_pdf if arquivo_pdf else f"{codigo_proposta}.pdf"
         })
         
         # Adicionar ao histórico
-        pendencia['historico'].append({
+        pendencia.setdefault('historico', []).append({
             "data": timestamp_iso,
             "status_anterior": "",
             "status_novo": f"Proposta gerada: {codigo_proposta}",
             "usuario": usuario
         })
-        # Mudança de situação, quando aplicável, será feita pelo chamador via API central
-        
-        return self._salvar_pendencia(numero_pendencia, pendencia)
+    
+    @staticmethod
+    def _extrair_data_do_nome(nome_arquivo):
+        """Extrai data do nome do arquivo (AAMMDDSSSS)"""
+        try:
+            if len(nome_arquivo) >= 6:
+                # AAMMDD (primeiros 6 caracteres)
+                aa = int(nome_arquivo[0:2])
+                mm = int(nome_arquivo[2:4])
+                dd = int(nome_arquivo[4:6])
+                # Converter AA para ano completo (assumindo 2000-2099)
+                ano = 2000 + aa if aa < 50 else 1900 + aa
+                return datetime(ano, mm, dd).date()
+        except (ValueError, IndexError):
+            pass
+        return None
     
     def listar_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None, apenas_ativas=True, 
-                          data_inicio=None, data_fim=None):
+                          data_inicio=None, data_fim=None, resumo=False, leitores_paralelos=None):
         """
         Lista pendências com filtros (carregamento dinâmico por data)
         
@@ -449,12 +1375,105 @@ class GerenciadorPendenciasJSON:
             apenas_ativas: Se True, lista só ATIVAS
             data_inicio: datetime.date - Data inicial para filtrar (None = sem limite)
             data_fim: datetime.date - Data final para filtrar (None = sem limite)
+            resumo: Se True, retorna apenas linhas leves (campos de IndiceResumo.CAMPOS
+                    + 'pasta' e 'total_propostas'), servidas pelo índice de resumo.
+                    Só os arquivos alterados desde a última leitura são abertos.
+            leitores_paralelos: Quantidade de threads lendo arquivos ao mesmo tempo
+                                (útil em compartilhamento de rede lento). None = usar
+                                ConfiguracaoRede.LEITORES_PARALELOS_PENDENCIAS; 0/1 = sequencial.
             
         Returns:
-            list: Lista de dicionários com pendências
+            list: Lista de dicionários com pendências (ou linhas de resumo).
+                  Os documentos completos vêm do cache compartilhado e devem ser
+                  tratados como somente leitura (use ler_pendencia para editar).
         """
-        pendencias = []
+        # Selecionar arquivos com filtro por data ANTES de abrir o arquivo
+        candidatos = self._listar_candidatos(apenas_ativas, data_inicio, data_fim)
+        
+        # Só agora ler os arquivos (já filtrados por data), em paralelo se configurado
+        if leitores_paralelos is None:
+            leitores_paralelos = _obter_configuracao('LEITORES_PARALELOS_PENDENCIAS', 0)
         
+        # Linhas indexadas que não atendem aos filtros dispensam abrir o arquivo
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        
+        def carregar(candidato):
+            pasta, item = candidato
+            return self._carregar_registro_listagem(pasta, item, resumo, filtros)
+        
+        if leitores_paralelos and leitores_paralelos > 1 and len(candidatos) > 1:
+            with ThreadPoolExecutor(max_workers=int(leitores_paralelos)) as executor:
+                # map preserva a ordem de entrada: resultado determinístico
+                registros = list(executor.map(carregar, candidatos))
+        else:
+            registros = [carregar(c) for c in candidatos]
+        
+        pendencias = [
+            p for p in registros
+            if p is not None and self._atende_filtros(p, filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        ]
+        
+        # Ordenar por data (mais recentes primeiro)
+        pendencias.sort(key=lambda x: x.get('data_criacao', ''), reverse=True)
+        
+        return pendencias
+    
+    def iter_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                        apenas_ativas=True, data_inicio=None, data_fim=None, resumo=False,
+                        limite=None, deslocamento=0, mais_recentes_primeiro=True):
+        """
+        Percorre pendências em ordem de número, lendo sob demanda
+        
+        A ordem vem do nome dos arquivos (AAMMDDSSSS), sem abrir nenhum deles;
+        cada arquivo só é lido quando o consumidor pede o próximo item. Com
+        'limite', a leitura para assim que o limite de itens aceitos é atingido
+        (ex.: "as 50 mais recentes" lê ~50 arquivos).
+        
+        Args:
+            filtro_status, filtro_situacao, filtro_vendedor, filtro_setor,
+            apenas_ativas, data_inicio, data_fim, resumo: Iguais a listar_pendencias
+            limite: Máximo de itens entregues (None = todos)
+            deslocamento: Itens aceitos pelos filtros a pular antes de entregar (offset)
+            mais_recentes_primeiro: Se True, do maior para o menor número
+            
+        Yields:
+            dict: Documento (somente leitura) ou linha de resumo
+        """
+        candidatos = self._listar_candidatos(apenas_ativas, data_inicio, data_fim)
+        candidatos.sort(key=lambda c: c[1].name, reverse=mais_recentes_primeiro)
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        
+        pulados = 0
+        entregues = 0
+        for pasta, item in candidatos:
+            if limite is not None and entregues >= limite:
+                return
+            
+            pendencia = self._carregar_registro_listagem(pasta, item, resumo, filtros)
+            if pendencia is None:
+                continue
+            if not self._atende_filtros(pendencia, filtro_status, filtro_situacao, filtro_vendedor, filtro_setor):
+                continue
+            
+            if pulados < deslocamento:
+                pulados += 1
+                continue
+            
+            entregues += 1
+            yield pendencia
+    
+    def _listar_candidatos(self, apenas_ativas, data_inicio=None, data_fim=None):
+        """
+        Lista os arquivos das pastas de status, filtrando pela data do nome
+        
+        Args:
+            apenas_ativas: Se True, só a pasta ATIVAS
+            data_inicio: datetime.date inicial (None = sem limite)
+            data_fim: datetime.date final (None = sem limite)
+            
+        Returns:
+            list: Tuplas (pasta, os.DirEntry/ArquivoListado/RegistroSegmento) ordenadas por pasta e nome
+        """
         # Determinar pastas a verificar
         if apenas_ativas:
             pastas = ["ATIVAS"]
@@ -462,35 +1481,43 @@ class GerenciadorPendenciasJSON:
             # Incluir todas as pastas de status
             pastas = self.PASTAS_STATUS
         
-        # Função auxiliar para extrair data do nome do arquivo (formato: AAMMDDSSSS)
-        def extrair_data_do_nome(nome_arquivo):
-            """Extrai data do nome do arquivo (AAMMDDSSSS)"""
-            try:
-                if len(nome_arquivo) >= 6:
-                    # AAMMDD (primeiros 6 caracteres)
-                    aa = int(nome_arquivo[0:2])
-                    mm = int(nome_arquivo[2:4])
-                    dd = int(nome_arquivo[4:6])
-                    # Converter AA para ano completo (assumindo 2000-2099)
-                    ano = 2000 + aa if aa < 50 else 1900 + aa
-                    return datetime(ano, mm, dd).date()
-            except (ValueError, IndexError):
-                pass
-            return None
+        # Nomes começam por AAMMDD: o período vira um intervalo de prefixos
+        prefixo_inicio = data_inicio.strftime("%y%m%d") if data_inicio else None
+        prefixo_fim = data_fim.strftime("%y%m%d") if data_fim else None
+        if prefixo_inicio and prefixo_fim and prefixo_inicio > prefixo_fim:
+            prefixo_inicio = prefixo_fim = None  # Período atravessa a virada do século (AA)
         
-        # Ler arquivos JSON com filtro por data ANTES de abrir o arquivo
+        listados = {}
         for pasta in pastas:
-            pasta_path = self.pasta_registros / pasta
-            if not pasta_path.exists():
-                continue
+            # No layout mensal só as subpastas dos meses do período são listadas
+            itens = []
+            for diretorio in self.layout.diretorios(pasta, data_inicio, data_fim):
+                try:
+                    # Listagem em memória: a pasta só é relistada se o diretório mudou
+                    itens.extend(self.listagem_diretorios.listar(diretorio, prefixo_inicio, prefixo_fim))
+                except OSError:
+                    continue
+            listados[pasta] = itens
+        
+        if self.PASTA_COMPACTADA in listados:
+            # Empacotadas: índice do segmento já em memória. Arquivo solto (em
+            # qualquer pasta) vale mais que a cópia do segmento.
+            soltos = {item.name for itens in listados.values() for item in itens}
+            listados[self.PASTA_COMPACTADA].extend(
+                registro for registro in self.segmentos.registros(
+                    prefixo_inicio[:4] if prefixo_inicio else None, prefixo_fim[:4] if prefixo_fim else None)
+                if registro.name not in soltos
+            )
+        
+        candidatos = []
+        for pasta in pastas:
+            itens = listados[pasta]
+            itens.sort(key=lambda item: item.name)
             
-            for arquivo in pasta_path.glob("*.json"):
+            for item in itens:
                 # FILTRO RÁPIDO: Verificar data pelo nome do arquivo ANTES de ler
-                nome_sem_ext = arquivo.stem
-                data_arquivo = extrair_data_do_nome(nome_sem_ext)
-                
-                # Se temos filtro de data, pular arquivos fora do intervalo
                 if data_inicio or data_fim:
+                    data_arquivo = self._extrair_data_do_nome(item.name[:-5])
                     if data_arquivo is None:
                         continue  # Não conseguiu extrair data, pular
                     if data_inicio and data_arquivo < data_inicio:
@@ -498,39 +1525,121 @@ class GerenciadorPendenciasJSON:
                     if data_fim and data_arquivo > data_fim:
                         continue  # Depois do período
                 
-                # Só agora ler o arquivo (já filtrado por data)
-                try:
-                    with open(arquivo, 'r', encoding='utf-8') as f:
-                        pendencia = json.load(f)
-                    
-                    # Aplicar filtros adicionais
-                    if filtro_status and filtro_status != 'Todas':
-                        if pendencia.get('status') != filtro_status:
-                            continue
-                    
-                    if filtro_situacao and filtro_situacao != 'Todas':
-                        if pendencia.get('situacao') != filtro_situacao:
-                            continue
-                    
-                    if filtro_vendedor and filtro_vendedor != 'Todos':
-                        # Suportar tanto 'usuario' (canônico) quanto 'vendedor' (compatibilidade)
-                        usuario_pendencia = pendencia.get('usuario') or pendencia.get('vendedor', '')
-                        if usuario_pendencia != filtro_vendedor:
-                            continue
-                    
-                    if filtro_setor and filtro_setor != 'Todos':
-                        if pendencia.get('setor') != filtro_setor:
-                            continue
-                    
-                    pendencias.append(pendencia)
-                
-                except Exception as e:
-                    print(f"⚠️ Erro ao ler {arquivo.name}: {e}")
+                candidatos.append((pasta, item))
+        
+        return candidatos
+    
+    @staticmethod
+    def _atende_filtros(pendencia, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None):
+        """Verifica se a pendência (ou linha de resumo) passa pelos filtros da lista"""
+        if filtro_status and filtro_status != 'Todas':
+            if pendencia.get('status') != filtro_status:
+                return False
+        
+        if filtro_situacao and filtro_situacao != 'Todas':
+            if pendencia.get('situacao') != filtro_situacao:
+                return False
+        
+        if filtro_vendedor and filtro_vendedor != 'Todos':
+            # Suportar tanto 'usuario' (canônico) quanto 'vendedor' (compatibilidade)
+            usuario_pendencia = pendencia.get('usuario') or pendencia.get('vendedor', '')
+            if usuario_pendencia != filtro_vendedor:
+                return False
+        
+        if filtro_setor and filtro_setor != 'Todos':
+            if pendencia.get('setor') != filtro_setor:
+                return False
+        
+        return True
+    
+    def _carregar_registro_listagem(self, pasta, item, resumo, filtros=None):
+        """
+        Carrega um arquivo da listagem (documento completo ou linha de resumo)
         
-        # Ordenar por data (mais recentes primeiro)
-        pendencias.sort(key=lambda x: x.get('data_criacao', ''), reverse=True)
+        Args:
+            pasta: Pasta de status do arquivo
+            item: os.DirEntry (ou ArquivoListado) do arquivo
+            resumo: Se True, retorna a linha de resumo
+            filtros: Dict campo -> valor (ver _filtros_indexados). Se a linha
+                     indexada estiver atual e não atender, o arquivo nem é aberto.
+            
+        Returns:
+            dict: Documento/linha ou None se o arquivo não puder ser lido ou
+                  (com filtros) não atender
+        """
+        numero = item.name[:-5]
+        try:
+            st = item.stat()
+            
+            if resumo or filtros:
+                # Arquivo inalterado desde a última leitura: usar a linha indexada
+                linha = self.indice_resumo.consultar(numero, pasta, st)
+                if linha is not None:
+                    if filtros and any(linha.get(campo) != valor for campo, valor in filtros.items()):
+                        return None
+                    if resumo:
+                        return linha
+            
+            documento = self._ler_documento(item.path, st, copiar=False)
+            self.indice_resumo.atualizar(numero, pasta, documento, st)
+            if resumo:
+                return IndiceResumo.resumir(documento, pasta)
+            return documento
         
-        return pendencias
+        except Exception as e:
+            print(f"⚠️ Erro ao ler {item.name}: {e}")
+            return None
+    
+    @staticmethod
+    def _filtros_indexados(filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None):
+        """Converte os filtros da lista em campo -> valor (ignorando 'Todas'/'Todos')"""
+        filtros = {}
+        if filtro_status and filtro_status != 'Todas':
+            filtros['status'] = filtro_status
+        if filtro_situacao and filtro_situacao != 'Todas':
+            filtros['situacao'] = filtro_situacao
+        if filtro_vendedor and filtro_vendedor != 'Todos':
+            filtros['usuario'] = filtro_vendedor
+        if filtro_setor and filtro_setor != 'Todos':
+            filtros['setor'] = filtro_setor
+        return filtros
+    
+    def contar_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                          apenas_ativas=True, data_inicio=None, data_fim=None):
+        """
+        Conta pendências pela linha de resumo indexada, sem abrir documentos inalterados
+        
+        Cada arquivo é conferido (tamanho/mtime) como em listar_pendencias:
+        um documento regravado no lugar por outro computador não muda o
+        mtime da pasta, e a linha indexada dele estaria vencida. Só arquivos
+        novos ou alterados são lidos, uma vez, para atualizar o índice.
+        
+        Args:
+            Iguais a listar_pendencias
+            
+        Returns:
+            int: Quantidade de pendências que atendem aos filtros
+        """
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        selecionados = self.indice_resumo.filtrar(filtros)
+        
+        total = 0
+        for pasta, item in self._listar_candidatos(apenas_ativas, data_inicio, data_fim):
+            numero = item.name[:-5]
+            try:
+                st = item.stat()
+            except OSError:
+                continue  # Removido/movido depois da listagem
+            if self.indice_resumo.consultar(numero, pasta, st) is not None:
+                # Linha indexada atual: os índices secundários valem para este arquivo
+                if selecionados is None or numero in selecionados:
+                    total += 1
+                continue
+            # Fora do índice, em outra pasta ou alterado: ler uma vez
+            linha = self._carregar_registro_listagem(pasta, item, True, filtros)
+            if linha is not None and all(linha.get(campo) == valor for campo, valor in filtros.items()):
+                total += 1
+        return total
     
     def atualizar_status(self, numero, novo_status, observacao='', usuario='Sistema'):
         """
@@ -548,17 +1657,24 @@ class GerenciadorPendenciasJSON:
         # não permitir atualização vazia
         if not (isinstance(novo_status, str) and novo_status.strip()):
             return False
-        atualizacoes = {'situacao': novo_status.strip()}
         
-        # 1) Sempre registrar mudança de situação
-        resultado = self.atualizar_pendencia(numero, atualizacoes, usuario)
-        sucesso = resultado.get('sucesso', False)
+        def aplicar(alteracao):
+            alteracao.atualizar({'situacao': novo_status.strip()})
+            if isinstance(observacao, str) and observacao.strip():
+                alteracao.editar_observacoes(observacao.strip())
         
-        # 2) Se houver observação (não vazia após strip), registrar também
-        if sucesso and isinstance(observacao, str) and observacao.strip():
-            self.atualizar_observacoes(numero, observacao.strip(), usuario)
+        # Situação e observação (se houver) numa única gravação, refeita se houver conflito
+        try:
+            self.alterar_com_repeticao(numero, aplicar, usuario)
+        except (PendenciaNaoEncontrada, ConflitoEdicao) as e:
+            print(f"⚠️ Situação de {numero} não atualizada: {e}")
+            return False
+        except Exception as e:
+            print(f"❌ Erro ao atualizar pendência: {e}")
+            return False
         
-        return sucesso
+        print(f"✓ Pendência {numero} atualizada por {usuario}")
+        return True
 
     def atualizar_situacao(self, numero, nova_situacao, observacao='', usuario='Sistema'):
         """API explícita para atualização de situação."""
@@ -577,16 +1693,30 @@ class GerenciadorPendenciasJSON:
         Returns:
             bool: True se sucesso
         """
-        pendencia = self.ler_pendencia(numero)
-        if not pendencia:
+        usuario_destino = vendedor_destino  # Alias para compatibilidade
+        origem = {}
+        
+        def aplicar(alteracao):
+            # Suportar tanto 'usuario' (canônico) quanto 'vendedor' (compatibilidade)
+            origem['usuario'] = alteracao.pendencia.get('usuario') or alteracao.pendencia.get('vendedor', '')
+            alteracao.transferir(usuario_destino, motivo)
+        
+        try:
+            self.alterar_com_repeticao(numero, aplicar, usuario)
+        except PendenciaNaoEncontrada:
+            print(f"⚠️ Pendência {numero} não encontrada")
+            return False
+        except Exception as e:
+            print(f"❌ Erro ao salvar: {e}")
             return False
         
+        print(f"✓ Pendência {numero} transferida: {origem['usuario']} → {usuario_destino}")
+        return True
+    
+    def _anotar_transferencia(self, pendencia, usuario_destino, motivo, usuario, timestamp_iso):
+        """Troca o usuário responsável e registra a transferência no histórico"""
         # Suportar tanto 'usuario' (canônico) quanto 'vendedor' (compatibilidade)
         usuario_origem = pendencia.get('usuario') or pendencia.get('vendedor', '')
-        usuario_destino = vendedor_destino  # Alias para compatibilidade
-        
-        # Atualizar campo canônico 'usuario'
-        timestamp_iso = datetime.now().isoformat()
         
         pendencia['usuario'] = usuario_destino
         # Remover campo antigo se existir
@@ -607,13 +1737,6 @@ class GerenciadorPendenciasJSON:
             "status_novo": f"{obs_texto} ({usuario})",
             "usuario": usuario
         })
-        
-        # Salvar
-        if self._salvar_pendencia(numero, pendencia):
-            print(f"✓ Pendência {numero} transferida: {usuario_origem} → {usuario_destino}")
-            return True
-        else:
-            return False
     
     def arquivar_pendencia(self, numero, motivo='', usuario='Sistema'):
         """
@@ -640,6 +1763,88 @@ class GerenciadorPendenciasJSON:
         # Reutiliza a lógica de arquivamento, diferenciando apenas pela mensagem
         return self._mover_pendencia(numero, "ARQUIVADAS", motivo, usuario, acao_forcada="FECHADA")
     
+    def _anotar_movimentacao(self, pendencia, pasta_origem, pasta_destino, motivo, usuario, acao_forcada,
+                             timestamp_iso):
+        """Registra a movimentação no histórico e nas datas da pendência"""
+        # Definir ação baseado no destino (ou ação forçada)
+        if acao_forcada:
+            acao = acao_forcada
+        elif pasta_destino == "ARQUIVADAS":
+            acao = "ARQUIVADA"
+        else:
+            acao = "MOVIDA"
+        
+        obs_texto = f"{acao} - Movida de {pasta_origem} para {pasta_destino}"
+        if motivo:
+            obs_texto += f" - Motivo: {motivo}"
+        
+        pendencia['historico'].append({
+            "data": timestamp_iso,
+            "status_anterior": "",
+            "status_novo": f"{obs_texto} ({usuario})",
+            "usuario": usuario
+        })
+        
+        pendencia['data_atualizacao'] = timestamp_iso
+        pendencia['metadata']['ultima_modificacao'] = timestamp_iso
+        pendencia['metadata']['modificado_por'] = usuario
+    
+    def _mover_pendencias(self, numeros, pasta_destino, motivo='', usuario='Sistema', acao_forcada=None):
+        """
+        Move várias pendências para a mesma pasta de status
+        
+        Lê todas, anota o histórico com o mesmo horário e grava as
+        movimentações de uma vez (nos backends de banco, uma transação).
+        Pendências já na pasta de destino são mantidas como estão. As que
+        outro usuário gravou no meio do caminho (ConflitoEdicao) são relidas
+        e movidas de novo, até TENTATIVAS_CONFLITO_PENDENCIAS vezes.
+        
+        Returns:
+            list: Relatório por item ({'numero', 'sucesso', 'mensagem'}), na ordem recebida
+        """
+        timestamp_iso = datetime.now().isoformat()
+        tentativas = max(1, int(_obter_configuracao('TENTATIVAS_CONFLITO_PENDENCIAS', 3)))
+        relatorio = {}
+        movidas = []
+        pendentes = list(numeros)
+        
+        for tentativa in range(1, tentativas + 1):
+            itens = []
+            for numero in pendentes:
+                try:
+                    pendencia, arquivo_origem, pasta_origem = self._carregar_pendencia(numero)
+                except Exception as e:
+                    relatorio[numero] = (False, f"Erro: {e}")
+                    continue
+                if pendencia is None:
+                    relatorio[numero] = (False, "Pendência não encontrada")
+                    continue
+                if pasta_origem == pasta_destino:
+                    relatorio[numero] = (True, f"Já está em {pasta_destino}")
+                    continue
+                
+                self._anotar_movimentacao(pendencia, pasta_origem, pasta_destino, motivo, usuario,
+                                          acao_forcada, timestamp_iso)
+                itens.append((numero, pendencia, arquivo_origem, pasta_destino))
+                relatorio[numero] = (True, f"{pasta_origem} → {pasta_destino}")
+            
+            gravadas, falhas = self._gravar_movimentacoes(itens)
+            movidas.extend(gravadas)
+            for numero, erro in falhas:
+                relatorio[numero] = (False, f"Erro: {erro}")
+            
+            # Só os conflitos de versão são refeitos (relidos e anotados de novo)
+            pendentes = [numero for numero, erro in falhas if isinstance(erro, ConflitoEdicao)]
+            if not pendentes or tentativa == tentativas:
+                break
+            time.sleep(random.uniform(0.01, 0.05 * tentativa))
+        
+        print(f"✓ {len(movidas)} pendência(s) movida(s) para {pasta_destino}"
+              + (f", {sum(1 for ok, _ in relatorio.values() if not ok)} falha(s)"
+                 if not all(ok for ok, _ in relatorio.values()) else ""))
+        return [{'numero': numero, 'sucesso': relatorio[numero][0], 'mensagem': relatorio[numero][1]}
+                for numero in numeros]
+    
     def _mover_pendencia(self, numero, pasta_destino, motivo='', usuario='Sistema', acao_forcada=None):
         """Move pendência entre pastas de status.
         
@@ -650,67 +1855,165 @@ class GerenciadorPendenciasJSON:
             usuario: Nome do usuário
             acao_forcada: Força o texto da ação no histórico (ex.: 'FECHADA')
         """
-        # Encontrar arquivo atual
-        arquivo_origem = None
-        pasta_origem = None
+        def mover():
+            # Ler pendência (catálogo → arquivo)
+            pendencia, arquivo_origem, pasta_origem = self._carregar_pendencia(numero)
+            if pendencia is None:
+                raise PendenciaNaoEncontrada(numero)
+            
+            self._anotar_movimentacao(pendencia, pasta_origem, pasta_destino, motivo, usuario,
+                                      acao_forcada, datetime.now().isoformat())
+            
+            # Gravar e renomear para o destino
+            self._gravar_movimentacao(numero, pendencia, arquivo_origem, pasta_destino)
+            return pasta_origem
         
-        for pasta in self.PASTAS_STATUS:
-            temp_path = self.pasta_registros / pasta / f"{numero}.json"
-            if temp_path.exists():
-                arquivo_origem = temp_path
-                pasta_origem = pasta
-                break
+        try:
+            # Conflito de versão: relê e move de novo
+            pasta_origem = self._repetir_em_conflito(mover)
+            print(f"✓ Pendência {numero} movida: {pasta_origem} → {pasta_destino}")
+            return True
         
-        if not arquivo_origem:
+        except PendenciaNaoEncontrada:
             print(f"⚠️ Pendência {numero} não encontrada")
             return False
+        except ConflitoEdicao as e:
+            print(f"⚠️ Pendência {numero} não movida: {e}")
+            return False
+        except Exception as e:
+            print(f"❌ Erro ao mover pendência: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    # ------------------------------------------------------------------
+    # Operações em lote
+    # ------------------------------------------------------------------
+    
+    def _numeros_do_lote(self, numeros=None, consulta=None):
+        """
+        Números de uma operação em lote
         
-        try:
-            # Ler pendência
-            with open(arquivo_origem, 'r', encoding='utf-8') as f:
-                pendencia = json.load(f)
-            
-            # Adicionar observação sobre movimento
-            timestamp_iso = datetime.now().isoformat()
+        Args:
+            numeros: Lista explícita de números
+            consulta: Dict de filtros de iter_pendencias (usado se numeros for None)
             
-            # Definir ação baseado no destino (ou ação forçada)
-            if acao_forcada:
-                acao = acao_forcada
-            elif pasta_destino == "ARQUIVADAS":
-                acao = "ARQUIVADA"
-            else:
-                acao = "MOVIDA"
+        Returns:
+            list: Números (sem repetição, na ordem recebida)
+        """
+        if numeros is None:
+            numeros = [linha['numero'] for linha in self.iter_pendencias(resumo=True, **(consulta or {}))]
+        return list(dict.fromkeys(str(numero) for numero in numeros))
+    
+    def _executar_em_lote(self, numeros, operacao, paralelos=None):
+        """
+        Aplica operacao(numero) -> (sucesso, mensagem) a cada número
+        
+        Cada item é independente (uma falha não interrompe os outros). As
+        gravações rodam em até `paralelos` threads: cada uma espera a rede
+        num arquivo diferente.
+        
+        Args:
+            numeros: Lista de números
+            operacao: Função numero -> (bool, str)
+            paralelos: Threads gravando ao mesmo tempo (None = ConfiguracaoRede)
             
-            obs_texto = f"{acao} - Movida de {pasta_origem} para {pasta_destino}"
-            if motivo:
-                obs_texto += f" - Motivo: {motivo}"
+        Returns:
+            list: Relatório por item ({'numero', 'sucesso', 'mensagem'}), na ordem recebida
+        """
+        if paralelos is None:
+            paralelos = _obter_configuracao('GRAVACOES_PARALELAS_PENDENCIAS', 4)
+        
+        def aplicar(numero):
+            try:
+                sucesso, mensagem = operacao(numero)
+            except Exception as e:
+                sucesso, mensagem = False, f"Erro: {e}"
+            return {'numero': numero, 'sucesso': sucesso, 'mensagem': mensagem}
+        
+        if paralelos and paralelos > 1 and len(numeros) > 1:
+            with ThreadPoolExecutor(max_workers=int(paralelos)) as executor:
+                return list(executor.map(aplicar, numeros))
+        return [aplicar(numero) for numero in numeros]
+    
+    def arquivar_pendencias(self, numeros=None, motivo='', usuario='Sistema', consulta=None):
+        """
+        Move várias pendências para ARQUIVADAS de uma vez
+        
+        Args:
+            numeros: Lista de números (ou None para usar consulta)
+            motivo: Motivo do arquivamento
+            usuario: Nome do usuário fazendo o arquivamento
+            consulta: Filtros de iter_pendencias (ex.: {'data_inicio': ..., 'data_fim': ...})
             
-            pendencia['historico'].append({
-                "data": timestamp_iso,
-                "status_anterior": "",
-                "status_novo": f"{obs_texto} ({usuario})",
-                "usuario": usuario
-            })
+        Returns:
+            list: Relatório por item ({'numero', 'sucesso', 'mensagem'})
+        """
+        return self._mover_pendencias(self._numeros_do_lote(numeros, consulta), "ARQUIVADAS", motivo, usuario)
+    
+    def transferir_pendencias(self, numeros=None, vendedor_destino='', motivo='', usuario='Sistema',
+                              consulta=None, paralelos=None):
+        """
+        Transfere várias pendências para outro usuário
+        
+        Args:
+            numeros: Lista de números (ou None para usar consulta)
+            vendedor_destino: Nome do usuário destino
+            motivo: Motivo da transferência
+            usuario: Nome do usuário fazendo a transferência
+            consulta: Filtros de iter_pendencias (ex.: {'filtro_vendedor': 'Fulano'})
+            paralelos: Threads gravando ao mesmo tempo (None = ConfiguracaoRede)
             
-            pendencia['data_atualizacao'] = timestamp_iso
-            pendencia['metadata']['ultima_modificacao'] = timestamp_iso
+        Returns:
+            list: Relatório por item ({'numero', 'sucesso', 'mensagem'})
+        """
+        def transferir(numero):
+            origem = {}
             
-            # Criar arquivo no destino
-            arquivo_destino = self.pasta_registros / pasta_destino / f"{numero}.json"
-            with open(arquivo_destino, 'w', encoding='utf-8') as f:
-                json.dump(pendencia, f, ensure_ascii=False, indent=2)
+            def aplicar(alteracao):
+                origem['usuario'] = alteracao.pendencia.get('usuario') or alteracao.pendencia.get('vendedor', '')
+                if origem['usuario'] != vendedor_destino:
+                    alteracao.transferir(vendedor_destino, motivo)
             
-            # Deletar arquivo origem
-            arquivo_origem.unlink()
+            try:
+                alteracao = self.alterar_com_repeticao(numero, aplicar, usuario)
+            except PendenciaNaoEncontrada:
+                return False, "Pendência não encontrada"
+            if not alteracao.alterada:
+                return True, f"Já pertence a {vendedor_destino}"
+            return True, f"{origem['usuario']} → {vendedor_destino}"
+        
+        relatorio = self._executar_em_lote(self._numeros_do_lote(numeros, consulta), transferir, paralelos)
+        print(f"✓ {sum(1 for r in relatorio if r['sucesso'])}/{len(relatorio)} pendência(s) transferida(s) "
+              f"para {vendedor_destino}")
+        return relatorio
+    
+    def atualizar_pendencias(self, numeros=None, atualizacoes=None, usuario='Sistema', consulta=None,
+                             paralelos=None):
+        """
+        Aplica as mesmas alterações a várias pendências
+        
+        Args:
+            numeros: Lista de números (ou None para usar consulta)
+            atualizacoes: Dict com campos a atualizar (como em atualizar_pendencia)
+            usuario: Nome do usuário fazendo a alteração
+            consulta: Filtros de iter_pendencias
+            paralelos: Threads gravando ao mesmo tempo (None = ConfiguracaoRede)
             
-            print(f"✓ Pendência {numero} movida: {pasta_origem} → {pasta_destino}")
-            return True
+        Returns:
+            list: Relatório por item ({'numero', 'sucesso', 'mensagem'})
+        """
+        def atualizar(numero):
+            try:
+                self.alterar_com_repeticao(numero, lambda alteracao: alteracao.atualizar(atualizacoes or {}), usuario)
+            except PendenciaNaoEncontrada:
+                return False, "Pendência não encontrada"
+            return True, "Atualizado com sucesso"
         
-        except Exception as e:
-            print(f"❌ Erro ao mover pendência: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+        relatorio = self._executar_em_lote(self._numeros_do_lote(numeros, consulta), atualizar, paralelos)
+        print(f"✓ {sum(1 for r in relatorio if r['sucesso'])}/{len(relatorio)} pendência(s) atualizada(s) "
+              f"por {usuario}")
+        return relatorio
     
     def deletar_pendencia(self, numero, motivo=''):
         """
@@ -721,24 +2024,12 @@ class GerenciadorPendenciasJSON:
         (das pastas ATIVAS/ARQUIVADAS), mantendo apenas o registro em memória
         durante a operação.
         """
-        # Encontrar arquivo atual
-        arquivo_origem = None
-        pasta_origem = None
-        for pasta in self.PASTAS_STATUS:
-            temp_path = self.pasta_registros / pasta / f"{numero}.json"
-            if temp_path.exists():
-                arquivo_origem = temp_path
-                pasta_origem = pasta
-                break
-        
-        if not arquivo_origem:
-            print(f"⚠️ Pendência {numero} não encontrada para deleção")
-            return False
-        
         try:
-            # Ler pendência para log/consistência
-            with open(arquivo_origem, 'r', encoding='utf-8') as f:
-                pendencia = json.load(f)
+            # Leitura, conferência da versão e remoção com a trava da pendência
+            pendencia, pasta_origem = self._remover_pendencia(numero)
+            if pendencia is None:
+                print(f"⚠️ Pendência {numero} não encontrada para deleção")
+                return False
             
             timestamp_iso = datetime.now().isoformat()
             obs_texto = f"DELETADA PERMANENTEMENTE - Removida de {pasta_origem}"
@@ -752,10 +2043,14 @@ class GerenciadorPendenciasJSON:
                 "usuario": "Sistema"
             })
             
-            # Finalmente, remover arquivo físico
-            arquivo_origem.unlink()
             print(f"✓ Pendência {numero} deletada permanentemente ({pasta_origem})")
             return True
+        except PendenciaNaoEncontrada:
+            print(f"⚠️ Pendência {numero} não encontrada para deleção")
+            return False
+        except ConflitoEdicao as e:
+            print(f"⚠️ Pendência {numero} não deletada: {e}")
+            return False
         except Exception as e:
             print(f"❌ Erro ao deletar pendência {numero}: {e}")
             import traceback
@@ -763,20 +2058,19 @@ class GerenciadorPendenciasJSON:
             return False
     
     def _salvar_pendencia(self, numero, pendencia_data):
-        """Salva pendência no arquivo correto"""
-        # Encontrar arquivo (nas pastas existentes)
-        for pasta in self.PASTAS_STATUS:
-            arquivo = self.pasta_registros / pasta / f"{numero}.json"
-            if arquivo.exists():
-                try:
-                    with open(arquivo, 'w', encoding='utf-8') as f:
-                        json.dump(pendencia_data, f, ensure_ascii=False, indent=2)
-                    return True
-                except Exception as e:
-                    print(f"❌ Erro ao salvar: {e}")
-                    return False
-        
-        return False
+        """Salva pendência no arquivo correto (compare-and-swap da versão lida)"""
+        try:
+            # Arquivo e pasta atuais são localizados com a trava da pendência
+            self._gravar_pendencia(numero, None, None, pendencia_data)
+            return True
+        except PendenciaNaoEncontrada:
+            return False
+        except ConflitoEdicao as e:
+            print(f"⚠️ Pendência {numero} não salva: {e}")
+            return False
+        except Exception as e:
+            print(f"❌ Erro ao salvar: {e}")
+            return False
     
     def normalizar_registros(self):
         """Normaliza todos os arquivos de pendência para o formato canônico.
@@ -794,14 +2088,16 @@ class GerenciadorPendenciasJSON:
         }
         total_arquivos = 0
         total_modificados = 0
+        total_erros = 0
         for pasta in self.PASTAS_STATUS:
             pasta_path = self.pasta_registros / pasta
             if not pasta_path.exists():
                 continue
-            for arquivo in pasta_path.glob("*.json"):
+            arquivos = [arquivo for diretorio in self.layout.diretorios(pasta)
+                        for arquivo in diretorio.glob("*.json")]
+            for arquivo in arquivos:
                 try:
-                    with open(arquivo, 'r', encoding='utf-8') as f:
-                        pendencia = json.load(f)
+                    pendencia = decodificar_documento(arquivo.read_bytes())
                 except Exception:
                     continue
                 total_arquivos += 1
@@ -882,12 +2178,145 @@ class GerenciadorPendenciasJSON:
                     usuario_pendencia = pendencia.get('usuario') or pendencia.get('vendedor', 'Sistema')
                     pendencia['metadata']['modificado_por'] = pendencia.get('metadata', {}).get('modificado_por', usuario_pendencia)
                     try:
-                        with open(arquivo, 'w', encoding='utf-8') as f:
-                            json.dump(pendencia, f, ensure_ascii=False, indent=2)
+                        self._gravar_pendencia(arquivo.stem, pasta, arquivo, pendencia)
                         total_modificados += 1
-                    except Exception:
-                        pass
+                    except (ConflitoEdicao, PendenciaNaoEncontrada):
+                        # Gravada ou movida por outro usuário durante a varredura: fica para a próxima
+                        continue
+                    except Exception as e:
+                        total_erros += 1
+                        print(f"❌ Erro ao normalizar {arquivo.name}: {e}")
         print(f"✓ Normalização concluída: {total_modificados}/{total_arquivos} arquivos atualizados")
+        if total_erros:
+            print(f"⚠️ {total_erros} arquivo(s) não puderam ser gravados")
+    
+    def compactar_arquivadas(self, dias=None):
+        """
+        Empacota as pendências arquivadas há mais de N dias em segmentos mensais
+        
+        Os documentos de cada mês (AAMM do número) entram numa nova geração
+        do segmento do mês e só depois os arquivos soltos são apagados, cada
+        um com a trava da pendência e apenas se não mudou desde a leitura.
+        Pode rodar com a interface aberta nos outros computadores.
+        
+        Args:
+            dias: Dias sem gravação (None = ConfiguracaoRede.DIAS_COMPACTAR_ARQUIVADAS)
+            
+        Returns:
+            dict: {'empacotadas', 'segmentos', 'erros'}
+        """
+        if dias is None:
+            dias = _obter_configuracao('DIAS_COMPACTAR_ARQUIVADAS', 90)
+        limite_ns = time.time_ns() - max(1, int(dias)) * 86400 * 10**9
+        
+        self.catalogo.sincronizar(forcar=True)
+        entradas = self.catalogo.entradas_copia()
+        
+        por_mes = {}
+        for numero, entrada in entradas.items():
+            if entrada['pasta'] == self.PASTA_COMPACTADA and entrada['mtime_ns'] < limite_ns:
+                por_mes.setdefault(numero[:4], []).append(numero)
+        # Meses com cópias vencidas (editadas/desarquivadas depois de empacotadas, agora soltas)
+        vencidos = {registro.mes for registro in self.segmentos.registros() if registro.numero in entradas}
+        for mes in vencidos:
+            por_mes.setdefault(mes, [])
+        
+        stats = {'empacotadas': 0, 'segmentos': 0, 'erros': 0}
+        for mes, numeros in sorted(por_mes.items()):
+            lidos = {}
+            for numero in numeros:
+                arquivo = self.pasta_registros / entradas[numero]['arquivo']
+                try:
+                    st = os.stat(arquivo)
+                    lidos[numero] = (arquivo, st, self._ler_documento(arquivo, st, copiar=False))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ {numero} não empacotada: {e}")
+                    stats['erros'] += 1
+            if not lidos and mes not in vencidos:
+                continue
+            
+            try:
+                with self.segmentos.trava(mes):
+                    registros = self.segmentos.brutos(mes)
+                    for numero in [numero for numero in registros if numero in entradas]:
+                        del registros[numero]
+                    for numero, (_, _, documento) in lidos.items():
+                        registros[numero] = comprimir_documento(documento)
+                    self.segmentos.gravar(mes, registros)
+            except (OSError, TimeoutError) as e:
+                print(f"❌ Erro ao gravar o segmento {mes}: {e}")
+                stats['erros'] += len(lidos)
+                continue
+            stats['segmentos'] += 1
+            
+            for numero, (arquivo, st, _) in lidos.items():
+                try:
+                    with self._trava_pendencia(numero):
+                        try:
+                            atual = os.stat(arquivo)
+                        except FileNotFoundError:
+                            # Apagada/movida depois da leitura: a cópia empacotada não vale
+                            self.segmentos.remover(numero)
+                            continue
+                        if (atual.st_size, atual.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+                            continue  # Regravada depois da leitura: o arquivo solto continua valendo
+                        arquivo.unlink()
+                except (OSError, TimeoutError) as e:
+                    print(f"⚠️ {numero} empacotada, mas o arquivo solto ficou: {e}")
+                    stats['erros'] += 1
+                    continue
+                self.catalogo.remover(numero)
+                self.cache_documentos.invalidar(arquivo)
+                stats['empacotadas'] += 1
+        
+        print(f"✓ {stats['empacotadas']} pendências arquivadas empacotadas ({stats['segmentos']} segmentos)")
+        return stats
+    
+    def recodificar_pendencias(self, pastas=None):
+        """
+        Regrava no formato configurado (CODEC_PENDENCIAS) os arquivos que estão em outro
+        
+        Pastas frias quase nunca são regravadas: sem isto a maior parte dos
+        arquivos delas ficaria no formato anterior. O conteúdo não muda (nem
+        versao_seq); cada arquivo é trocado com a trava da pendência.
+        
+        Args:
+            pastas: Pastas de status (None = todas)
+            
+        Returns:
+            dict: {'recodificadas', 'bytes_antes', 'bytes_depois', 'erros'}
+        """
+        self.catalogo.sincronizar(forcar=True)
+        entradas = self.catalogo.entradas_copia()
+        
+        stats = {'recodificadas': 0, 'bytes_antes': 0, 'bytes_depois': 0, 'erros': 0}
+        for numero, entrada in sorted(entradas.items()):
+            pasta = entrada['pasta']
+            if pastas and pasta not in pastas:
+                continue
+            codec = self.codecs.get(pasta, 'json')
+            arquivo = self.pasta_registros / entrada['arquivo']
+            try:
+                with self._trava_pendencia(numero):
+                    with open(arquivo, 'rb') as f:
+                        dados = f.read()
+                    if detectar_codec(dados) == codec:
+                        continue
+                    documento = decodificar_documento(dados)
+                    self._escrever_documento(arquivo, documento, modo='atualizar', pasta=pasta)
+                    st = os.stat(arquivo)
+            except (OSError, ValueError, TimeoutError) as e:
+                print(f"⚠️ {numero} não recodificada: {e}")
+                stats['erros'] += 1
+                continue
+            self._registrar_escrita(numero, pasta, arquivo, documento)
+            stats['recodificadas'] += 1
+            stats['bytes_antes'] += len(dados)
+            stats['bytes_depois'] += st.st_size
+        
+        print(f"✓ {stats['recodificadas']} pendências recodificadas "
+              f"({stats['bytes_antes'] // 1024} KB → {stats['bytes_depois'] // 1024} KB)")
+        return stats
     
     def obter_estatisticas(self):
         """
@@ -896,10 +2325,8 @@ class GerenciadorPendenciasJSON:
         Returns:
             dict: Estatísticas
         """
-        todas = self.listar_pendencias(apenas_ativas=False)
-        
         stats = {
-            'total': len(todas),
+            'total': 0,
             'ativas': 0,
             'arquivadas': 0,
             'fechadas': 0,
@@ -909,7 +2336,10 @@ class GerenciadorPendenciasJSON:
             'sem_proposta': 0
         }
         
-        for p in todas:
+        # Percorrer em fluxo (linhas de resumo), sem montar a lista completa
+        for p in self.iter_pendencias(apenas_ativas=False, resumo=True):
+            stats['total'] += 1
+            
             # Contar por pasta
             # (baseado no status atual - poderia melhorar lendo pasta do arquivo)
             
@@ -922,10 +2352,181 @@ class GerenciadorPendenciasJSON:
             stats['por_vendedor'][usuario] = stats['por_vendedor'].get(usuario, 0) + 1
             
             # Com/sem proposta
-            if p.get('propostas_vinculadas'):
+            if p.get('total_propostas'):
                 stats['com_proposta'] += 1
             else:
                 stats['sem_proposta'] += 1
         
         return stats
+    
+    def estado_em(self, instante):
+        """
+        Situação, status, usuário e pasta de todas as pendências num instante do passado
+        
+        Reconstruído a partir do histórico (ver intervalos_pendencias.py).
+        Pendências criadas depois do instante não aparecem; as apagadas
+        não são mais conhecidas.
+        
+        Args:
+            instante: datetime, date ou texto ISO (data sem hora = fim do dia)
+            
+        Returns:
+            list: Dicts {'numero', 'situacao', 'status', 'usuario', 'pasta'}, por número
+        """
+        momento = instante_iso(instante)
+        estados = (estado_nos_intervalos(intervalos, momento) for intervalos in self._intervalos_pendencias())
+        return sorted((estado for estado in estados if estado), key=lambda estado: estado['numero'])
+    
+    def pipeline_em(self, instantes, campo='situacao', pastas=None):
+        """
+        Quantidade de pendências por valor de um campo em cada instante
+        
+        O histórico é convertido uma vez para todos os instantes
+        (ex.: o último dia de cada mês do ano).
+        
+        Args:
+            instantes: Lista de datetime/date/texto ISO
+            campo: 'situacao', 'status', 'usuario' ou 'pasta'
+            pastas: Se informado, só conta as pendências que estavam nessas pastas no instante
+            
+        Returns:
+            dict: str(instante) → {valor: quantidade}
+        """
+        todos = self._intervalos_pendencias()
+        campos = (campo, 'pasta') if pastas else (campo,)
+        resultado = {}
+        for instante in instantes:
+            momento = instante_iso(instante)
+            contagem = {}
+            for intervalos in todos:
+                estado = estado_nos_intervalos(intervalos, momento, campos)
+                if estado is None or (pastas and estado['pasta'] not in pastas):
+                    continue
+                contagem[estado[campo]] = contagem.get(estado[campo], 0) + 1
+            resultado[str(instante)] = contagem
+        return resultado
+    
+    def _intervalos_pendencias(self):
+        """
+        Intervalos de todas as pendências (_INDICES/intervalos.json)
+        
+        Só os arquivos alterados desde a última consulta são relidos e
+        reconvertidos (com o histórico completo, diário incluído).
+        
+        Returns:
+            list: Retornos de intervalos_da_pendencia
+        """
+        indice = IndiceIntervalos.obter(self.pasta_registros / self.PASTA_INDICES)
+        # Forçado: arquivos regravados no lugar nem sempre mudam o mtime da pasta
+        self.catalogo.sincronizar(forcar=True)
+        fontes = {numero: (entrada['pasta'], entrada['tamanho'], entrada['mtime_ns'],
+                           self.pasta_registros / entrada['arquivo'])
+                  for numero, entrada in self.catalogo.entradas_copia().items()}
+        # Empacotadas em segmentos (o arquivo solto, se existir, vale mais)
+        for registro in self.segmentos.registros():
+            if registro.numero not in fontes:
+                st = registro.stat()
+                fontes[registro.numero] = (self.PASTA_COMPACTADA, st.st_size, st.st_mtime_ns, registro)
+        
+        for numero, (pasta, tamanho, mtime_ns, caminho) in fontes.items():
+            if indice.atual(numero, pasta, tamanho, mtime_ns):
+                continue
+            try:
+                documento = self._ler_documento(caminho, copiar=False)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao ler {numero} para consulta no tempo: {e}")
+                continue
+            indice.atualizar(numero, pasta, tamanho, mtime_ns, self._expandir_historico(documento))
+        indice.manter(fontes)
+        return indice.todos()
+
+
 
+def obter_gerenciador_pendencias(pasta_registros=None):
+    """
+    Cria o gerenciador de pendências do backend configurado
+    (ConfiguracaoRede.BACKEND_PENDENCIAS: 'json', 'sqlite' ou 'postgres')
+    
+    Args:
+        pasta_registros: Pasta PENDENCIAS (apenas backend JSON)
+        
+    Returns:
+        GerenciadorPendenciasJSON: Gerenciador (mesma interface em todos os backends)
+    """
+    backend = str(_obter_configuracao('BACKEND_PENDENCIAS', 'json') or 'json').lower()
+    if backend == 'sqlite':
+        try:
+            from gerenciador_pendencias_sqlite import GerenciadorPendenciasSQLite
+        except ImportError:
+            from .gerenciador_pendencias_sqlite import GerenciadorPendenciasSQLite
+        return GerenciadorPendenciasSQLite()
+    
+    if backend == 'postgres':
+        try:
+            from gerenciador_pendencias_postgres import GerenciadorPendenciasPostgres
+        except ImportError:
+            from .gerenciador_pendencias_postgres import GerenciadorPendenciasPostgres
+        return GerenciadorPendenciasPostgres()
+    
+    if backend != 'json':
+        print(f"⚠️ Backend de pendências desconhecido '{backend}', usando JSON")
+    return GerenciadorPendenciasJSON(pasta_registros)
+
+
+def medir_leitores_paralelos(quantidade=400, latencia_ms=5.0, leitores=(1, 2, 4, 8)):
+    """
+    Tempo de listar_pendencias sem cache, por quantidade de leitores paralelos
+    
+    Cria as pendências numa pasta temporária (apagada no fim) e atrasa cada
+    leitura de arquivo em latencia_ms (time.sleep libera o GIL, como a espera
+    da rede).
+    
+    Args:
+        quantidade: Pendências criadas
+        latencia_ms: Atraso por arquivo lido
+        leitores: Valores de leitores_paralelos a medir
+        
+    Returns:
+        list: (leitores, segundos, pendências listadas) por valor medido
+    """
+    global decodificar_documento
+    pasta = Path(tempfile.mkdtemp(prefix="nexus_leitores_"))
+    original = decodificar_documento
+    resultados = []
+    try:
+        ger = GerenciadorPendenciasJSON(pasta)
+        with redirect_stdout(io.StringIO()):
+            for i in range(quantidade):
+                ger.criar_pendencia(f"Cliente {i}", vendedor_manual='Medição', setor_manual='Medição',
+                                    observacoes='x' * 200)
+        
+        def decodificar_com_latencia(dados):
+            time.sleep(latencia_ms / 1000.0)
+            return original(dados)
+        
+        decodificar_documento = decodificar_com_latencia
+        for quantidade_leitores in leitores:
+            ger.cache_documentos.limpar()
+            inicio = time.perf_counter()
+            listadas = ger.listar_pendencias(leitores_paralelos=quantidade_leitores)
+            resultados.append((quantidade_leitores, time.perf_counter() - inicio, len(listadas)))
+    finally:
+        decodificar_documento = original
+        shutil.rmtree(pasta, ignore_errors=True)
+    return resultados
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'medir_leitores':
+        print(f"Uso: python {Path(__file__).name} medir_leitores [quantidade] [latencia_ms] [leitores,...]")
+        sys.exit(1)
+    
+    quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    latencia_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    leitores = [int(n) for n in sys.argv[4].split(',')] if len(sys.argv) > 4 else [1, 2, 4, 8]
+    resultados = medir_leitores_paralelos(quantidade, latencia_ms, leitores)
+    base = resultados[0][1]
+    print(f"{quantidade} pendências, {latencia_ms:g} ms por leitura")
+    for quantidade_leitores, segundos, listadas in resultados:
+        print(f"  {quantidade_leitores:>3} leitor(es): {segundos:7.3f} s  "
+              f"({base / segundos:4.1f}x, {listadas} listadas)")
@@ -0,0 +1,1017 @@
+# -*- coding: utf-8 -*-
+"""
+Gerenciador de Pendências no PostgreSQL (schema nexus)
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Mesma interface pública do GerenciadorPendenciasJSON, gravando no banco
+central descrito em "BANCO DE DADOS/estrutura.sql":
+
+- nexus.pendencias: colunas do schema original + pasta, total_propostas,
+  documento (jsonb com o JSON completo, sem histórico) e id_cliente
+- nexus.pendencias_historico: uma linha por entrada do histórico
+- nexus.clientes: objeto "cliente" do JSON
+- nexus.usuarios / nexus.setores: usuário e setor por id (criados se ausentes)
+- nexus.pendencias_sequencial: contador diário de números
+
+As tabelas/colunas novas estão em "BANCO DE DADOS/migracao_pendencias_json.sql".
+
+Acesso por pool de conexões (psycopg2) com comandos preparados (PREPARE/
+EXECUTE, um por formato de consulta e conexão) e paginação por chave
+(numero < último visto), sem OFFSET.
+
+Para testes sem servidor, PoolSQLiteCompativel implementa a mesma interface
+do pool sobre SQLite (schema nexus anexado), com as mesmas consultas.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import psycopg2
+    from psycopg2.pool import ThreadedConnectionPool
+except ImportError:
+    psycopg2 = None
+    ThreadedConnectionPool = None
+
+try:
+    from catalogo_pendencias import IndiceResumo
+    from gerenciador_pendencias_json import (
+        ConflitoEdicao, GerenciadorPendenciasJSON, PendenciaNaoEncontrada, _obter_configuracao,
+        _versao_provisoria, _versao_seq
+    )
+    from intervalos_pendencias import intervalos_da_pendencia
+except ImportError:
+    from .catalogo_pendencias import IndiceResumo
+    from .gerenciador_pendencias_json import (
+        ConflitoEdicao, GerenciadorPendenciasJSON, PendenciaNaoEncontrada, _obter_configuracao,
+        _versao_provisoria, _versao_seq
+    )
+    from .intervalos_pendencias import intervalos_da_pendencia
+
+
+def _serializar(valor):
+    """JSON compacto para as colunas jsonb"""
+    return json.dumps(valor, ensure_ascii=False, separators=(',', ':'))
+
+
+def _como_objeto(valor):
+    """Valor de coluna jsonb como objeto Python (psycopg2 já converte; SQLite traz texto)"""
+    if isinstance(valor, (str, bytes)):
+        return json.loads(valor)
+    return valor
+
+
+def _como_texto_data(valor):
+    """Data do banco no formato ISO usado nos JSON (ou '' se vazia)"""
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    return valor or ''
+
+
+def _timestamp(valor):
+    """Texto ISO válido para coluna timestamp, ou None"""
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(str(valor)).isoformat()
+    except ValueError:
+        return None
+
+
+def _inteiro(valor):
+    """Inteiro para colunas integer ('' ou texto inválido = None)"""
+    try:
+        return int(str(valor).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class PoolPostgres:
+    """Pool de conexões psycopg2 com comandos preparados por conexão"""
+
+    _instancias = {}
+    _instancias_lock = threading.Lock()
+
+    def __init__(self, dsn, maximo=8):
+        """
+        Inicializa o pool
+
+        Args:
+            dsn: String de conexão libpq (senha pode vir de PGPASSWORD)
+            maximo: Quantidade máxima de conexões abertas
+
+        Raises:
+            ImportError: Se o psycopg2 não estiver instalado
+        """
+        if psycopg2 is None:
+            raise ImportError("psycopg2 não instalado (pip install psycopg2-binary)")
+        # minconn = maximo: putconn fecha as conexões devolvidas acima do mínimo,
+        # e uma conexão reaberta perde os comandos preparados
+        self._pool = ThreadedConnectionPool(int(maximo), int(maximo), dsn)
+        # conexão -> nomes de comandos já preparados nela (some junto com a conexão)
+        self._preparados = weakref.WeakKeyDictionary()
+        self._preparados_lock = threading.Lock()
+
+    @classmethod
+    def obter(cls, dsn, maximo=8):
+        """Retorna o pool compartilhado do processo para o DSN"""
+        with cls._instancias_lock:
+            pool = cls._instancias.get(dsn)
+            if pool is None:
+                pool = cls(dsn, maximo)
+                cls._instancias[dsn] = pool
+            return pool
+
+    @contextmanager
+    def transacao(self):
+        """
+        Empresta uma conexão do pool dentro de uma transação
+
+        Yields:
+            cursor: Cursor para usar com executar()
+        """
+        con = self._pool.getconn()
+        try:
+            with con.cursor() as cursor:
+                yield cursor
+            con.commit()
+        except BaseException:
+            con.rollback()
+            # PREPARE feito na transação desfeita pode não ter sobrevivido
+            self._esquecer_preparados(con)
+            try:
+                with con.cursor() as cursor:
+                    cursor.execute("DEALLOCATE ALL")
+                con.commit()
+            except Exception:
+                pass
+            raise
+        finally:
+            if con.closed:
+                self._esquecer_preparados(con)
+            self._pool.putconn(con)
+
+    def _esquecer_preparados(self, con):
+        """Descarta os nomes preparados de uma conexão (desfeita ou fechada)"""
+        with self._preparados_lock:
+            self._preparados.pop(con, None)
+
+    def executar(self, cursor, sql, parametros=()):
+        """
+        Executa um comando preparado (PREPARE na primeira vez nesta conexão)
+
+        Args:
+            cursor: Cursor de transacao()
+            sql: Comando com marcadores %s
+            parametros: Valores dos marcadores
+
+        Returns:
+            cursor: O próprio cursor (para fetchone/fetchall)
+        """
+        nome = "nx_" + hashlib.md5(sql.encode('utf-8')).hexdigest()[:16]
+        with self._preparados_lock:
+            preparados = self._preparados.setdefault(cursor.connection, set())
+        if nome not in preparados:
+            contador = iter(range(1, 1000))
+            sql_numerado = re.sub(r"%s", lambda _: f"${next(contador)}", sql)
+            cursor.execute(f"PREPARE {nome} AS {sql_numerado}")
+            preparados.add(nome)
+
+        if parametros:
+            cursor.execute(f"EXECUTE {nome} ({', '.join(['%s'] * len(parametros))})", tuple(parametros))
+        else:
+            cursor.execute(f"EXECUTE {nome}")
+        return cursor
+
+
+class PoolSQLiteCompativel:
+    """
+    Substituto do PoolPostgres sobre SQLite (testes sem servidor)
+
+    Cria o schema 'nexus' como banco anexado, com as mesmas tabelas e
+    colunas usadas pelo gerenciador. sqlite3 já reaproveita comandos
+    preparados pelo texto, então executar() só troca %s por ?.
+    """
+
+    ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS nexus.setores (
+        id_setor INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome_setor TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS nexus.usuarios (
+        codigo_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome_usuario TEXT NOT NULL,
+        telefone_usuario TEXT,
+        email_usuario TEXT UNIQUE,
+        computador_usuario TEXT,
+        cargo_usuario TEXT,
+        nivel_usuario INTEGER,
+        id_setor INTEGER REFERENCES setores (id_setor)
+    );
+    CREATE TABLE IF NOT EXISTS nexus.clientes (
+        id_cliente INTEGER PRIMARY KEY AUTOINCREMENT,
+        cnpj TEXT UNIQUE,
+        razao_social TEXT,
+        telefone TEXT,
+        cidade TEXT,
+        contato TEXT,
+        email TEXT,
+        inscricao_estadual TEXT,
+        endereco TEXT
+    );
+    CREATE TABLE IF NOT EXISTS nexus.pendencias (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero TEXT NOT NULL UNIQUE,
+        data_criacao TEXT NOT NULL,
+        data_atualizacao TEXT,
+        equipamento TEXT,
+        situacao TEXT,
+        status TEXT,
+        prioridade TEXT,
+        prazo_resposta INTEGER,
+        origem TEXT,
+        observacoes TEXT,
+        versao TEXT,
+        ultima_modificacao TEXT,
+        modificado_por TEXT,
+        id_usuario INTEGER REFERENCES usuarios (codigo_usuario),
+        id_setor INTEGER REFERENCES setores (id_setor),
+        pasta TEXT NOT NULL DEFAULT 'ATIVAS',
+        total_propostas INTEGER NOT NULL DEFAULT 0,
+        documento TEXT,
+        versao_seq INTEGER NOT NULL DEFAULT 0,
+        id_cliente INTEGER REFERENCES clientes (id_cliente)
+    );
+    CREATE INDEX IF NOT EXISTS nexus.idx_pendencias_pasta_numero ON pendencias (pasta, numero);
+    CREATE TABLE IF NOT EXISTS nexus.pendencias_historico (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_pendencia INTEGER NOT NULL REFERENCES pendencias (id) ON DELETE CASCADE,
+        seq INTEGER NOT NULL,
+        data TEXT,
+        usuario TEXT,
+        status_anterior TEXT,
+        status_novo TEXT,
+        entrada TEXT NOT NULL,
+        UNIQUE (id_pendencia, seq)
+    );
+    CREATE TABLE IF NOT EXISTS nexus.pendencias_sequencial (
+        prefixo TEXT PRIMARY KEY,
+        ultimo INTEGER NOT NULL
+    );
+    """
+
+    def __init__(self, arquivo=':memory:'):
+        """
+        Inicializa o banco de teste
+
+        Args:
+            arquivo: Arquivo SQLite do schema nexus (padrão: em memória)
+        """
+        self._con = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+        self._con.execute("ATTACH DATABASE ? AS nexus", (str(arquivo),))
+        self._con.execute("PRAGMA foreign_keys=ON")
+        self._con.executescript(self.ESQUEMA)
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def transacao(self):
+        with self._lock:
+            cursor = self._con.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            else:
+                cursor.execute("COMMIT")
+            finally:
+                cursor.close()
+
+    def executar(self, cursor, sql, parametros=()):
+        # "= ANY(%s)" com uma lista (array no PostgreSQL) vira "IN (?, ?, ...)"
+        partes = re.sub(r"=\s*ANY\(%s\)", "IN (%s)", sql).split('%s')
+        comando = [partes[0]]
+        valores = []
+        for parametro, parte in zip(parametros, partes[1:]):
+            if isinstance(parametro, list):
+                comando.append(", ".join(["?"] * len(parametro)))
+                valores.extend(parametro)
+            else:
+                comando.append("?")
+                valores.append(parametro)
+            comando.append(parte)
+        cursor.execute("".join(comando), valores)
+        return cursor
+
+
+def _linhas(cursor):
+    """Resultado do cursor como lista de dicts (nome da coluna -> valor)"""
+    colunas = [d[0] for d in cursor.description]
+    return [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
+
+
+# Colunas da linha de resumo, com usuário/setor pelo nome
+SELECT_LISTA = """
+    SELECT p.id, p.numero, p.pasta, p.data_criacao, p.data_atualizacao,
+           u.nome_usuario AS usuario, s.nome_setor AS setor,
+           p.situacao, p.status, p.prioridade, p.total_propostas{documento}
+    FROM nexus.pendencias p
+    LEFT JOIN nexus.usuarios u ON u.codigo_usuario = p.id_usuario
+    LEFT JOIN nexus.setores s ON s.id_setor = p.id_setor
+"""
+
+# Filtro da lista -> coluna da consulta
+COLUNAS_FILTRO = {
+    'status': 'p.status',
+    'situacao': 'p.situacao',
+    'usuario': 'u.nome_usuario',
+    'setor': 's.nome_setor',
+}
+
+
+class GerenciadorPendenciasPostgres(GerenciadorPendenciasJSON):
+    """Gerencia pendências no PostgreSQL (mesma interface do gerenciador JSON)"""
+
+    # Linhas buscadas por página em iter_pendencias
+    TAMANHO_PAGINA = 200
+
+    # Pendências por transação durante a importação
+    LOTE_IMPORTACAO = 500
+
+    def __init__(self, pool=None):
+        """
+        Inicializa o gerenciador
+
+        Args:
+            pool: PoolPostgres/PoolSQLiteCompativel (None = ConfiguracaoRede.DSN_POSTGRES_PENDENCIAS)
+        """
+        if pool is None:
+            pool = PoolPostgres.obter(
+                _obter_configuracao('DSN_POSTGRES_PENDENCIAS', 'dbname=Nexus_DB user=postgres'),
+                _obter_configuracao('CONEXOES_POSTGRES_PENDENCIAS', 8)
+            )
+        self.pool = pool
+        # Cache nome -> id de usuários/setores (limpo se uma transação falhar)
+        self._ids_usuarios = {}
+        self._ids_setores = {}
+
+    @contextmanager
+    def _transacao(self):
+        """Transação do pool; descarta ids em cache se falhar"""
+        try:
+            with self.pool.transacao() as cursor:
+                yield cursor
+        except BaseException:
+            self._ids_usuarios.clear()
+            self._ids_setores.clear()
+            raise
+
+    def _executar(self, cursor, sql, parametros=()):
+        return self.pool.executar(cursor, sql, parametros)
+
+    # ------------------------------------------------------------------
+    # Usuários, setores e clientes
+    # ------------------------------------------------------------------
+
+    def _id_setor(self, cursor, nome):
+        """Id do setor pelo nome (cria se não existir)"""
+        if not nome:
+            return None
+        if nome not in self._ids_setores:
+            self._ids_setores[nome] = self._executar(
+                cursor,
+                "INSERT INTO nexus.setores (nome_setor) VALUES (%s) "
+                "ON CONFLICT (nome_setor) DO UPDATE SET nome_setor = excluded.nome_setor "
+                "RETURNING id_setor",
+                (nome,)
+            ).fetchone()[0]
+        return self._ids_setores[nome]
+
+    def _id_usuario(self, cursor, nome, id_setor):
+        """Id do usuário pelo nome (cria um cadastro mínimo se não existir)"""
+        if not nome:
+            return None
+        if nome not in self._ids_usuarios:
+            linha = self._executar(
+                cursor,
+                "SELECT codigo_usuario FROM nexus.usuarios WHERE nome_usuario = %s "
+                "ORDER BY codigo_usuario LIMIT 1",
+                (nome,)
+            ).fetchone()
+            if linha is None:
+                linha = self._executar(
+                    cursor,
+                    "INSERT INTO nexus.usuarios (nome_usuario, id_setor) VALUES (%s, %s) "
+                    "RETURNING codigo_usuario",
+                    (nome, id_setor)
+                ).fetchone()
+            self._ids_usuarios[nome] = linha[0]
+        return self._ids_usuarios[nome]
+
+    def _id_cliente(self, cursor, cliente, id_atual):
+        """
+        Grava o cliente da pendência e retorna o id
+
+        Com CNPJ: um cadastro por CNPJ. Sem CNPJ: o cadastro já ligado à
+        pendência é atualizado (ou um novo é criado).
+        """
+        if not isinstance(cliente, dict):
+            return id_atual
+        cnpj = re.sub(r"\D", "", str(cliente.get('cnpj') or '')) or None
+        valores = (
+            cliente.get('razao_social'), cliente.get('telefone'), cliente.get('cidade'),
+            cliente.get('contato'), cliente.get('email'), cliente.get('inscricao_estadual'),
+            cliente.get('endereco'),
+        )
+
+        if cnpj:
+            return self._executar(
+                cursor,
+                "INSERT INTO nexus.clientes (cnpj, razao_social, telefone, cidade, contato, email, "
+                "inscricao_estadual, endereco) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+                "ON CONFLICT (cnpj) DO UPDATE SET razao_social = excluded.razao_social, "
+                "telefone = excluded.telefone, cidade = excluded.cidade, contato = excluded.contato, "
+                "email = excluded.email, inscricao_estadual = excluded.inscricao_estadual, "
+                "endereco = excluded.endereco RETURNING id_cliente",
+                (cnpj,) + valores
+            ).fetchone()[0]
+
+        if id_atual is not None:
+            self._executar(
+                cursor,
+                "UPDATE nexus.clientes SET razao_social = %s, telefone = %s, cidade = %s, contato = %s, "
+                "email = %s, inscricao_estadual = %s, endereco = %s WHERE id_cliente = %s AND cnpj IS NULL",
+                valores + (id_atual,)
+            )
+            return id_atual
+
+        return self._executar(
+            cursor,
+            "INSERT INTO nexus.clientes (razao_social, telefone, cidade, contato, email, "
+            "inscricao_estadual, endereco) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id_cliente",
+            valores
+        ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Leitura e gravação de documentos
+    # ------------------------------------------------------------------
+
+    def _carregar_pendencia(self, numero):
+        """
+        Lê o documento completo de uma pendência (com histórico)
+
+        Returns:
+            tuple: (pendencia, None, nome da pasta) ou (None, None, None)
+        """
+        with self._transacao() as cursor:
+            linha = self._executar(
+                cursor, "SELECT id, pasta, documento FROM nexus.pendencias WHERE numero = %s", (str(numero),)
+            ).fetchone()
+            if linha is None:
+                return None, None, None
+            id_pendencia, pasta, documento = linha
+
+            pendencia = _como_objeto(documento) or {}
+            pendencia['historico'] = [
+                _como_objeto(h[0]) for h in self._executar(
+                    cursor,
+                    "SELECT entrada FROM nexus.pendencias_historico WHERE id_pendencia = %s ORDER BY seq",
+                    (id_pendencia,)
+                ).fetchall()
+            ]
+        return pendencia, None, pasta
+
+    def _gravar_documento(self, cursor, numero, pasta, pendencia):
+        """
+        Insere/atualiza a pendência (colunas + documento) e sincroniza o histórico
+
+        Args:
+            cursor: Cursor dentro de uma transação
+            numero: Número da pendência
+            pasta: Pasta de status
+            pendencia: Dict completo
+        """
+        numero = str(numero)
+        resumo = IndiceResumo.resumir(pendencia, pasta)
+        metadata = pendencia.get('metadata') or {}
+
+        atual = self._executar(
+            cursor, "SELECT id_cliente FROM nexus.pendencias WHERE numero = %s", (numero,)
+        ).fetchone()
+        id_setor = self._id_setor(cursor, resumo['setor'])
+        id_usuario = self._id_usuario(cursor, resumo['usuario'], id_setor)
+        id_cliente = self._id_cliente(cursor, pendencia.get('cliente'), atual[0] if atual else None)
+
+        corpo = {campo: valor for campo, valor in pendencia.items() if campo != 'historico'}
+        id_pendencia = self._executar(
+            cursor,
+            """
+            INSERT INTO nexus.pendencias (numero, data_criacao, data_atualizacao, equipamento, situacao,
+                status, prioridade, prazo_resposta, origem, observacoes, versao, ultima_modificacao,
+                modificado_por, id_usuario, id_setor, id_cliente, pasta, total_propostas, documento, versao_seq)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (numero) DO UPDATE SET
+                data_criacao = excluded.data_criacao,
+                data_atualizacao = excluded.data_atualizacao,
+                equipamento = excluded.equipamento,
+                situacao = excluded.situacao,
+                status = excluded.status,
+                prioridade = excluded.prioridade,
+                prazo_resposta = excluded.prazo_resposta,
+                origem = excluded.origem,
+                observacoes = excluded.observacoes,
+                versao = excluded.versao,
+                ultima_modificacao = excluded.ultima_modificacao,
+                modificado_por = excluded.modificado_por,
+                id_usuario = excluded.id_usuario,
+                id_setor = excluded.id_setor,
+                id_cliente = excluded.id_cliente,
+                pasta = excluded.pasta,
+                total_propostas = excluded.total_propostas,
+                documento = excluded.documento,
+                versao_seq = excluded.versao_seq
+            RETURNING id
+            """,
+            (numero,
+             _timestamp(resumo['data_criacao']) or _timestamp(datetime.now().isoformat()),
+             _timestamp(resumo['data_atualizacao']),
+             pendencia.get('equipamento') or None,
+             resumo['situacao'] or None,
+             resumo['status'] or None,
+             resumo['prioridade'] or None,
+             _inteiro(pendencia.get('prazo_resposta')),
+             pendencia.get('origem') or None,
+             pendencia.get('observacoes') or None,
+             metadata.get('versao'),
+             _timestamp(metadata.get('ultima_modificacao')),
+             metadata.get('modificado_por'),
+             id_usuario, id_setor, id_cliente, pasta, resumo['total_propostas'],
+             _serializar(corpo), _versao_seq(metadata))
+        ).fetchone()[0]
+
+        self._sincronizar_historico(cursor, id_pendencia, pendencia.get('historico') or [])
+
+    def _sincronizar_historico(self, cursor, id_pendencia, historico):
+        """
+        Grava as entradas novas do histórico
+
+        O histórico só cresce no uso normal: apenas o final é inserido. Se a
+        lista encolheu ou a última entrada gravada mudou, tudo é regravado.
+        """
+        gravadas = self._executar(
+            cursor, "SELECT COUNT(*) FROM nexus.pendencias_historico WHERE id_pendencia = %s", (id_pendencia,)
+        ).fetchone()[0]
+
+        if gravadas:
+            ultima = self._executar(
+                cursor,
+                "SELECT entrada FROM nexus.pendencias_historico WHERE id_pendencia = %s AND seq = %s",
+                (id_pendencia, gravadas - 1)
+            ).fetchone()
+            if (gravadas > len(historico) or ultima is None or
+                    _como_objeto(ultima[0]) != historico[gravadas - 1]):
+                self._executar(
+                    cursor, "DELETE FROM nexus.pendencias_historico WHERE id_pendencia = %s", (id_pendencia,)
+                )
+                gravadas = 0
+
+        for seq, entrada in enumerate(historico[gravadas:], start=gravadas):
+            self._executar(
+                cursor,
+                "INSERT INTO nexus.pendencias_historico (id_pendencia, seq, data, usuario, status_anterior, "
+                "status_novo, entrada) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                (id_pendencia, seq, _timestamp(entrada.get('data')), entrada.get('usuario'),
+                 entrada.get('status_anterior'), entrada.get('status_novo'), _serializar(entrada))
+            )
+
+    def _gravar_nova_pendencia(self, pendencia):
+        """
+        Insere uma pendência nova em ATIVAS (troca o número se já estiver em uso)
+
+        Returns:
+            Path: Tabela de destino (exibida na mensagem de criação)
+        """
+        for _ in range(5):
+            numero = pendencia['numero']
+            with self._transacao() as cursor:
+                existe = self._executar(
+                    cursor, "SELECT 1 FROM nexus.pendencias WHERE numero = %s", (numero,)
+                ).fetchone()
+                if existe is None:
+                    self._gravar_documento(cursor, numero, "ATIVAS", pendencia)
+                    return Path("nexus.pendencias")
+            print(f"⚠️ Número {numero} já existe, gerando outro")
+            pendencia['numero'] = self._gerar_numero_sequencial()
+
+        raise FileExistsError(f"Não foi possível reservar um número livre ({pendencia['numero']})")
+
+    def _conferir_versao_banco(self, cursor, numero, pendencia):
+        """
+        Compare-and-swap da versão dentro da transação
+
+        O UPDATE condicional trava a linha até o commit: um segundo escritor
+        que leu a mesma versão espera e, ao reavaliar o WHERE, não encontra
+        mais a linha (conflito), sem SELECT ... FOR UPDATE.
+
+        Returns:
+            str: Pasta atual da pendência
+
+        Raises:
+            PendenciaNaoEncontrada: Se a pendência não existir
+            ConflitoEdicao: Se a versão gravada não é a que foi lida
+        """
+        lida = _versao_seq(pendencia.get('metadata'))
+        linha = self._executar(
+            cursor,
+            "UPDATE nexus.pendencias SET versao_seq = %s WHERE numero = %s AND versao_seq = %s RETURNING pasta",
+            (lida + 1, str(numero), lida)
+        ).fetchone()
+        if linha is None:
+            atual = self._executar(
+                cursor, "SELECT modificado_por, ultima_modificacao FROM nexus.pendencias WHERE numero = %s",
+                (str(numero),)
+            ).fetchone()
+            if atual is None:
+                raise PendenciaNaoEncontrada(numero)
+            raise ConflitoEdicao(numero, atual[0] or 'Outro usuário', _como_texto_data(atual[1]))
+        pendencia.setdefault('metadata', {})['versao_seq'] = lida + 1
+        return linha[0]
+
+    def _gravar_pendencia(self, numero, pasta, arquivo, pendencia):
+        with _versao_provisoria(pendencia), self._transacao() as cursor:
+            pasta = self._conferir_versao_banco(cursor, numero, pendencia)
+            self._gravar_documento(cursor, numero, pasta, pendencia)
+
+    def _gravar_movimentacao(self, numero, pendencia, arquivo_origem, pasta_destino):
+        with _versao_provisoria(pendencia), self._transacao() as cursor:
+            self._conferir_versao_banco(cursor, numero, pendencia)
+            self._gravar_documento(cursor, numero, pasta_destino, pendencia)
+
+    def _gravar_movimentacoes(self, itens):
+        """
+        Grava várias movimentações numa única transação
+
+        Itens com conflito de versão ficam de fora (e voltam em falhas); se
+        a transação falhar, nenhum item é gravado.
+        """
+        if not itens:
+            return [], []
+        movidas, falhas = [], []
+        try:
+            with _versao_provisoria(*[pendencia for _, pendencia, _, _ in itens]), self._transacao() as cursor:
+                for numero, pendencia, _, pasta_destino in itens:
+                    try:
+                        self._conferir_versao_banco(cursor, numero, pendencia)
+                    except (PendenciaNaoEncontrada, ConflitoEdicao) as e:
+                        falhas.append((numero, e))
+                        continue
+                    self._gravar_documento(cursor, numero, pasta_destino, pendencia)
+                    movidas.append(numero)
+        except Exception as e:
+            return [], [(numero, e) for numero, _, _, _ in itens]
+        return movidas, falhas
+
+    def _remover_pendencia(self, numero):
+        """Lê e remove uma pendência (o DELETE já é atômico no banco)"""
+        pendencia, _, pasta = self._carregar_pendencia(numero)
+        if pendencia is not None:
+            self._remover_documento(numero, None)
+        return pendencia, pasta
+
+    def _remover_documento(self, numero, arquivo):
+        with self._transacao() as cursor:
+            self._executar(cursor, "DELETE FROM nexus.pendencias WHERE numero = %s", (str(numero),))
+
+    def _gerar_numero_sequencial(self):
+        """
+        Gera número sequencial único (AAMMDDSSSS) pelo contador do banco
+
+        Um único INSERT ... ON CONFLICT incrementa o contador do dia de forma
+        atômica; na primeira vez do dia parte do maior número existente.
+
+        Returns:
+            str: Número sequencial
+        """
+        prefixo = datetime.now().strftime("%y%m%d")  # AAMMDD
+        with self._transacao() as cursor:
+            ultimo = self._executar(
+                cursor,
+                "INSERT INTO nexus.pendencias_sequencial AS s (prefixo, ultimo) VALUES (%s, "
+                "(SELECT COALESCE(MAX(CAST(SUBSTR(numero, 7, 4) AS INTEGER)), 0) + 1 "
+                " FROM nexus.pendencias WHERE numero LIKE %s)) "
+                "ON CONFLICT (prefixo) DO UPDATE SET ultimo = s.ultimo + 1 RETURNING ultimo",
+                (prefixo, prefixo + '%')
+            ).fetchone()[0]
+        return f"{prefixo}{ultimo:04d}"
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _montar_consulta(self, filtros, apenas_ativas, data_inicio, data_fim):
+        """
+        Monta a cláusula WHERE das consultas de lista
+
+        Returns:
+            tuple: (lista de condições, lista de parâmetros)
+        """
+        condicoes = []
+        parametros = []
+
+        if apenas_ativas:
+            condicoes.append("p.pasta = %s")
+            parametros.append("ATIVAS")
+
+        # Número começa por AAMMDD: período vira faixa no índice único de numero
+        if data_inicio:
+            condicoes.append("p.numero >= %s")
+            parametros.append(data_inicio.strftime("%y%m%d"))
+        if data_fim:
+            condicoes.append("p.numero < %s")
+            parametros.append((data_fim + timedelta(days=1)).strftime("%y%m%d"))
+
+        for campo, valor in filtros.items():
+            condicoes.append(f"{COLUNAS_FILTRO[campo]} = %s")
+            parametros.append(valor)
+
+        return condicoes, parametros
+
+    @staticmethod
+    def _where(condicoes):
+        return (" WHERE " + " AND ".join(condicoes)) if condicoes else ""
+
+    def _linhas_para_registros(self, cursor, linhas, resumo):
+        """Converte linhas da consulta em linhas de resumo ou documentos completos"""
+        if resumo:
+            registros = []
+            for linha in linhas:
+                registro = {campo: linha.get(campo) or '' for campo in IndiceResumo.CAMPOS}
+                registro['data_criacao'] = _como_texto_data(linha['data_criacao'])
+                registro['data_atualizacao'] = _como_texto_data(linha['data_atualizacao'])
+                registro['pasta'] = linha['pasta']
+                registro['total_propostas'] = linha['total_propostas'] or 0
+                registros.append(registro)
+            return registros
+
+        pendencias = {}
+        for linha in linhas:
+            pendencia = _como_objeto(linha['documento']) or {}
+            pendencia['historico'] = []
+            pendencias[linha['id']] = pendencia
+
+        ids = list(pendencias)
+        for inicio in range(0, len(ids), 500):
+            # Um array como parâmetro: o mesmo comando preparado para qualquer tamanho de lote
+            for id_pendencia, entrada in self._executar(
+                    cursor,
+                    "SELECT id_pendencia, entrada FROM nexus.pendencias_historico "
+                    "WHERE id_pendencia = ANY(%s) ORDER BY id_pendencia, seq",
+                    [ids[inicio:inicio + 500]]
+            ).fetchall():
+                pendencias[id_pendencia]['historico'].append(_como_objeto(entrada))
+
+        return list(pendencias.values())
+
+    def listar_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                          apenas_ativas=True, data_inicio=None, data_fim=None, resumo=False, leitores_paralelos=None):
+        """
+        Lista pendências com filtros (uma consulta no banco)
+
+        Args:
+            Iguais a GerenciadorPendenciasJSON.listar_pendencias
+            (leitores_paralelos é ignorado)
+
+        Returns:
+            list: Documentos ou linhas de resumo, mais recentes primeiro
+        """
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        condicoes, parametros = self._montar_consulta(filtros, apenas_ativas, data_inicio, data_fim)
+        sql = (SELECT_LISTA.format(documento="" if resumo else ", p.documento") +
+               self._where(condicoes) + " ORDER BY p.data_criacao DESC")
+        try:
+            with self._transacao() as cursor:
+                linhas = _linhas(self._executar(cursor, sql, parametros))
+                return self._linhas_para_registros(cursor, linhas, resumo)
+        except Exception as e:
+            print(f"⚠️ Erro ao listar pendências: {e}")
+            return []
+
+    def pagina_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                          apenas_ativas=True, data_inicio=None, data_fim=None, resumo=True,
+                          apos_numero=None, limite=50, mais_recentes_primeiro=True):
+        """
+        Uma página de pendências por paginação de chave (sem OFFSET)
+
+        Args:
+            Filtros iguais a listar_pendencias
+            apos_numero: Último número da página anterior (None = primeira página)
+            limite: Itens por página
+            mais_recentes_primeiro: Se True, do maior para o menor número
+
+        Returns:
+            tuple: (lista de registros, número para a próxima página ou None)
+        """
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        condicoes, parametros = self._montar_consulta(filtros, apenas_ativas, data_inicio, data_fim)
+        if apos_numero is not None:
+            condicoes.append("p.numero < %s" if mais_recentes_primeiro else "p.numero > %s")
+            parametros.append(str(apos_numero))
+
+        ordem = "DESC" if mais_recentes_primeiro else "ASC"
+        sql = (SELECT_LISTA.format(documento="" if resumo else ", p.documento") +
+               self._where(condicoes) + f" ORDER BY p.numero {ordem} LIMIT %s")
+        parametros.append(int(limite))
+
+        with self._transacao() as cursor:
+            linhas = _linhas(self._executar(cursor, sql, parametros))
+            registros = self._linhas_para_registros(cursor, linhas, resumo)
+
+        proximo = linhas[-1]['numero'] if len(linhas) == int(limite) else None
+        return registros, proximo
+
+    def iter_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                        apenas_ativas=True, data_inicio=None, data_fim=None, resumo=False,
+                        limite=None, deslocamento=0, mais_recentes_primeiro=True):
+        """
+        Percorre pendências em ordem de número, página a página (paginação por chave)
+
+        Args:
+            Iguais a GerenciadorPendenciasJSON.iter_pendencias
+
+        Yields:
+            dict: Documento ou linha de resumo
+        """
+        pular = int(deslocamento or 0)
+        restantes = limite
+        cursor_pagina = None
+        while restantes is None or restantes > 0:
+            tamanho = self.TAMANHO_PAGINA
+            if restantes is not None:
+                tamanho = min(tamanho, restantes + pular)
+            registros, cursor_pagina = self.pagina_pendencias(
+                filtro_status, filtro_situacao, filtro_vendedor, filtro_setor, apenas_ativas,
+                data_inicio, data_fim, resumo, cursor_pagina, tamanho, mais_recentes_primeiro
+            )
+            for registro in registros:
+                if pular:
+                    pular -= 1
+                    continue
+                if restantes is not None:
+                    if restantes <= 0:
+                        return
+                    restantes -= 1
+                yield registro
+            if cursor_pagina is None:
+                return
+
+    def contar_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                          apenas_ativas=True, data_inicio=None, data_fim=None):
+        """
+        Conta pendências (SELECT COUNT no banco)
+
+        Returns:
+            int: Quantidade de pendências que atendem aos filtros
+        """
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        condicoes, parametros = self._montar_consulta(filtros, apenas_ativas, data_inicio, data_fim)
+        sql = ("SELECT COUNT(*) FROM nexus.pendencias p "
+               "LEFT JOIN nexus.usuarios u ON u.codigo_usuario = p.id_usuario "
+               "LEFT JOIN nexus.setores s ON s.id_setor = p.id_setor" + self._where(condicoes))
+        with self._transacao() as cursor:
+            return self._executar(cursor, sql, parametros).fetchone()[0]
+
+    def _intervalos_pendencias(self):
+        """
+        Intervalos de todas as pendências, calculados na consulta
+
+        O banco já guarda o histórico completo; não há índice em _INDICES.
+
+        Returns:
+            list: Retornos de intervalos_da_pendencia
+        """
+        pastas = {linha['numero']: linha['pasta'] for linha in self.iter_pendencias(apenas_ativas=False, resumo=True)}
+        return [intervalos_da_pendencia(pendencia, pastas.get(pendencia.get('numero')))
+                for pendencia in self.iter_pendencias(apenas_ativas=False)]
+
+    def obter_estatisticas(self):
+        """
+        Gera estatísticas das pendências (agregações no banco)
+
+        Returns:
+            dict: Mesmo formato de GerenciadorPendenciasJSON.obter_estatisticas
+        """
+        stats = {
+            'total': 0,
+            'ativas': 0,
+            'arquivadas': 0,
+            'fechadas': 0,
+            'por_status': {},
+            'por_vendedor': {},
+            'com_proposta': 0,
+            'sem_proposta': 0
+        }
+
+        with self._transacao() as cursor:
+            total, com_proposta = self._executar(
+                cursor,
+                "SELECT COUNT(*), COALESCE(SUM(CASE WHEN total_propostas > 0 THEN 1 ELSE 0 END), 0) "
+                "FROM nexus.pendencias"
+            ).fetchone()
+            por_status = self._executar(
+                cursor,
+                "SELECT COALESCE(status, 'Sem Status'), COUNT(*) FROM nexus.pendencias "
+                "GROUP BY COALESCE(status, 'Sem Status')"
+            ).fetchall()
+            por_usuario = self._executar(
+                cursor,
+                "SELECT COALESCE(u.nome_usuario, 'Sem Usuário'), COUNT(*) FROM nexus.pendencias p "
+                "LEFT JOIN nexus.usuarios u ON u.codigo_usuario = p.id_usuario "
+                "GROUP BY COALESCE(u.nome_usuario, 'Sem Usuário')"
+            ).fetchall()
+
+        stats['total'] = total
+        stats['com_proposta'] = com_proposta
+        stats['sem_proposta'] = total - com_proposta
+        stats['por_status'] = {status: quantidade for status, quantidade in por_status}
+        stats['por_vendedor'] = {usuario: quantidade for usuario, quantidade in por_usuario}
+        return stats
+
+    def obter_estatisticas_cache(self):
+        """Sem cache de documentos no backend PostgreSQL"""
+        return {}
+
+    def normalizar_registros(self):
+        """Normalização de arquivos JSON (não se aplica ao banco)"""
+        print("⚠️ normalizar_registros atua sobre as pastas JSON; normalize antes de importar")
+
+    def compactar_arquivadas(self, dias=None):
+        """Segmentos de arquivadas (não se aplica ao banco)"""
+        print("⚠️ compactar_arquivadas atua sobre as pastas JSON; no banco não há arquivos a empacotar")
+        return {'empacotadas': 0, 'segmentos': 0, 'erros': 0}
+
+    def recodificar_pendencias(self, pastas=None):
+        """Formato dos arquivos JSON (não se aplica ao banco)"""
+        print("⚠️ recodificar_pendencias atua sobre as pastas JSON; no banco o documento fica em coluna")
+        return {'recodificadas': 0, 'bytes_antes': 0, 'bytes_depois': 0, 'erros': 0}
+
+    # ------------------------------------------------------------------
+    # Importação
+    # ------------------------------------------------------------------
+
+    def importar_de_json(self, pasta_registros=None, substituir=False):
+        """
+        Importa as pendências das pastas JSON para o banco
+
+        Pode ser executada mais de uma vez: pendências já importadas são
+        ignoradas (ou regravadas com substituir=True).
+
+        Args:
+            pasta_registros: Pasta PENDENCIAS de origem (None = ConfiguracaoRede)
+            substituir: Se True, sobrescreve pendências já existentes no banco
+
+        Returns:
+            dict: {'importadas': int, 'ignoradas': int, 'erros': int}
+        """
+        origem = GerenciadorPendenciasJSON(pasta_registros)
+        candidatos = origem._listar_candidatos(apenas_ativas=False)
+        resultado = {'importadas': 0, 'ignoradas': 0, 'erros': 0}
+
+        for inicio in range(0, len(candidatos), self.LOTE_IMPORTACAO):
+            for pasta, item in candidatos[inicio:inicio + self.LOTE_IMPORTACAO]:
+                numero = item.name[:-5]
+                try:
+                    # Uma transação por pendência: um documento inválido não desfaz o lote
+                    with self._transacao() as cursor:
+                        if not substituir and self._executar(
+                                cursor, "SELECT 1 FROM nexus.pendencias WHERE numero = %s", (numero,)
+                        ).fetchone():
+                            resultado['ignoradas'] += 1
+                            continue
+                        pendencia = origem._expandir_historico(origem._ler_documento(item.path, item.stat(), copiar=False))
+                        self._gravar_documento(cursor, numero, pasta, pendencia)
+                        resultado['importadas'] += 1
+                except Exception as e:
+                    print(f"❌ Erro ao importar {item.name}: {e}")
+                    resultado['erros'] += 1
+
+        print(f"✓ Importação concluída: {resultado['importadas']} importadas, "
+              f"{resultado['ignoradas']} já existentes, {resultado['erros']} erros")
+        return resultado
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'importar':
+        print(f"Uso: python {Path(__file__).name} importar [pasta_pendencias]")
+        sys.exit(1)
+
+    pasta = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    GerenciadorPendenciasPostgres().importar_de_json(pasta)
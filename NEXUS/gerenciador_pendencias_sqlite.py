@@ -0,0 +1,636 @@
+# -*- coding: utf-8 -*-
+"""
+Gerenciador de Pendências em Banco SQLite
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Mesma interface pública do GerenciadorPendenciasJSON (criar, ler, atualizar,
+listar, mover, estatísticas...), com os dados em um único arquivo SQLite:
+
+- Tabela 'pendencias': campos de lista em colunas indexadas (pasta, usuário,
+  setor, situação, status...) + documento JSON completo (sem o histórico)
+- Tabela 'historico': uma linha por entrada do histórico (numero, seq)
+- Tabela 'sequencial': contador diário de números (AAMMDD → último sufixo)
+
+Listas, filtros, contagens e estatísticas viram consultas SQL, sem varrer
+pastas. O banco usa WAL (leitores não bloqueiam o gravador).
+
+Importante: WAL exige memória compartilhada entre os processos e não
+funciona com o arquivo em compartilhamento de rede (SMB). Use o banco em
+disco local (um computador) ou um servidor de banco para vários usuários.
+
+Importação dos JSON existentes:
+    python gerenciador_pendencias_sqlite.py importar [pasta_pendencias] [arquivo_banco]
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from catalogo_pendencias import IndiceResumo
+    from gerenciador_pendencias_json import (
+        ConflitoEdicao, GerenciadorPendenciasJSON, PendenciaNaoEncontrada, _obter_configuracao, _versao_provisoria
+    )
+    from intervalos_pendencias import intervalos_da_pendencia
+except ImportError:
+    from .catalogo_pendencias import IndiceResumo
+    from .gerenciador_pendencias_json import (
+        ConflitoEdicao, GerenciadorPendenciasJSON, PendenciaNaoEncontrada, _obter_configuracao, _versao_provisoria
+    )
+    from .intervalos_pendencias import intervalos_da_pendencia
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pendencias (
+    numero            TEXT PRIMARY KEY,
+    pasta             TEXT NOT NULL,
+    data_criacao      TEXT,
+    data_atualizacao  TEXT,
+    usuario           TEXT,
+    setor             TEXT,
+    situacao          TEXT,
+    status            TEXT,
+    prioridade        TEXT,
+    total_propostas   INTEGER NOT NULL DEFAULT 0,
+    documento         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pendencias_pasta ON pendencias (pasta, numero);
+CREATE INDEX IF NOT EXISTS idx_pendencias_usuario ON pendencias (usuario);
+CREATE INDEX IF NOT EXISTS idx_pendencias_setor ON pendencias (setor);
+CREATE INDEX IF NOT EXISTS idx_pendencias_situacao ON pendencias (situacao);
+CREATE INDEX IF NOT EXISTS idx_pendencias_status ON pendencias (status);
+CREATE INDEX IF NOT EXISTS idx_pendencias_data_criacao ON pendencias (data_criacao);
+
+CREATE TABLE IF NOT EXISTS historico (
+    numero   TEXT NOT NULL REFERENCES pendencias (numero) ON DELETE CASCADE,
+    seq      INTEGER NOT NULL,
+    data     TEXT,
+    usuario  TEXT,
+    entrada  TEXT NOT NULL,
+    PRIMARY KEY (numero, seq)
+);
+
+CREATE TABLE IF NOT EXISTS sequencial (
+    prefixo  TEXT PRIMARY KEY,
+    ultimo   INTEGER NOT NULL
+);
+"""
+
+# Colunas da linha de resumo (mesmos campos de IndiceResumo + pasta/total_propostas)
+COLUNAS_RESUMO = IndiceResumo.CAMPOS + ('pasta', 'total_propostas')
+
+
+def _serializar(valor):
+    """JSON compacto usado nas colunas de documento/histórico"""
+    return json.dumps(valor, ensure_ascii=False, separators=(',', ':'))
+
+
+class BancoPendenciasSQLite:
+    """Arquivo SQLite compartilhado pelo processo (uma conexão por thread)"""
+
+    # Espera (segundos) por uma trava de escrita antes de erro "database is locked"
+    TIMEOUT = 30.0
+
+    _instancias = {}
+    _instancias_lock = threading.Lock()
+
+    def __init__(self, arquivo):
+        """
+        Inicializa o banco (cria o esquema se necessário)
+
+        Args:
+            arquivo: Path do arquivo SQLite
+        """
+        self.arquivo = Path(arquivo)
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        con = self.conexao()
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(ESQUEMA)
+
+    @classmethod
+    def obter(cls, arquivo):
+        """Retorna o banco compartilhado para o arquivo"""
+        chave = str(Path(arquivo).resolve())
+        with cls._instancias_lock:
+            banco = cls._instancias.get(chave)
+            if banco is None:
+                banco = cls(arquivo)
+                cls._instancias[chave] = banco
+            return banco
+
+    def conexao(self):
+        """
+        Conexão da thread atual (criada na primeira chamada)
+
+        As conexões ficam em modo autocommit; escritas agrupadas usam transacao().
+        """
+        con = getattr(self._local, 'conexao', None)
+        if con is None:
+            con = sqlite3.connect(str(self.arquivo), timeout=self.TIMEOUT, isolation_level=None)
+            con.row_factory = sqlite3.Row
+            con.execute("PRAGMA foreign_keys=ON")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = con
+        return con
+
+    @contextmanager
+    def transacao(self):
+        """
+        Transação de escrita (BEGIN IMMEDIATE: trava de escrita obtida no início)
+
+        Yields:
+            sqlite3.Connection: Conexão da thread atual
+        """
+        con = self.conexao()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        else:
+            con.execute("COMMIT")
+
+
+class GerenciadorPendenciasSQLite(GerenciadorPendenciasJSON):
+    """Gerencia pendências em banco SQLite (mesma interface do gerenciador JSON)"""
+
+    # Quantidade de dias mantidos na tabela de contadores
+    DIAS_MANTIDOS = 7
+
+    # Pendências por transação durante a importação
+    LOTE_IMPORTACAO = 500
+
+    def __init__(self, arquivo_banco=None):
+        """
+        Inicializa o gerenciador
+
+        Args:
+            arquivo_banco: Path do arquivo SQLite (None = ConfiguracaoRede.ARQUIVO_BANCO_PENDENCIAS)
+        """
+        if arquivo_banco is None:
+            arquivo_banco = _obter_configuracao('ARQUIVO_BANCO_PENDENCIAS', None)
+            if arquivo_banco is None:
+                arquivo_banco = Path(__file__).parent.parent / "GERENCIAMENTO" / "pendencias.sqlite3"
+        self.banco = BancoPendenciasSQLite.obter(arquivo_banco)
+        self.arquivo_banco = self.banco.arquivo
+
+    # ------------------------------------------------------------------
+    # Leitura e gravação de documentos
+    # ------------------------------------------------------------------
+
+    def _carregar_pendencia(self, numero):
+        """
+        Lê o documento completo de uma pendência (com histórico)
+
+        Returns:
+            tuple: (pendencia, None, nome da pasta) ou (None, None, None)
+        """
+        con = self.banco.conexao()
+        linha = con.execute(
+            "SELECT pasta, documento FROM pendencias WHERE numero = ?", (str(numero),)
+        ).fetchone()
+        if linha is None:
+            return None, None, None
+
+        pendencia = json.loads(linha['documento'])
+        pendencia['historico'] = [
+            json.loads(h['entrada']) for h in con.execute(
+                "SELECT entrada FROM historico WHERE numero = ? ORDER BY seq", (str(numero),)
+            )
+        ]
+        return pendencia, None, linha['pasta']
+
+    def _gravar_documento(self, con, numero, pasta, pendencia):
+        """
+        Insere/atualiza a linha da pendência e sincroniza o histórico
+
+        Args:
+            con: Conexão dentro de uma transação
+            numero: Número da pendência
+            pasta: Pasta de status
+            pendencia: Dict completo
+        """
+        resumo = IndiceResumo.resumir(pendencia, pasta)
+        corpo = {campo: valor for campo, valor in pendencia.items() if campo != 'historico'}
+        con.execute(
+            """
+            INSERT INTO pendencias (numero, pasta, data_criacao, data_atualizacao, usuario, setor,
+                                    situacao, status, prioridade, total_propostas, documento)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (numero) DO UPDATE SET
+                pasta = excluded.pasta,
+                data_criacao = excluded.data_criacao,
+                data_atualizacao = excluded.data_atualizacao,
+                usuario = excluded.usuario,
+                setor = excluded.setor,
+                situacao = excluded.situacao,
+                status = excluded.status,
+                prioridade = excluded.prioridade,
+                total_propostas = excluded.total_propostas,
+                documento = excluded.documento
+            """,
+            (str(numero), pasta, resumo['data_criacao'], resumo['data_atualizacao'],
+             resumo['usuario'], resumo['setor'], resumo['situacao'], resumo['status'],
+             resumo['prioridade'], resumo['total_propostas'], _serializar(corpo))
+        )
+        self._sincronizar_historico(con, str(numero), pendencia.get('historico') or [])
+
+    @staticmethod
+    def _sincronizar_historico(con, numero, historico):
+        """
+        Grava no banco as entradas novas do histórico
+
+        O histórico só cresce no uso normal: apenas o final é inserido. Se a
+        lista encolheu ou a última entrada gravada mudou, tudo é regravado.
+        """
+        gravadas = con.execute(
+            "SELECT COUNT(*) FROM historico WHERE numero = ?", (numero,)
+        ).fetchone()[0]
+
+        if gravadas:
+            ultima = con.execute(
+                "SELECT entrada FROM historico WHERE numero = ? AND seq = ?", (numero, gravadas - 1)
+            ).fetchone()
+            if (gravadas > len(historico) or ultima is None or
+                    ultima[0] != _serializar(historico[gravadas - 1])):
+                con.execute("DELETE FROM historico WHERE numero = ?", (numero,))
+                gravadas = 0
+
+        con.executemany(
+            "INSERT INTO historico (numero, seq, data, usuario, entrada) VALUES (?, ?, ?, ?, ?)",
+            [
+                (numero, seq, entrada.get('data', ''), entrada.get('usuario', ''), _serializar(entrada))
+                for seq, entrada in enumerate(historico[gravadas:], start=gravadas)
+            ]
+        )
+
+    def _gravar_nova_pendencia(self, pendencia):
+        """
+        Insere uma pendência nova em ATIVAS (troca o número se já estiver em uso)
+
+        Returns:
+            Path: Arquivo do banco
+        """
+        for _ in range(5):
+            numero = pendencia['numero']
+            try:
+                with self.banco.transacao() as con:
+                    existe = con.execute(
+                        "SELECT 1 FROM pendencias WHERE numero = ?", (numero,)
+                    ).fetchone()
+                    if existe is None:
+                        self._gravar_documento(con, numero, "ATIVAS", pendencia)
+                        return self.arquivo_banco
+            except sqlite3.IntegrityError:
+                pass
+            print(f"⚠️ Número {numero} já existe, gerando outro")
+            pendencia['numero'] = self._gerar_numero_sequencial()
+
+        raise FileExistsError(f"Não foi possível reservar um número livre ({pendencia['numero']})")
+
+    def _conferir_versao_banco(self, con, numero, pendencia):
+        """
+        Compare-and-swap da versão dentro da transação
+
+        BEGIN IMMEDIATE já serializa os escritores: a versão lida aqui não
+        muda até o commit.
+
+        Returns:
+            str: Pasta atual da pendência
+
+        Raises:
+            PendenciaNaoEncontrada, ConflitoEdicao: Como em _conferir_versao
+        """
+        linha = con.execute(
+            "SELECT pasta, json_extract(documento, '$.metadata') FROM pendencias WHERE numero = ?", (str(numero),)
+        ).fetchone()
+        self._conferir_versao(numero, pendencia, None if linha is None else json.loads(linha[1] or '{}'))
+        return linha['pasta']
+
+    def _gravar_pendencia(self, numero, pasta, arquivo, pendencia):
+        with _versao_provisoria(pendencia), self.banco.transacao() as con:
+            pasta = self._conferir_versao_banco(con, numero, pendencia)
+            self._gravar_documento(con, numero, pasta, pendencia)
+
+    def _gravar_movimentacao(self, numero, pendencia, arquivo_origem, pasta_destino):
+        with _versao_provisoria(pendencia), self.banco.transacao() as con:
+            self._conferir_versao_banco(con, numero, pendencia)
+            self._gravar_documento(con, numero, pasta_destino, pendencia)
+
+    def _gravar_movimentacoes(self, itens):
+        """
+        Grava várias movimentações numa única transação
+
+        Itens com conflito de versão ficam de fora (e voltam em falhas); se
+        a transação falhar, nenhum item é gravado.
+        """
+        if not itens:
+            return [], []
+        movidas, falhas = [], []
+        try:
+            with _versao_provisoria(*[pendencia for _, pendencia, _, _ in itens]), self.banco.transacao() as con:
+                for numero, pendencia, _, pasta_destino in itens:
+                    try:
+                        self._conferir_versao_banco(con, numero, pendencia)
+                    except (PendenciaNaoEncontrada, ConflitoEdicao) as e:
+                        falhas.append((numero, e))
+                        continue
+                    self._gravar_documento(con, numero, pasta_destino, pendencia)
+                    movidas.append(numero)
+        except Exception as e:
+            return [], [(numero, e) for numero, _, _, _ in itens]
+        return movidas, falhas
+
+    def _remover_pendencia(self, numero):
+        """Lê e remove uma pendência (o DELETE já é atômico no banco)"""
+        pendencia, _, pasta = self._carregar_pendencia(numero)
+        if pendencia is not None:
+            self._remover_documento(numero, None)
+        return pendencia, pasta
+
+    def _remover_documento(self, numero, arquivo):
+        with self.banco.transacao() as con:
+            con.execute("DELETE FROM pendencias WHERE numero = ?", (str(numero),))
+
+    def _gerar_numero_sequencial(self):
+        """
+        Gera número sequencial único (AAMMDDSSSS) pelo contador do banco
+
+        Returns:
+            str: Número sequencial
+        """
+        prefixo = datetime.now().strftime("%y%m%d")  # AAMMDD
+
+        with self.banco.transacao() as con:
+            linha = con.execute(
+                "SELECT ultimo FROM sequencial WHERE prefixo = ?", (prefixo,)
+            ).fetchone()
+            if linha is not None:
+                ultimo = linha[0]
+            else:
+                # Contador ausente (primeira do dia ou banco importado): maior número existente
+                maior = con.execute(
+                    "SELECT MAX(numero) FROM pendencias WHERE numero >= ? AND numero < ?",
+                    (prefixo, prefixo + '\uffff')
+                ).fetchone()[0]
+                try:
+                    ultimo = int(maior[6:10]) if maior else 0
+                except ValueError:
+                    ultimo = 0
+
+            con.execute(
+                "INSERT INTO sequencial (prefixo, ultimo) VALUES (?, ?) "
+                "ON CONFLICT (prefixo) DO UPDATE SET ultimo = excluded.ultimo",
+                (prefixo, ultimo + 1)
+            )
+            con.execute(
+                "DELETE FROM sequencial WHERE prefixo NOT IN "
+                "(SELECT prefixo FROM sequencial ORDER BY prefixo DESC LIMIT ?)",
+                (self.DIAS_MANTIDOS,)
+            )
+
+        return f"{prefixo}{ultimo + 1:04d}"
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _montar_consulta(self, filtros, apenas_ativas, data_inicio, data_fim):
+        """
+        Monta a cláusula WHERE das consultas de lista
+
+        Returns:
+            tuple: (texto WHERE, lista de parâmetros)
+        """
+        condicoes = []
+        parametros = []
+
+        if apenas_ativas:
+            condicoes.append("pasta = ?")
+            parametros.append("ATIVAS")
+
+        # Número começa por AAMMDD: período vira faixa no índice da chave primária
+        if data_inicio:
+            condicoes.append("numero >= ?")
+            parametros.append(data_inicio.strftime("%y%m%d"))
+        if data_fim:
+            condicoes.append("numero < ?")
+            parametros.append(data_fim.strftime("%y%m%d") + '\uffff')
+
+        for campo, valor in filtros.items():
+            condicoes.append(f"{campo} = ?")
+            parametros.append(valor)
+
+        where = (" WHERE " + " AND ".join(condicoes)) if condicoes else ""
+        return where, parametros
+
+    def _linhas_para_registros(self, con, linhas, resumo):
+        """Converte linhas da tabela em linhas de resumo ou documentos completos"""
+        if resumo:
+            return [{coluna: linha[coluna] for coluna in COLUNAS_RESUMO} for linha in linhas]
+
+        pendencias = {}
+        for linha in linhas:
+            pendencia = json.loads(linha['documento'])
+            pendencia['historico'] = []
+            pendencias[linha['numero']] = pendencia
+
+        # Históricos em lotes (limite de parâmetros por consulta)
+        numeros = list(pendencias)
+        for inicio in range(0, len(numeros), 500):
+            lote = numeros[inicio:inicio + 500]
+            marcadores = ",".join("?" * len(lote))
+            for h in con.execute(
+                f"SELECT numero, entrada FROM historico WHERE numero IN ({marcadores}) ORDER BY numero, seq",
+                lote
+            ):
+                pendencias[h['numero']]['historico'].append(json.loads(h['entrada']))
+
+        return list(pendencias.values())
+
+    def listar_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                          apenas_ativas=True, data_inicio=None, data_fim=None, resumo=False, leitores_paralelos=None):
+        """
+        Lista pendências com filtros (uma consulta SQL)
+
+        Args:
+            Iguais a GerenciadorPendenciasJSON.listar_pendencias
+            (leitores_paralelos é ignorado)
+
+        Returns:
+            list: Documentos ou linhas de resumo, mais recentes primeiro
+        """
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        where, parametros = self._montar_consulta(filtros, apenas_ativas, data_inicio, data_fim)
+        con = self.banco.conexao()
+        try:
+            linhas = con.execute(
+                f"SELECT * FROM pendencias{where} ORDER BY data_criacao DESC", parametros
+            ).fetchall()
+            return self._linhas_para_registros(con, linhas, resumo)
+        except Exception as e:
+            print(f"⚠️ Erro ao listar pendências: {e}")
+            return []
+
+    def iter_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                        apenas_ativas=True, data_inicio=None, data_fim=None, resumo=False,
+                        limite=None, deslocamento=0, mais_recentes_primeiro=True):
+        """
+        Percorre pendências em ordem de número (LIMIT/OFFSET no banco)
+
+        Args:
+            Iguais a GerenciadorPendenciasJSON.iter_pendencias
+
+        Yields:
+            dict: Documento ou linha de resumo
+        """
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        where, parametros = self._montar_consulta(filtros, apenas_ativas, data_inicio, data_fim)
+        ordem = "DESC" if mais_recentes_primeiro else "ASC"
+        sql = f"SELECT * FROM pendencias{where} ORDER BY numero {ordem} LIMIT ? OFFSET ?"
+        parametros += [-1 if limite is None else int(limite), int(deslocamento or 0)]
+
+        con = self.banco.conexao()
+        cursor = con.execute(sql, parametros)
+        while True:
+            linhas = cursor.fetchmany(200)
+            if not linhas:
+                return
+            yield from self._linhas_para_registros(con, linhas, resumo)
+
+    def contar_pendencias(self, filtro_status=None, filtro_situacao=None, filtro_vendedor=None, filtro_setor=None,
+                          apenas_ativas=True, data_inicio=None, data_fim=None):
+        """
+        Conta pendências (SELECT COUNT nas colunas indexadas)
+
+        Returns:
+            int: Quantidade de pendências que atendem aos filtros
+        """
+        filtros = self._filtros_indexados(filtro_status, filtro_situacao, filtro_vendedor, filtro_setor)
+        where, parametros = self._montar_consulta(filtros, apenas_ativas, data_inicio, data_fim)
+        return self.banco.conexao().execute(f"SELECT COUNT(*) FROM pendencias{where}", parametros).fetchone()[0]
+
+    def _intervalos_pendencias(self):
+        """
+        Intervalos de todas as pendências, calculados na consulta
+
+        O banco já guarda o histórico completo; não há índice em _INDICES.
+
+        Returns:
+            list: Retornos de intervalos_da_pendencia
+        """
+        pastas = {linha['numero']: linha['pasta'] for linha in self.iter_pendencias(apenas_ativas=False, resumo=True)}
+        return [intervalos_da_pendencia(pendencia, pastas.get(pendencia.get('numero')))
+                for pendencia in self.iter_pendencias(apenas_ativas=False)]
+
+    def obter_estatisticas(self):
+        """
+        Gera estatísticas das pendências (agregações no banco)
+
+        Returns:
+            dict: Mesmo formato de GerenciadorPendenciasJSON.obter_estatisticas
+        """
+        con = self.banco.conexao()
+        stats = {
+            'total': 0,
+            'ativas': 0,
+            'arquivadas': 0,
+            'fechadas': 0,
+            'por_status': {},
+            'por_vendedor': {},
+            'com_proposta': 0,
+            'sem_proposta': 0
+        }
+
+        total, com_proposta = con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_propostas > 0), 0) FROM pendencias"
+        ).fetchone()
+        stats['total'] = total
+        stats['com_proposta'] = com_proposta
+        stats['sem_proposta'] = total - com_proposta
+
+        for status, quantidade in con.execute(
+                "SELECT COALESCE(status, 'Sem Status'), COUNT(*) FROM pendencias GROUP BY 1"):
+            stats['por_status'][status] = quantidade
+        for usuario, quantidade in con.execute(
+                "SELECT COALESCE(NULLIF(usuario, ''), 'Sem Usuário'), COUNT(*) FROM pendencias GROUP BY 1"):
+            stats['por_vendedor'][usuario] = quantidade
+
+        return stats
+
+    def obter_estatisticas_cache(self):
+        """Sem cache de documentos no backend SQLite"""
+        return {}
+
+    def normalizar_registros(self):
+        """Normalização de arquivos JSON (não se aplica ao banco)"""
+        print("⚠️ normalizar_registros atua sobre as pastas JSON; normalize antes de importar")
+
+    def compactar_arquivadas(self, dias=None):
+        """Segmentos de arquivadas (não se aplica ao banco)"""
+        print("⚠️ compactar_arquivadas atua sobre as pastas JSON; no banco não há arquivos a empacotar")
+        return {'empacotadas': 0, 'segmentos': 0, 'erros': 0}
+
+    def recodificar_pendencias(self, pastas=None):
+        """Formato dos arquivos JSON (não se aplica ao banco)"""
+        print("⚠️ recodificar_pendencias atua sobre as pastas JSON; no banco o documento fica em coluna")
+        return {'recodificadas': 0, 'bytes_antes': 0, 'bytes_depois': 0, 'erros': 0}
+
+    # ------------------------------------------------------------------
+    # Importação
+    # ------------------------------------------------------------------
+
+    def importar_de_json(self, pasta_registros=None, substituir=False):
+        """
+        Importa as pendências das pastas JSON para o banco
+
+        Pode ser executada mais de uma vez: pendências já importadas são
+        ignoradas (ou regravadas com substituir=True).
+
+        Args:
+            pasta_registros: Pasta PENDENCIAS de origem (None = ConfiguracaoRede)
+            substituir: Se True, sobrescreve pendências já existentes no banco
+
+        Returns:
+            dict: {'importadas': int, 'ignoradas': int, 'erros': int}
+        """
+        origem = GerenciadorPendenciasJSON(pasta_registros)
+        candidatos = origem._listar_candidatos(apenas_ativas=False)
+        resultado = {'importadas': 0, 'ignoradas': 0, 'erros': 0}
+
+        for inicio in range(0, len(candidatos), self.LOTE_IMPORTACAO):
+            with self.banco.transacao() as con:
+                for pasta, item in candidatos[inicio:inicio + self.LOTE_IMPORTACAO]:
+                    numero = item.name[:-5]
+                    if not substituir and con.execute(
+                            "SELECT 1 FROM pendencias WHERE numero = ?", (numero,)).fetchone():
+                        resultado['ignoradas'] += 1
+                        continue
+                    try:
+                        pendencia = origem._expandir_historico(origem._ler_documento(item.path, item.stat(), copiar=False))
+                        self._gravar_documento(con, numero, pasta, pendencia)
+                        resultado['importadas'] += 1
+                    except Exception as e:
+                        print(f"❌ Erro ao importar {item.name}: {e}")
+                        resultado['erros'] += 1
+
+        print(f"✓ Importação concluída: {resultado['importadas']} importadas, "
+              f"{resultado['ignoradas']} já existentes, {resultado['erros']} erros")
+        return resultado
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'importar':
+        print(f"Uso: python {Path(__file__).name} importar [pasta_pendencias] [arquivo_banco]")
+        sys.exit(1)
+
+    pasta = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    arquivo = Path(sys.argv[3]) if len(sys.argv) > 3 else None
+    GerenciadorPendenciasSQLite(arquivo).importar_de_json(pasta)
@@ -496,7 +496,8 @@ class InterfacePrincipalAbas:
         
         # NOVA IMPLEMENTAÇÃO: Sistema de seleção nativo do TreeView (mais confiável)
         colunas = ('Pendência', 'Data', 'Hora', 'Situação')
-        self.tree_pendencias = ttk.Treeview(tree_container, columns=colunas, show='headings', selectmode='browse')
+        # 'extended': Ctrl/Shift+clique seleciona várias (transferir/arquivar em lote)
+        self.tree_pendencias = ttk.Treeview(tree_container, columns=colunas, show='headings', selectmode='extended')
         
         # Variável para controlar ordenação
         self.ordenacao_coluna = None
@@ -565,6 +566,10 @@ class InterfacePrincipalAbas:
         # Evento de seleção (único sistema confiável)
         # UM CLIQUE já ativa a pendência definitivamente
         self.tree_pendencias.bind('<<TreeviewSelect>>', self._on_pendencia_clique_unico)
+        # Ctrl/Shift+clique monta uma seleção múltipla sem ativar (ativar recarrega a lista)
+        self._selecao_multipla = False
+        self.tree_pendencias.bind('<Control-Button-1>', self._on_clique_selecao_multipla, add='+')
+        self.tree_pendencias.bind('<Shift-Button-1>', self._on_clique_selecao_multipla, add='+')
         
         # Bind para tecla ESC - desselecionar pendência ativa
         self.tree_pendencias.bind('<KeyPress-Escape>', self._on_esc_deselecionar)
@@ -815,8 +820,8 @@ class InterfacePrincipalAbas:
             
             # Usar instância reutilizável ao invés de criar nova
             if not hasattr(self, 'ger_pendencias') or self.ger_pendencias is None:
-                from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-                self.ger_pendencias = GerenciadorPendenciasJSON()
+                from gerenciador_pendencias_json import obter_gerenciador_pendencias
+                self.ger_pendencias = obter_gerenciador_pendencias()
             
             ger_pend = self.ger_pendencias
             
@@ -868,7 +873,8 @@ class InterfacePrincipalAbas:
                     filtro_setor=filtro_setor if filtro_setor != 'Todos' else None,
                     apenas_ativas=(not mostrar_arquivadas),
                     data_inicio=self.semana_inicio,
-                    data_fim=self.semana_fim
+                    data_fim=self.semana_fim,
+                    resumo=True  # A lista só exibe campos-chave (sem histórico/observações)
                 )
                 
                 # Filtrar pendências baseado no nível do usuário (apenas se houver código válido)
@@ -1333,8 +1339,8 @@ class InterfacePrincipalAbas:
             # PRIORIDADE 1: Usar PENDÊNCIA ATIVA (seleção definitiva e persistente)
             if usar_ativa and self.pendencia_ativa:
                 # Buscar dados atualizados da pendência ativa
-                from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-                ger = GerenciadorPendenciasJSON()
+                from gerenciador_pendencias_json import obter_gerenciador_pendencias
+                ger = obter_gerenciador_pendencias()
                 pendencia = ger.ler_pendencia(self.pendencia_ativa)
                 
                 if pendencia:
@@ -1386,12 +1392,41 @@ class InterfacePrincipalAbas:
             traceback.print_exc()
             return None, None
     
+    def _obter_pendencias_selecionadas(self):
+        """
+        Retorna os números de todas as linhas selecionadas na lista
+        
+        Returns:
+            list: Números das pendências (vazia se não houver seleção)
+        """
+        numeros = []
+        try:
+            for item_id in self.tree_pendencias.selection():
+                valores = self.tree_pendencias.item(item_id, 'values')
+                if valores and str(valores[0]).strip():
+                    numeros.append(str(valores[0]))
+        except Exception as e:
+            print(f"✗ Erro ao obter seleção: {e}")
+        return numeros
+    
+    def _on_clique_selecao_multipla(self, event=None):
+        """Marca que o próximo evento de seleção é de seleção múltipla"""
+        self._selecao_multipla = True
+    
     def _on_pendencia_clique_unico(self, event=None):
         """Ativa uma pendência com UM CLIQUE (seleção definitiva)"""
         try:
             # Obter seleção atual do TreeView
             selecao = self.tree_pendencias.selection()
             
+            # Seleção múltipla (Ctrl/Shift): apenas informar, sem ativar
+            multipla = self._selecao_multipla or len(selecao) > 1
+            self._selecao_multipla = False
+            if multipla:
+                if len(selecao) > 1:
+                    self.atualizar_status(f"{len(selecao)} pendências selecionadas", 'info')
+                return
+            
             if selecao:
                 # Obter valores do item
                 item_id = selecao[0]
@@ -1414,8 +1449,8 @@ class InterfacePrincipalAbas:
             numero: Número da pendência a ativar
         """
         try:
-            from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-            ger = GerenciadorPendenciasJSON()
+            from gerenciador_pendencias_json import obter_gerenciador_pendencias
+            ger = obter_gerenciador_pendencias()
             
             # Carregar dados completos
             pendencia = ger.ler_pendencia(numero)
@@ -1543,9 +1578,9 @@ class InterfacePrincipalAbas:
     def _obter_dados_pendencia(self, numero_pendencia):
         """Obtém dados completos da pendência"""
         try:
-            from gerenciador_pendencias_json import GerenciadorPendenciasJSON
+            from gerenciador_pendencias_json import obter_gerenciador_pendencias
             
-            gerenciador = GerenciadorPendenciasJSON()
+            gerenciador = obter_gerenciador_pendencias()
             dados = gerenciador.ler_pendencia(numero_pendencia)
             
             return dados
@@ -1571,8 +1606,8 @@ class InterfacePrincipalAbas:
     def _editar_pendencia_centralizada(self, numero_pendencia):
         """Interface centralizada para editar pendência - combina todas as funcionalidades"""
         # Verificar permissão de edição
-        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-        ger = GerenciadorPendenciasJSON()
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
         pendencia = ger.ler_pendencia(numero_pendencia)
         if pendencia and not self._verificar_permissao_editar(pendencia):
             from tkinter import messagebox
@@ -1644,8 +1679,14 @@ class InterfacePrincipalAbas:
     
     def transferir_pendencia(self):
         """Transfere uma pendência para outro setor ou usuário"""
-        from datetime import datetime
         print("✓ Abrindo transferência de pendência...")
+        
+        # Várias linhas selecionadas: transferência em lote
+        selecionadas = self._obter_pendencias_selecionadas()
+        if len(selecionadas) > 1:
+            self._transferir_pendencias_em_lote(selecionadas)
+            return
+        
         numero_proposta, valores = self._obter_pendencia_selecionada()
         
         if not numero_proposta:
@@ -1653,8 +1694,8 @@ class InterfacePrincipalAbas:
             return
         
         # Verificar permissão de edição
-        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-        ger = GerenciadorPendenciasJSON()
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
         pendencia = ger.ler_pendencia(numero_proposta)
         if pendencia and not self._verificar_permissao_editar(pendencia):
             messagebox.showwarning("Acesso Negado", 
@@ -1819,31 +1860,24 @@ class InterfacePrincipalAbas:
                     'usuario': usuario_destino  # Campo canônico (antigo: vendedor)
                 }
                 
-                resultado = ger.atualizar_pendencia(
-                    numero=numero_proposta,
-                    atualizacoes=atualizacoes,
-                    usuario=usuario
-                )
+                obs_texto = f"TRANSFERIDO - Setor: {setor_atual} → {setor_destino}"
+                if usuario_destino != usuario_atual:
+                    obs_texto += f" | Usuário: {usuario_atual} → {usuario_destino}"
+                if motivo:
+                    obs_texto += f" - Motivo: {motivo}"
+                
+                def aplicar(alteracao):
+                    alteracao.atualizar(atualizacoes)
+                    alteracao.registrar_historico(obs_texto)
+                
+                # Campos e histórico numa única gravação (refeita se outro usuário gravou no meio)
+                try:
+                    ger.alterar_com_repeticao(numero_proposta, aplicar, usuario)
+                    resultado = {'sucesso': True}
+                except Exception as e:
+                    resultado = {'sucesso': False, 'mensagem': str(e)}
                 
                 if resultado.get('sucesso'):
-                    # Adicionar ao histórico
-                    pendencia_atualizada = ger.ler_pendencia(numero_proposta)
-                    if pendencia_atualizada:
-                        obs_texto = f"TRANSFERIDO - Setor: {setor_atual} → {setor_destino}"
-                        if usuario_destino != usuario_atual:
-                            obs_texto += f" | Usuário: {usuario_atual} → {usuario_destino}"
-                        if motivo:
-                            obs_texto += f" - Motivo: {motivo}"
-                        
-                        timestamp_iso = datetime.now().isoformat()
-                        pendencia_atualizada['historico'].append({
-                            "data": timestamp_iso,
-                            "status_anterior": "",
-                            "status_novo": obs_texto,
-                            "usuario": usuario
-                        })
-                        ger._salvar_pendencia(numero_proposta, pendencia_atualizada)
-                    
                     messagebox.showinfo("Sucesso", f"Pendência transferida para o setor {setor_destino}")
                     janela_transf.destroy()
                     self._invalidar_cache_pendencias()
@@ -1897,8 +1931,8 @@ class InterfacePrincipalAbas:
             return
         
         # Verificar permissão de edição
-        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-        ger = GerenciadorPendenciasJSON()
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
         pendencia = ger.ler_pendencia(numero_proposta)
         if pendencia and not self._verificar_permissao_editar(pendencia):
             messagebox.showwarning("Acesso Negado", 
@@ -1913,8 +1947,8 @@ class InterfacePrincipalAbas:
             from atualizador_situacao import AtualizadorSituacao
             
             # Obter dados completos da pendência
-            from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-            ger_pend = GerenciadorPendenciasJSON()
+            from gerenciador_pendencias_json import obter_gerenciador_pendencias
+            ger_pend = obter_gerenciador_pendencias()
             dados_pendencia = ger_pend.ler_pendencia(numero_proposta)
             
             if not dados_pendencia:
@@ -1942,6 +1976,13 @@ class InterfacePrincipalAbas:
     def arquivar_pendencia_dialog(self):
         """Abre janela para arquivar uma pendência"""
         print("✓ Abrindo arquivamento de pendência...")
+        
+        # Várias linhas selecionadas: arquivamento em lote
+        selecionadas = self._obter_pendencias_selecionadas()
+        if len(selecionadas) > 1:
+            self._arquivar_pendencias_em_lote(selecionadas)
+            return
+        
         numero_proposta, valores = self._obter_pendencia_selecionada()
         
         if not numero_proposta:
@@ -1951,8 +1992,8 @@ class InterfacePrincipalAbas:
         # Índices: 0:N°Proposta, 1:Data, 2:Hora, 3:Situação
         # Obter dados completos da pendência
         numero_proposta = valores[0]
-        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-        ger = GerenciadorPendenciasJSON()
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
         pendencia = ger.ler_pendencia(numero_proposta)
         if not pendencia:
             messagebox.showerror("Erro", "Pendência não encontrada")
@@ -2014,8 +2055,8 @@ class InterfacePrincipalAbas:
                 return
             
             # Executar arquivamento
-            from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-            ger_pend = GerenciadorPendenciasJSON()
+            from gerenciador_pendencias_json import obter_gerenciador_pendencias
+            ger_pend = obter_gerenciador_pendencias()
             
             usuario = self.usuario_detectado['nome'] if self.usuario_detectado else 'Sistema'
             if ger_pend.arquivar_pendencia(numero_proposta, motivo, usuario):
@@ -2038,6 +2079,141 @@ class InterfacePrincipalAbas:
         ttk.Button(btn_frame, text="📦 Arquivar", command=confirmar_arquivamento, width=15).pack(side='left', padx=8)
         ttk.Button(btn_frame, text="✗ Cancelar", command=janela_arq.destroy, width=15).pack(side='left', padx=8)
     
+    def _filtrar_permitidas(self, ger, numeros):
+        """
+        Separa as pendências que o usuário pode editar
+        
+        Returns:
+            tuple: (números permitidos, números negados)
+        """
+        permitidas = []
+        negadas = []
+        for numero in numeros:
+            pendencia = ger.ler_pendencia(numero)
+            if pendencia and self._verificar_permissao_editar(pendencia):
+                permitidas.append(numero)
+            else:
+                negadas.append(numero)
+        return permitidas, negadas
+    
+    def _mostrar_relatorio_lote(self, titulo, relatorio, negadas=()):
+        """Mostra o resultado de uma operação em lote (sucessos e falhas por item)"""
+        falhas = [r for r in relatorio if not r['sucesso']]
+        linhas = [f"{len(relatorio) - len(falhas)} de {len(relatorio)} pendência(s) processada(s)."]
+        if negadas:
+            linhas.append(f"{len(negadas)} ignorada(s) por falta de permissão: {', '.join(negadas[:10])}"
+                          + ("…" if len(negadas) > 10 else ""))
+        if falhas:
+            linhas.append("")
+            linhas.append("Falhas:")
+            linhas.extend(f"  {r['numero']}: {r['mensagem']}" for r in falhas[:10])
+            if len(falhas) > 10:
+                linhas.append(f"  … e mais {len(falhas) - 10}")
+        
+        if falhas:
+            messagebox.showwarning(titulo, "\n".join(linhas))
+        else:
+            messagebox.showinfo(titulo, "\n".join(linhas))
+    
+    def _concluir_operacao_lote(self, relatorio, acao):
+        """Recarrega a lista após uma operação em lote (status conta só os itens com sucesso)"""
+        sucessos = sum(1 for r in relatorio if r['sucesso'])
+        falhas = len(relatorio) - sucessos
+        self._invalidar_cache_pendencias()
+        self.monitor_mudancas.resetar_cache()
+        self.atualizar_pendencias(preservar_selecao=False)
+        mensagem = f"{sucessos} pendência(s) {acao}"
+        if falhas:
+            self.atualizar_status(f"{mensagem} ({falhas} falha(s))", 'aviso')
+        else:
+            self.atualizar_status(mensagem, 'sucesso')
+    
+    def _transferir_pendencias_em_lote(self, numeros):
+        """Abre janela para transferir várias pendências para um usuário"""
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
+        permitidas, negadas = self._filtrar_permitidas(ger, numeros)
+        if not permitidas:
+            messagebox.showwarning("Acesso Negado",
+                                 "Você não tem permissão para transferir as pendências selecionadas.")
+            return
+        
+        janela_lote = tk.Toplevel(self.root)
+        janela_lote.title("Transferir Pendências")
+        janela_lote.geometry("450x300")
+        janela_lote.resizable(False, False)
+        
+        # Centralizar
+        janela_lote.update_idletasks()
+        x = self.root.winfo_x() + (self.root.winfo_width() - 450) // 2
+        y = self.root.winfo_y() + (self.root.winfo_height() - 300) // 2
+        janela_lote.geometry(f"+{x}+{y}")
+        
+        frame = ttk.Frame(janela_lote, padding="20")
+        frame.pack(fill='both', expand=True)
+        
+        ttk.Label(frame, text=f"Transferir {len(permitidas)} pendência(s)",
+                 font=('Arial', 11, 'bold')).pack(pady=(0, 10))
+        if negadas:
+            ttk.Label(frame, text=f"⚠️ {len(negadas)} sem permissão serão ignoradas",
+                     font=('Arial', 9), foreground='orange').pack(pady=(0, 10))
+        
+        frame_usuario = ttk.Frame(frame)
+        frame_usuario.pack(fill='x', pady=(5, 0))
+        ttk.Label(frame_usuario, text="Novo Usuário:", font=('Arial', 10)).pack(side='left', padx=(0, 10))
+        combo_usuario = ttk.Combobox(frame_usuario, state='readonly', width=30)
+        try:
+            from mapeamento_usuarios import obter_lista_usuarios
+            combo_usuario['values'] = obter_lista_usuarios()
+        except Exception as e:
+            print(f"Erro ao carregar usuários: {e}")
+            combo_usuario['values'] = []
+        combo_usuario.pack(side='left')
+        
+        ttk.Label(frame, text="Motivo (opcional):", font=('Arial', 10)).pack(pady=(15, 5))
+        entry_motivo = ttk.Entry(frame, width=45)
+        entry_motivo.pack(pady=(0, 10))
+        
+        def confirmar_transferencia_lote():
+            usuario_destino = combo_usuario.get()
+            if not usuario_destino:
+                messagebox.showwarning("Aviso", "Selecione o usuário de destino.")
+                return
+            
+            usuario = self.usuario_detectado['nome'] if self.usuario_detectado else 'Sistema'
+            relatorio = ger.transferir_pendencias(permitidas, usuario_destino, entry_motivo.get().strip(), usuario)
+            janela_lote.destroy()
+            self._mostrar_relatorio_lote("Transferência em lote", relatorio, negadas)
+            self._concluir_operacao_lote(relatorio, f"transferida(s) para {usuario_destino}")
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="✓ Transferir", command=confirmar_transferencia_lote, width=15).pack(side='left', padx=8)
+        ttk.Button(btn_frame, text="✗ Cancelar", command=janela_lote.destroy, width=15).pack(side='left', padx=8)
+    
+    def _arquivar_pendencias_em_lote(self, numeros):
+        """Confirma e arquiva várias pendências de uma vez"""
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
+        permitidas, negadas = self._filtrar_permitidas(ger, numeros)
+        if not permitidas:
+            messagebox.showwarning("Acesso Negado",
+                                 "Você não tem permissão para arquivar as pendências selecionadas.")
+            return
+        
+        confirma = messagebox.askyesno(
+            "Confirmar Arquivamento",
+            f"Tem certeza que deseja arquivar {len(permitidas)} pendência(s)?"
+            + (f"\n\n{len(negadas)} sem permissão serão ignoradas." if negadas else "")
+        )
+        if not confirma:
+            return
+        
+        usuario = self.usuario_detectado['nome'] if self.usuario_detectado else 'Sistema'
+        relatorio = ger.arquivar_pendencias(permitidas, '', usuario)
+        self._mostrar_relatorio_lote("Arquivamento em lote", relatorio, negadas)
+        self._concluir_operacao_lote(relatorio, "arquivada(s)")
+    
     def deletar_pendencia_dialog(self):
         """Abre janela para deletar uma pendência (apenas nível 4)"""
         print("✓ Abrindo deleção de pendência...")
@@ -2056,8 +2232,8 @@ class InterfacePrincipalAbas:
         # Índices: 0:N°Proposta, 1:Data, 2:Hora, 3:Situação
         # Obter dados completos da pendência
         numero_proposta = valores[0]
-        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-        ger = GerenciadorPendenciasJSON()
+        from gerenciador_pendencias_json import obter_gerenciador_pendencias
+        ger = obter_gerenciador_pendencias()
         pendencia = ger.ler_pendencia(numero_proposta)
         if not pendencia:
             messagebox.showerror("Erro", "Pendência não encontrada")
@@ -2134,8 +2310,8 @@ class InterfacePrincipalAbas:
                 return
             
             # Executar deleção (remoção permanente do arquivo)
-            from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-            ger_pend = GerenciadorPendenciasJSON()
+            from gerenciador_pendencias_json import obter_gerenciador_pendencias
+            ger_pend = obter_gerenciador_pendencias()
             
             if ger_pend.deletar_pendencia(numero_proposta, motivo):
                 messagebox.showinfo(
@@ -2739,8 +2915,8 @@ class InterfacePrincipalAbas:
         """Recarrega os dados da pendência ativa após edição"""
         try:
             if self.pendencia_ativa:
-                from gerenciador_pendencias_json import GerenciadorPendenciasJSON
-                ger = GerenciadorPendenciasJSON()
+                from gerenciador_pendencias_json import obter_gerenciador_pendencias
+                ger = obter_gerenciador_pendencias()
                 self.pendencia_ativa_dados = ger.ler_pendencia(self.pendencia_ativa)
                 print(f"✓ Pendência ativa {self.pendencia_ativa} recarregada")
         except Exception as e:
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Consultas no Tempo (Situação/Status/Usuário de Cada Pendência)
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Perguntas como "como estava o funil no último dia de cada mês?" precisam
+do valor de situacao/status/usuario (e da pasta) de cada pendência num
+instante do passado. Em vez de repassar o histórico inteiro de cada
+arquivo a cada pergunta, o histórico é convertido uma vez em intervalos:
+
+    {'numero': ..., 'criacao': '2026-01-15T09:12:00', 'campos': {
+        'situacao': {'inicios': [t0, t1, ...], 'valores': [v0, v1, ...]}, ...}}
+
+O valor em t é valores[i] com i = último início <= t (busca binária). A
+conversão parte do documento atual e volta pelo histórico, desfazendo cada
+mudança reconhecida:
+
+- Situação: entrada com status_anterior preenchido (ou "Situação: A → B")
+- Status: "Status: A → B (usuário)" (status_anterior = A)
+- Usuário: "TRANSFERIDO de A para B ..."
+- Pasta: "... Movida de A para B ..."
+
+Entradas que não mudam nenhum desses campos (observações, propostas...)
+são ignoradas. IndiceIntervalos guarda os intervalos em
+_INDICES/intervalos.json, validados por (tamanho, mtime_ns) de cada arquivo:
+só as pendências alteradas desde a última consulta são reconvertidas.
+"""
+
+import re
+from bisect import bisect_right
+from datetime import date, datetime, time
+
+try:
+    from catalogo_pendencias import IndicePersistente
+except ImportError:
+    from .catalogo_pendencias import IndicePersistente
+
+
+# Campos reconstruídos no tempo
+CAMPOS_TEMPORAIS = ('situacao', 'status', 'usuario', 'pasta')
+
+_TRANSFERENCIA = re.compile(r'^TRANSFERIDO de (.*?) para ')
+_MOVIMENTACAO = re.compile(r'Movida de (.+?) para ')
+
+
+def instante_iso(instante):
+    """
+    Normaliza o instante da consulta para ISO (comparável com as datas do histórico)
+
+    Uma data sem hora (date ou 'AAAA-MM-DD') vale até o fim do dia.
+
+    Args:
+        instante: datetime, date ou texto ISO
+
+    Returns:
+        str: Instante ISO
+    """
+    if isinstance(instante, datetime):
+        return instante.isoformat()
+    if isinstance(instante, date):
+        return datetime.combine(instante, time.max).isoformat()
+    texto = str(instante).strip()
+    if len(texto) == 10:
+        return datetime.combine(date.fromisoformat(texto), time.max).isoformat()
+    return texto
+
+
+def _mudanca(entrada):
+    """
+    Campo alterado por uma entrada do histórico e o valor que ele tinha antes
+
+    Returns:
+        tuple: (campo, valor anterior) ou None se a entrada não muda nenhum CAMPOS_TEMPORAIS
+    """
+    texto = str(entrada.get('status_novo') or '').strip()
+    anterior = entrada.get('status_anterior') or ''
+    if texto.startswith('Status:'):
+        return 'status', anterior
+    transferencia = _TRANSFERENCIA.match(texto)
+    if transferencia:
+        return 'usuario', transferencia.group(1).strip()
+    movimentacao = _MOVIMENTACAO.search(texto)
+    if movimentacao:
+        return 'pasta', movimentacao.group(1).strip()
+    if texto.startswith('Situação:') and '→' in texto:
+        return 'situacao', texto.replace('Situação:', '', 1).split('→')[0].strip()
+    if anterior:
+        return 'situacao', anterior
+    return None
+
+
+def intervalos_da_pendencia(pendencia, pasta):
+    """
+    Converte o histórico completo de uma pendência em intervalos por campo
+
+    Args:
+        pendencia: Documento com o histórico completo
+        pasta: Pasta de status atual
+
+    Returns:
+        dict: {'numero', 'criacao', 'campos': {campo: {'inicios': [...], 'valores': [...]}}}
+    """
+    entradas = sorted(
+        (h for h in pendencia.get('historico') or [] if isinstance(h, dict) and h.get('data')),
+        key=lambda h: str(h['data'])
+    )
+    criacao = str(pendencia.get('data_criacao') or (entradas[0]['data'] if entradas else ''))
+    atual = {
+        'situacao': pendencia.get('situacao', ''),
+        'status': pendencia.get('status', ''),
+        # Suportar tanto 'usuario' (canônico) quanto 'vendedor' (compatibilidade)
+        'usuario': pendencia.get('usuario') or pendencia.get('vendedor', ''),
+        'pasta': pasta,
+    }
+
+    # Do presente para o passado: cada mudança reconhecida é desfeita
+    mudancas = {campo: [] for campo in CAMPOS_TEMPORAIS}
+    for entrada in reversed(entradas):
+        mudanca = _mudanca(entrada)
+        if mudanca is None:
+            continue
+        campo, anterior = mudanca
+        if anterior == atual[campo]:
+            continue
+        mudancas[campo].append((max(str(entrada['data']), criacao), atual[campo]))
+        atual[campo] = anterior
+
+    campos = {}
+    for campo in CAMPOS_TEMPORAIS:
+        sequencia = [(criacao, atual[campo])] + mudancas[campo][::-1]
+        campos[campo] = {'inicios': [inicio for inicio, _ in sequencia],
+                         'valores': [valor for _, valor in sequencia]}
+    return {'numero': str(pendencia.get('numero', '')), 'criacao': criacao, 'campos': campos}
+
+
+def estado_nos_intervalos(intervalos, momento, campos=CAMPOS_TEMPORAIS):
+    """
+    Valores dos CAMPOS_TEMPORAIS num instante
+
+    Args:
+        intervalos: Retorno de intervalos_da_pendencia
+        momento: Instante ISO (ver instante_iso)
+        campos: Campos a resolver (padrão: todos)
+
+    Returns:
+        dict: {'numero', 'situacao', 'status', 'usuario', 'pasta'} ou None se ainda não existia
+    """
+    if not intervalos['criacao'] or intervalos['criacao'] > momento:
+        return None
+    estado = {'numero': intervalos['numero']}
+    for campo in campos:
+        serie = intervalos['campos'][campo]
+        estado[campo] = serie['valores'][max(0, bisect_right(serie['inicios'], momento) - 1)]
+    return estado
+
+
+class IndiceIntervalos(IndicePersistente):
+    """Intervalos de situação/status/usuário/pasta de cada pendência (consultas no tempo)"""
+
+    NOME_ARQUIVO = "intervalos.json"
+    DESCRICAO = "índice de intervalos"
+    INTERVALO_PERSISTENCIA = 30.0
+
+    def __init__(self, pasta_indices):
+        """
+        Inicializa o índice
+
+        Args:
+            pasta_indices: Path da pasta _INDICES
+        """
+        super().__init__(pasta_indices)
+        # numero -> {'pasta', 'tamanho', 'mtime_ns', 'intervalos': {...}}
+        self.entradas = {}
+        self._carregar()
+
+    @classmethod
+    def obter(cls, pasta_indices):
+        """Retorna a instância compartilhada do índice para a pasta"""
+        return cls._obter_compartilhado(pasta_indices, lambda: cls(pasta_indices))
+
+    def atual(self, numero, pasta, tamanho, mtime_ns):
+        """True se os intervalos do número foram gerados desta versão do arquivo"""
+        entrada = self.entradas.get(str(numero))
+        return bool(entrada) and (entrada['pasta'], entrada['tamanho'], entrada['mtime_ns']) == (
+            pasta, tamanho, mtime_ns)
+
+    def atualizar(self, numero, pasta, tamanho, mtime_ns, pendencia):
+        """
+        Reconverte o histórico de uma pendência
+
+        Args:
+            numero: Número da pendência
+            pasta: Pasta de status do arquivo
+            tamanho: Tamanho do arquivo lido
+            mtime_ns: mtime do arquivo lido
+            pendencia: Documento com o histórico completo
+        """
+        intervalos = intervalos_da_pendencia(pendencia, pasta)
+        with self._lock:
+            self.entradas[str(numero)] = {
+                'pasta': pasta,
+                'tamanho': tamanho,
+                'mtime_ns': mtime_ns,
+                'intervalos': intervalos,
+            }
+        self._marcar_alterado()
+
+    def manter(self, numeros):
+        """Descarta as pendências que não existem mais (apagadas)"""
+        numeros = set(numeros)
+        with self._lock:
+            sobras = [numero for numero in self.entradas if numero not in numeros]
+            for numero in sobras:
+                del self.entradas[numero]
+        if sobras:
+            self._marcar_alterado()
+
+    def todos(self):
+        """Lista com os intervalos de todas as pendências indexadas"""
+        with self._lock:
+            return [entrada['intervalos'] for entrada in self.entradas.values()]
+
+    def _dados_persistidos(self):
+        return {'entradas': dict(self.entradas)}
+
+    def _aplicar_persistidos(self, dados):
+        self.entradas = dados.get('entradas', {})
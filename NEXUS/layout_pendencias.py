@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Layout das Pastas de Pendências
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Define onde fica o arquivo de cada pendência dentro das pastas de status:
+
+- 'plano'  : ATIVAS/2601150001.json (formato original)
+- 'mensal' : ATIVAS/2601/2601150001.json (uma subpasta AAMM por mês)
+
+No layout mensal uma consulta por período só lista as subpastas dos meses
+envolvidos. Arquivos ainda soltos na raiz da pasta de status (migração
+incompleta ou clientes antigos) continuam sendo encontrados.
+
+Migração:
+    python layout_pendencias.py mensal [pasta_pendencias]
+    python layout_pendencias.py plano  [pasta_pendencias]
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+class LayoutPlano:
+    """Todos os arquivos diretamente na pasta de status"""
+
+    NOME = 'plano'
+
+    def __init__(self, pasta_registros):
+        """
+        Inicializa o layout
+
+        Args:
+            pasta_registros: Path da pasta PENDENCIAS
+        """
+        self.pasta_registros = Path(pasta_registros)
+
+    def caminho(self, pasta, numero):
+        """
+        Caminho do arquivo de uma pendência
+
+        Args:
+            pasta: Pasta de status
+            numero: Número da pendência
+
+        Returns:
+            Path: Caminho do arquivo JSON
+        """
+        return self.pasta_registros / pasta / f"{numero}.json"
+
+    def caminhos_possiveis(self, pasta, numero):
+        """Caminhos onde a pendência pode estar dentro da pasta (mais provável primeiro)"""
+        return [self.caminho(pasta, numero)]
+
+    def preparar(self, caminho):
+        """Garante que a pasta do arquivo existe antes de gravar"""
+        pass
+
+    def diretorios(self, pasta, data_inicio=None, data_fim=None):
+        """
+        Diretórios a listar para obter os arquivos da pasta no período
+
+        Args:
+            pasta: Pasta de status
+            data_inicio: datetime.date inicial (None = sem limite)
+            data_fim: datetime.date final (None = sem limite)
+
+        Returns:
+            list: Paths de diretórios
+        """
+        return [self.pasta_registros / pasta]
+
+
+class LayoutMensal(LayoutPlano):
+    """Arquivos particionados em subpastas AAMM dentro da pasta de status"""
+
+    NOME = 'mensal'
+
+    def __init__(self, pasta_registros):
+        super().__init__(pasta_registros)
+        # Subpastas já criadas/verificadas nesta execução
+        self._particoes_prontas = set()
+
+    @staticmethod
+    def particao(numero):
+        """Nome da subpasta (AAMM) de um número, ou None se fora do padrão"""
+        numero = str(numero)
+        if len(numero) >= 6 and numero[:4].isdigit():
+            return numero[:4]
+        return None
+
+    def caminho(self, pasta, numero):
+        particao = self.particao(numero)
+        if particao is None:
+            return super().caminho(pasta, numero)
+        return self.pasta_registros / pasta / particao / f"{numero}.json"
+
+    def caminhos_possiveis(self, pasta, numero):
+        caminhos = [self.caminho(pasta, numero)]
+        raiz = super().caminho(pasta, numero)
+        if raiz != caminhos[0]:
+            caminhos.append(raiz)
+        return caminhos
+
+    def preparar(self, caminho):
+        diretorio = Path(caminho).parent
+        chave = str(diretorio)
+        if chave not in self._particoes_prontas:
+            diretorio.mkdir(parents=True, exist_ok=True)
+            self._particoes_prontas.add(chave)
+
+    def diretorios(self, pasta, data_inicio=None, data_fim=None):
+        raiz = self.pasta_registros / pasta
+        particao_min = data_inicio.strftime("%y%m") if data_inicio else None
+        particao_max = data_fim.strftime("%y%m") if data_fim else None
+
+        diretorios = [raiz]
+        try:
+            with os.scandir(raiz) as it:
+                particoes = sorted(
+                    item.name for item in it
+                    if item.is_dir() and len(item.name) == 4 and item.name.isdigit()
+                )
+        except OSError:
+            return diretorios
+
+        for particao in particoes:
+            if particao_min and particao < particao_min:
+                continue
+            if particao_max and particao > particao_max:
+                continue
+            diretorios.append(raiz / particao)
+        return diretorios
+
+
+LAYOUTS = {
+    LayoutPlano.NOME: LayoutPlano,
+    LayoutMensal.NOME: LayoutMensal,
+}
+
+
+def obter_layout(nome, pasta_registros):
+    """
+    Cria o layout pelo nome
+
+    Args:
+        nome: 'plano' ou 'mensal' (desconhecido = 'plano')
+        pasta_registros: Path da pasta PENDENCIAS
+
+    Returns:
+        LayoutPlano: Instância do layout
+    """
+    classe = LAYOUTS.get((nome or LayoutPlano.NOME).lower())
+    if classe is None:
+        print(f"⚠️ Layout de pendências desconhecido '{nome}', usando '{LayoutPlano.NOME}'")
+        classe = LayoutPlano
+    return classe(pasta_registros)
+
+
+def migrar_layout(pasta_registros, pastas_status, destino):
+    """
+    Move os arquivos existentes para o layout de destino (os.replace)
+
+    Pode ser executada mais de uma vez: arquivos já no lugar certo são
+    ignorados. Não altera o conteúdo dos JSON (tamanho e mtime preservados,
+    então os índices continuam válidos).
+
+    Args:
+        pasta_registros: Path da pasta PENDENCIAS
+        pastas_status: Pastas de status a migrar
+        destino: Nome do layout de destino ('plano' ou 'mensal')
+
+    Returns:
+        dict: {'movidos': int, 'ignorados': int, 'erros': int}
+    """
+    pasta_registros = Path(pasta_registros)
+    layout = obter_layout(destino, pasta_registros)
+    resultado = {'movidos': 0, 'ignorados': 0, 'erros': 0}
+
+    for pasta in pastas_status:
+        raiz = pasta_registros / pasta
+        if not raiz.exists():
+            continue
+
+        # Arquivos soltos na raiz e dentro de subpastas AAMM
+        arquivos = list(raiz.glob("*.json")) + list(raiz.glob("[0-9][0-9][0-9][0-9]/*.json"))
+        for arquivo in arquivos:
+            alvo = layout.caminho(pasta, arquivo.stem)
+            if alvo == arquivo:
+                resultado['ignorados'] += 1
+                continue
+            try:
+                layout.preparar(alvo)
+                alvo.parent.mkdir(parents=True, exist_ok=True)
+                if alvo.exists():
+                    print(f"⚠️ {arquivo.name} já existe em {alvo.parent}, mantendo os dois")
+                    resultado['erros'] += 1
+                    continue
+                os.replace(arquivo, alvo)
+                resultado['movidos'] += 1
+            except OSError as e:
+                print(f"❌ Erro ao migrar {arquivo}: {e}")
+                resultado['erros'] += 1
+
+        # Remover subpastas AAMM que ficaram vazias (migração para 'plano')
+        for subpasta in raiz.glob("[0-9][0-9][0-9][0-9]"):
+            try:
+                subpasta.rmdir()
+            except OSError:
+                pass
+
+    print(f"✓ Migração para layout '{layout.NOME}': {resultado['movidos']} movidos, "
+          f"{resultado['ignorados']} já no lugar, {resultado['erros']} erros")
+    return resultado
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in LAYOUTS:
+        print(f"Uso: python {Path(__file__).name} {{{'|'.join(LAYOUTS)}}} [pasta_pendencias]")
+        sys.exit(1)
+
+    if len(sys.argv) > 2:
+        pasta = Path(sys.argv[2])
+    else:
+        from config_rede import ConfiguracaoRede
+        pasta = ConfiguracaoRede.PASTA_REGISTROS_JSON
+
+    from gerenciador_pendencias_json import GerenciadorPendenciasJSON
+    migrar_layout(pasta, GerenciadorPendenciasJSON.PASTAS_STATUS, sys.argv[1])
+    print(f"Lembre de ajustar ConfiguracaoRede.LAYOUT_PENDENCIAS = '{sys.argv[1]}'")
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Mesclagem de Edições Simultâneas
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Quando dois usuários gravam a mesma pendência a partir da mesma versão,
+a segunda gravação não precisa ser recusada: com a versão base (a que o
+editor carregou), a nossa e a que está gravada agora (a deles), os
+campos são mesclados um a um (mesclagem de três vias):
+
+- Campo que só um lado alterou: fica a alteração
+- Campo que os dois alteraram para o mesmo valor: fica o valor
+- Campo que os dois alteraram para valores diferentes: conflito
+- Listas que só crescem (histórico, propostas, anexos): os itens novos
+  dos dois lados são somados, nunca há conflito
+- Campos de controle (data_atualizacao, ultima_modificacao,
+  modificado_por): ficam os da gravação mais recente (a nossa)
+
+Objetos (cliente, metadata) são mesclados campo a campo, com o caminho
+completo no conflito (ex.: 'cliente.telefone').
+
+Conferência dos casos de mesclagem (inclusive documentos antigos sem as listas):
+
+    python mesclagem_pendencias.py conferir
+"""
+
+import copy
+import sys
+
+# Ausência de um campo em uma das versões
+_AUSENTE = object()
+
+# Sempre os da versão sendo gravada: não geram conflito
+CAMPOS_CONTROLE = ('data_atualizacao', 'metadata.ultima_modificacao', 'metadata.modificado_por')
+
+# Ficam sempre os da versão gravada (o compare-and-swap seguinte confere contra ela)
+CAMPOS_VERSAO = ('metadata.versao_seq',)
+
+# Listas em que os usuários só acrescentam itens
+LISTAS_ACUMULADAS = ('historico', 'propostas_vinculadas', 'anexos')
+
+
+def mesclar_pendencias(base, nossa, deles):
+    """
+    Mescla duas edições feitas a partir da mesma versão de uma pendência
+
+    Args:
+        base: Documento que os dois lados leram
+        nossa: Documento com as nossas alterações (ainda não gravado)
+        deles: Documento gravado agora (com as alterações do outro usuário)
+
+    Returns:
+        tuple: (documento mesclado, lista de campos em conflito)
+               O documento é uma cópia nova, com a versao_seq de `deles`.
+    """
+    mesclada = copy.deepcopy(deles)
+    conflitos = []
+    _mesclar_objeto(base, nossa, deles, mesclada, '', conflitos)
+    return mesclada, conflitos
+
+
+def _mesclar_objeto(base, nossa, deles, destino, prefixo, conflitos):
+    """Aplica em `destino` (cópia de deles) os campos que alteramos em relação à base"""
+    for campo in dict.fromkeys([*base, *nossa]):
+        caminho = prefixo + campo
+        valor_base = base.get(campo, _AUSENTE)
+        valor_nosso = nossa.get(campo, _AUSENTE)
+        valor_deles = deles.get(campo, _AUSENTE)
+
+        # Não alteramos: fica o que está gravado
+        if valor_nosso == valor_base or caminho in CAMPOS_VERSAO:
+            continue
+
+        if caminho in CAMPOS_CONTROLE:
+            _atribuir(destino, campo, valor_nosso)
+        elif caminho in LISTAS_ACUMULADAS and _acrescentou(valor_base, valor_nosso):
+            # Documento antigo sem a lista: _AUSENTE (que é verdadeiro) ou None valem []
+            lista_base = _como_lista(valor_base)
+            anteriores = valor_deles if isinstance(valor_deles, list) else lista_base
+            destino[campo] = copy.deepcopy(anteriores) + copy.deepcopy(valor_nosso[len(lista_base):])
+        elif all(isinstance(valor, dict) for valor in (valor_base, valor_nosso, valor_deles)):
+            _mesclar_objeto(valor_base, valor_nosso, valor_deles, destino[campo], caminho + '.', conflitos)
+        elif valor_deles == valor_base or valor_deles == valor_nosso:
+            _atribuir(destino, campo, valor_nosso)
+        else:
+            conflitos.append(caminho)
+
+
+def _como_lista(valor):
+    """Lista acumulada de uma versão ([] se o campo não existir ou for nulo)"""
+    return [] if valor is _AUSENTE or valor is None else valor
+
+
+def _acrescentou(anterior, atual):
+    """True se `atual` é a lista `anterior` com itens acrescentados no final"""
+    anterior = _como_lista(anterior)
+    return (isinstance(anterior, list) and isinstance(atual, list)
+            and len(atual) >= len(anterior) and atual[:len(anterior)] == anterior)
+
+
+def _atribuir(destino, campo, valor):
+    """Grava o valor (ou remove o campo, se ausente)"""
+    if valor is _AUSENTE:
+        destino.pop(campo, None)
+    else:
+        destino[campo] = copy.deepcopy(valor)
+
+
+def conferir():
+    """
+    Confere a mesclagem em casos conhecidos
+
+    Returns:
+        list: Descrição dos casos que falharam (vazia = tudo certo)
+    """
+    vinculo = {'numero': 'P-1', 'data': '2026-01-01T10:00:00'}
+    casos = [
+        # (descrição, base, nossa, deles, campos esperados no resultado, conflitos esperados)
+        ("campos diferentes dos dois lados",
+         {'situacao': 'A', 'observacoes': ''}, {'situacao': 'B', 'observacoes': ''},
+         {'situacao': 'A', 'observacoes': 'x'}, {'situacao': 'B', 'observacoes': 'x'}, []),
+        ("mesmo campo com valores diferentes",
+         {'situacao': 'A'}, {'situacao': 'B'}, {'situacao': 'C'}, {'situacao': 'C'}, ['situacao']),
+        ("histórico acrescentado dos dois lados",
+         {'historico': [1]}, {'historico': [1, 2]}, {'historico': [1, 3]}, {'historico': [1, 3, 2]}, []),
+        ("base antiga sem propostas_vinculadas",
+         {'situacao': 'A'}, {'situacao': 'A', 'propostas_vinculadas': [vinculo]},
+         {'situacao': 'B'}, {'situacao': 'B', 'propostas_vinculadas': [vinculo]}, []),
+        ("base antiga sem anexos, os dois lados acrescentam",
+         {'situacao': 'A'}, {'situacao': 'A', 'anexos': ['a.pdf']},
+         {'situacao': 'A', 'anexos': ['b.pdf']}, {'anexos': ['b.pdf', 'a.pdf']}, []),
+        ("lista nula na base",
+         {'anexos': None}, {'anexos': ['a.pdf']}, {'anexos': None, 'situacao': 'B'},
+         {'anexos': ['a.pdf'], 'situacao': 'B'}, []),
+        ("objeto mesclado campo a campo",
+         {'cliente': {'telefone': '1', 'email': ''}}, {'cliente': {'telefone': '2', 'email': ''}},
+         {'cliente': {'telefone': '1', 'email': 'e'}}, {'cliente': {'telefone': '2', 'email': 'e'}}, []),
+    ]
+    falhas = []
+    for descricao, base, nossa, deles, esperado, conflitos_esperados in casos:
+        try:
+            mesclada, conflitos = mesclar_pendencias(base, nossa, deles)
+        except Exception as e:
+            falhas.append(f"{descricao}: {type(e).__name__}: {e}")
+            continue
+        if conflitos != conflitos_esperados:
+            falhas.append(f"{descricao}: conflitos {conflitos} (esperado {conflitos_esperados})")
+        for campo, valor in esperado.items():
+            if mesclada.get(campo) != valor:
+                falhas.append(f"{descricao}: {campo} = {mesclada.get(campo)!r} (esperado {valor!r})")
+    return falhas
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'conferir':
+        print("Uso: python mesclagem_pendencias.py conferir")
+        sys.exit(1)
+
+    falhas = conferir()
+    for falha in falhas:
+        print(f"❌ {falha}")
+    if falhas:
+        sys.exit(1)
+    print("✓ Mesclagem conferida em todos os casos")
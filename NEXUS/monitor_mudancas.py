@@ -5,6 +5,10 @@ Sistema de Propostas Comerciais - Olivo Guindastes
 
 Monitora mudanças nos arquivos JSON de pendências e notifica a interface
 para atualização automática sem necessidade de clicar em botão.
+
+Com o diário de eventos (_EVENTOS) cada verificação lê só os eventos novos;
+a varredura das pastas fica para a primeira verificação e, de tempos em
+tempos, para pegar gravações feitas sem o diário (versões antigas do sistema).
 """
 
 import os
@@ -13,10 +17,21 @@ from pathlib import Path
 from datetime import datetime
 import hashlib
 
+try:
+    from diario_eventos import DiarioEventos
+except ImportError:
+    from .diario_eventos import DiarioEventos
+
 
 class MonitorMudancas:
     """Monitora mudanças em arquivos/pastas para sincronização multi-usuário"""
     
+    # Verificações pelo diário de eventos entre duas varreduras das pastas
+    VERIFICACOES_POR_VARREDURA = 12
+    
+    # Pasta de status → chave em verificar_mudancas()
+    CHAVES_PASTAS = {'ATIVAS': 'ativas', 'ARQUIVADAS': 'arquivadas'}
+    
     def __init__(self, pasta_registros, monitorar_arquivadas=True):
         """
         Inicializa o monitor (OTIMIZADO)
@@ -33,6 +48,33 @@ class MonitorMudancas:
         # Cache de contagem de arquivos (mais rápido que hash completo)
         self._cache_contagem = {}
         self._cache_ultima_modificacao = {}
+        
+        # Diário de eventos (None = sempre varrer as pastas)
+        self.diario = None
+        self._cursor_eventos = None
+        self._verificacoes_pelo_diario = 0
+        try:
+            from config_rede import ConfiguracaoRede
+            usar_diario = getattr(ConfiguracaoRede, 'DIARIO_EVENTOS_PENDENCIAS', True)
+        except Exception:
+            usar_diario = True
+        if usar_diario:
+            self.diario = DiarioEventos.obter(self.pasta_registros / "_EVENTOS")
+    
+    @staticmethod
+    def _listar_json(pasta):
+        """
+        Lista os JSON da pasta, incluindo subpastas AAMM do layout mensal
+        (subpastas mais recentes primeiro)
+        
+        Returns:
+            list: Paths dos arquivos
+        """
+        arquivos = []
+        for particao in sorted(pasta.glob("[0-9][0-9][0-9][0-9]"), reverse=True):
+            arquivos.extend(particao.glob("*.json"))
+        arquivos.extend(pasta.glob("*.json"))
+        return arquivos
     
     def _calcular_hash_pasta(self, pasta):
         """
@@ -47,7 +89,7 @@ class MonitorMudancas:
         
         try:
             # OTIMIZAÇÃO: Usar contagem + timestamp mais recente (muito mais rápido)
-            arquivos = list(pasta.glob("*.json"))
+            arquivos = self._listar_json(pasta)
             contagem = len(arquivos)
             
             if contagem == 0:
@@ -79,13 +121,15 @@ class MonitorMudancas:
                 'ativas': bool,
                 'arquivadas': bool,
                 'fechadas': bool,
-                'qualquer_mudanca': bool
+                'qualquer_mudanca': bool,
+                'numeros': list (pendências alteradas, quando detectado pelo diário)
             }
         """
         mudancas = {
             'ativas': False,
             'arquivadas': False,
-            'qualquer_mudanca': False
+            'qualquer_mudanca': False,
+            'numeros': []
         }
         
         # Sempre monitora ATIVAS. ARQUIVADAS só quando habilitado para
@@ -96,6 +140,10 @@ class MonitorMudancas:
         if self.monitorar_arquivadas:
             pastas['arquivadas'] = self.pasta_registros / "ARQUIVADAS"
         
+        if self._verificar_pelo_diario(pastas, mudancas):
+            self.ultima_verificacao = datetime.now()
+            return mudancas
+        
         for nome, pasta in pastas.items():
             hash_atual = self._calcular_hash_pasta(pasta)
             hash_anterior = self.cache_estados.get(nome)
@@ -112,9 +160,54 @@ class MonitorMudancas:
         self.ultima_verificacao = datetime.now()
         return mudancas
     
+    def _verificar_pelo_diario(self, pastas, mudancas):
+        """
+        Preenche `mudancas` com os eventos novos do diário
+        
+        Returns:
+            bool: False quando é preciso varrer as pastas (primeira verificação,
+                  varredura periódica, diário desligado ou lacuna no diário)
+        """
+        if self.diario is None:
+            return False
+        
+        if self._cursor_eventos is not None and self._verificacoes_pelo_diario < self.VERIFICACOES_POR_VARREDURA:
+            try:
+                eventos, cursor, completo = self.diario.ler_novos(self._cursor_eventos)
+            except Exception as e:
+                print(f"⚠️ Erro ao ler diário de eventos: {e}")
+                completo = False
+            if completo:
+                self._cursor_eventos = cursor
+                self._verificacoes_pelo_diario += 1
+                for evento in eventos:
+                    # Remoção não tem pasta: atualiza tudo que é monitorado
+                    nomes = [self.CHAVES_PASTAS.get(evento.get(campo)) for campo in ('pasta', 'pasta_origem')]
+                    if evento.get('tipo') == 'remocao':
+                        nomes = list(pastas)
+                    alterou = False
+                    for nome in nomes:
+                        if nome in pastas:
+                            mudancas[nome] = alterou = True
+                    if alterou:
+                        mudancas['qualquer_mudanca'] = True
+                        if evento.get('numero') not in mudancas['numeros']:
+                            mudancas['numeros'].append(evento.get('numero'))
+                return True
+        
+        # Varredura: o que for gravado durante ela aparece no diário na próxima verificação
+        try:
+            self._cursor_eventos = self.diario.cursor_atual()
+        except Exception as e:
+            print(f"⚠️ Erro ao posicionar no diário de eventos: {e}")
+            self._cursor_eventos = None
+        self._verificacoes_pelo_diario = 0
+        return False
+    
     def resetar_cache(self):
         """Reseta o cache (força nova leitura na próxima verificação)"""
         self.cache_estados.clear()
+        self._cursor_eventos = None
     
     def definir_monitorar_arquivadas(self, valor: bool):
         """Ativa/desativa monitoramento da pasta ARQUIVADAS.
@@ -141,7 +234,7 @@ class MonitorMudancas:
         
         for nome, pasta in pastas.items():
             if pasta.exists():
-                arquivos = list(pasta.glob("*.json"))
+                arquivos = self._listar_json(pasta)
                 stats[nome] = len(arquivos)
             else:
                 stats[nome] = 0
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Numeração Sequencial de Pendências
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Aloca números AAMMDDSSSS a partir de um contador diário persistido em
+_INDICES/sequencial.json. O contador é lido e gravado sob trava exclusiva,
+então dois computadores nunca recebem o mesmo número, e a criação não
+depende mais da quantidade de arquivos nas pastas.
+
+Cada cliente reserva um bloco de sufixos por vez (ex.: 10) e distribui os
+números localmente, sem acessar a rede, até o bloco acabar. Números não
+usados são devolvidos ao encerrar (se ninguém reservou depois) ou pulados.
+
+Teste de concorrência (N processos alocando e devolvendo ao mesmo tempo;
+falha se algum número sair repetido). Com PASTA numa pasta de rede testa
+também as travas do compartilhamento:
+
+    python numeracao_pendencias.py estresse [processos] [numeros] [PASTA]
+"""
+
+import atexit
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from travas_arquivo import TravaArquivo, escrever_json_atomico
+except ImportError:
+    from .travas_arquivo import TravaArquivo, escrever_json_atomico
+
+
+class AlocadorNumeros:
+    """Contador diário (AAMMDD → último sufixo) compartilhado entre clientes"""
+
+    NOME_ARQUIVO = "sequencial.json"
+    NOME_TRAVA = "sequencial.lock"
+    VERSAO_FORMATO = 1
+
+    # Quantos dias manter no arquivo de contadores
+    DIAS_MANTIDOS = 7
+
+    # Quantidade de sufixos reservados por ida ao arquivo compartilhado
+    TAMANHO_BLOCO = 10
+
+    # Alocadores compartilhados por pasta (o bloco reservado vale para o processo todo)
+    _instancias = {}
+    _instancias_lock = threading.Lock()
+
+    def __init__(self, pasta_indices, maior_sufixo_existente, tamanho_bloco=None):
+        """
+        Inicializa o alocador
+
+        Args:
+            pasta_indices: Path da pasta _INDICES
+            maior_sufixo_existente: Função (prefixo) → maior sufixo já usado no dia.
+                                    Só é chamada quando o contador do dia não existe.
+            tamanho_bloco: Sufixos reservados por vez (None = TAMANHO_BLOCO)
+        """
+        self.pasta_indices = Path(pasta_indices)
+        self.arquivo = self.pasta_indices / self.NOME_ARQUIVO
+        self.arquivo_trava = self.pasta_indices / self.NOME_TRAVA
+        self._maior_sufixo_existente = maior_sufixo_existente
+        self.tamanho_bloco = max(1, int(tamanho_bloco or self.TAMANHO_BLOCO))
+
+        # Bloco reservado atual: prefixo + próximo sufixo livre + último sufixo do bloco
+        self._bloco_prefixo = None
+        self._bloco_proximo = 0
+        self._bloco_fim = -1
+        self._lock = threading.Lock()
+
+    @classmethod
+    def obter(cls, pasta_indices, maior_sufixo_existente, tamanho_bloco=None):
+        """
+        Retorna o alocador compartilhado da pasta (um bloco por processo)
+
+        Returns:
+            AlocadorNumeros: Alocador da pasta
+        """
+        chave = str(Path(pasta_indices).resolve())
+        with cls._instancias_lock:
+            alocador = cls._instancias.get(chave)
+            if alocador is None:
+                alocador = cls(pasta_indices, maior_sufixo_existente, tamanho_bloco)
+                cls._instancias[chave] = alocador
+                atexit.register(alocador.devolver)
+            return alocador
+
+    def proximo(self, prefixo):
+        """
+        Entrega o próximo número do dia a partir do bloco reservado
+
+        Args:
+            prefixo: Data no formato AAMMDD
+
+        Returns:
+            str: Número AAMMDDSSSS
+
+        Raises:
+            TimeoutError: Se a trava do contador não puder ser obtida
+        """
+        with self._lock:
+            if self._bloco_prefixo != prefixo or self._bloco_proximo > self._bloco_fim:
+                self._reservar_bloco(prefixo)
+
+            sufixo = self._bloco_proximo
+            self._bloco_proximo += 1
+
+        return f"{prefixo}{sufixo:04d}"
+
+    def _reservar_bloco(self, prefixo):
+        """Reserva um novo bloco de sufixos no arquivo compartilhado"""
+        with TravaArquivo(self.arquivo_trava):
+            dias = self._ler_contadores()
+            ultimo = dias.get(prefixo)
+            if ultimo is None:
+                # Contador ausente: varredura de fallback (uma vez por dia)
+                ultimo = self._maior_sufixo_existente(prefixo)
+
+            inicio = int(ultimo) + 1
+            fim = inicio + self.tamanho_bloco - 1
+            dias[prefixo] = fim
+            self._gravar_contadores(dias)
+
+        self._bloco_prefixo = prefixo
+        self._bloco_proximo = inicio
+        self._bloco_fim = fim
+
+    def devolver(self):
+        """
+        Devolve os sufixos não usados do bloco atual
+
+        Só é possível se nenhum outro cliente reservou depois deste bloco;
+        caso contrário os números são simplesmente pulados.
+
+        Returns:
+            bool: True se o contador foi recuado
+        """
+        with self._lock:
+            prefixo = self._bloco_prefixo
+            if prefixo is None or self._bloco_proximo > self._bloco_fim:
+                return False
+            usados_ate = self._bloco_proximo - 1
+            fim = self._bloco_fim
+            self._bloco_prefixo = None
+
+            try:
+                with TravaArquivo(self.arquivo_trava, timeout=2.0):
+                    dias = self._ler_contadores()
+                    if dias.get(prefixo) != fim:
+                        return False
+                    dias[prefixo] = usados_ate
+                    self._gravar_contadores(dias)
+                    return True
+            except Exception as e:
+                print(f"⚠️ Não foi possível devolver números reservados: {e}")
+                return False
+
+    def _ler_contadores(self):
+        """Lê o arquivo de contadores (dict vazio se ausente ou inválido)"""
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ Contador de numeração inválido, será refeito: {e}")
+            return {}
+
+        if dados.get('versao_formato') != self.VERSAO_FORMATO:
+            return {}
+        return dict(dados.get('dias', {}))
+
+    def _gravar_contadores(self, dias):
+        """Grava os contadores mantendo apenas os dias mais recentes"""
+        recentes = sorted(dias)[-self.DIAS_MANTIDOS:]
+        dados = {
+            'versao_formato': self.VERSAO_FORMATO,
+            'dias': {dia: dias[dia] for dia in recentes},
+        }
+        escrever_json_atomico(self.arquivo, dados, ensure_ascii=False, indent=2)
+
+
+def _alocar_em_processo(pasta_indices, prefixo, quantidade, tamanho_bloco, inicio, fila):
+    """Processo do teste de estresse: aloca números, devolvendo o bloco de tempos em tempos"""
+    alocador = AlocadorNumeros(pasta_indices, lambda _: 0, tamanho_bloco)
+    while time.time() < inicio:
+        time.sleep(0.001)
+    numeros = []
+    for i in range(quantidade):
+        numeros.append(alocador.proximo(prefixo))
+        # Devolução concorrente com as reservas dos outros processos
+        if i % 7 == 6:
+            alocador.devolver()
+    alocador.devolver()
+    fila.put(numeros)
+
+
+def estressar(processos=8, numeros=200, pasta_indices=None):
+    """
+    Vários processos alocando números do mesmo dia ao mesmo tempo
+
+    Args:
+        processos: Quantidade de processos
+        numeros: Números alocados por processo
+        pasta_indices: Pasta do contador (None = pasta temporária, apagada no fim)
+
+    Returns:
+        tuple: (total de números alocados, lista de números repetidos)
+    """
+    temporaria = pasta_indices is None
+    pasta_indices = Path(tempfile.mkdtemp(prefix="nexus_numeracao_") if temporaria else pasta_indices)
+    prefixo = datetime.now().strftime("%y%m%d")
+    try:
+        fila = multiprocessing.Queue()
+        inicio = time.time() + 0.5
+        # Blocos de tamanhos diferentes: reservas e devoluções intercaladas
+        filhos = [
+            multiprocessing.Process(
+                target=_alocar_em_processo,
+                args=(pasta_indices, prefixo, numeros, 1 + i % 4, inicio, fila)
+            )
+            for i in range(processos)
+        ]
+        for filho in filhos:
+            filho.start()
+        alocados = [numero for _ in filhos for numero in fila.get()]
+        for filho in filhos:
+            filho.join()
+    finally:
+        if temporaria:
+            shutil.rmtree(pasta_indices, ignore_errors=True)
+
+    vistos = set()
+    repetidos = sorted({numero for numero in alocados if numero in vistos or vistos.add(numero)})
+    return len(alocados), repetidos
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'estresse':
+        print(f"Uso: python {Path(__file__).name} estresse [processos] [numeros] [PASTA]")
+        sys.exit(1)
+
+    processos = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    numeros = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    pasta = sys.argv[4] if len(sys.argv) > 4 else None
+    total, repetidos = estressar(processos, numeros, pasta)
+    if repetidos:
+        print(f"❌ {len(repetidos)} número(s) repetido(s) em {total}: {', '.join(repetidos[:10])}")
+        sys.exit(1)
+    print(f"✓ {total} números alocados por {processos} processos, nenhum repetido")
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+Replicação Incremental JSON → PostgreSQL
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Durante a migração as pastas JSON continuam sendo a fonte oficial e o
+schema nexus recebe uma cópia. A cada ciclo o replicador:
+
+1. Lê os eventos novos do diário (_EVENTOS) para saber quais números
+   mudaram; na primeira execução, a cada INTERVALO_VARREDURA ou se houver
+   lacuna no diário, relista as pastas de status pelo catálogo
+   (sincronizar forçado: os arquivos são regravados no lugar, então o
+   mtime da pasta não basta)
+2. Compara (pasta, tamanho, mtime_ns) de cada arquivo com a marca d'água
+3. Grava no banco só as pendências novas/alteradas/movidas, em lotes de
+   LOTE_REPLICACAO por transação, e apaga as que sumiram das pastas
+4. Após cada lote confirmado, grava a marca d'água em
+   _INDICES/replicacao_postgres.json
+
+Se o processo parar no meio, o próximo ciclo continua do último lote
+confirmado. Sem a marca (primeira execução ou arquivo apagado) tudo é
+copiado de novo; a gravação é um upsert, então repetir não duplica nada.
+
+Uso:
+    python replicacao_pendencias.py            # contínuo
+    python replicacao_pendencias.py uma-vez    # um ciclo e sai
+"""
+
+import sys
+import threading
+import time
+
+try:
+    from catalogo_pendencias import IndicePersistente, chave_stat
+    from gerenciador_pendencias_json import GerenciadorPendenciasJSON, _obter_configuracao
+except ImportError:
+    from .catalogo_pendencias import IndicePersistente, chave_stat
+    from .gerenciador_pendencias_json import GerenciadorPendenciasJSON, _obter_configuracao
+
+
+class MarcaReplicacao(IndicePersistente):
+    """Marca d'água da replicação: versão de cada pendência já copiada"""
+
+    NOME_ARQUIVO = "replicacao_postgres.json"
+    DESCRICAO = "marca de replicação"
+    # Gravada a cada lote confirmado no banco
+    INTERVALO_PERSISTENCIA = 0.0
+
+    def __init__(self, pasta_indices):
+        """
+        Inicializa a marca
+
+        Args:
+            pasta_indices: Path da pasta _INDICES
+        """
+        super().__init__(pasta_indices)
+        # numero -> [pasta, tamanho, mtime_ns] da última cópia confirmada
+        self.replicadas = {}
+        self.ultimo_ciclo = None
+        # Posição no diário de eventos até onde tudo foi copiado (None = varrer as pastas)
+        self.cursor_eventos = None
+        self.ultima_varredura = None
+        self._carregar()
+
+    def versao(self, numero):
+        """Retorna [pasta, tamanho, mtime_ns] replicado (ou None)"""
+        return self.replicadas.get(numero)
+
+    def confirmar(self, versoes, removidas=()):
+        """
+        Registra um lote confirmado no banco e grava a marca
+
+        Args:
+            versoes: Dict numero -> [pasta, tamanho, mtime_ns]
+            removidas: Números apagados do banco
+        """
+        with self._lock:
+            self.replicadas.update(versoes)
+            for numero in removidas:
+                self.replicadas.pop(numero, None)
+        self._marcar_alterado()
+
+    def concluir_ciclo(self, cursor_eventos=None, varredura=False):
+        """
+        Registra o fim de um ciclo completo
+
+        Args:
+            cursor_eventos: Posição no diário já coberta pelo ciclo (None = manter a anterior)
+            varredura: True se o ciclo relistou as pastas
+        """
+        with self._lock:
+            self.ultimo_ciclo = time.time()
+            if cursor_eventos is not None:
+                self.cursor_eventos = cursor_eventos
+            if varredura:
+                self.ultima_varredura = self.ultimo_ciclo
+        self._marcar_alterado()
+
+    def _dados_persistidos(self):
+        return {
+            'ultimo_ciclo': self.ultimo_ciclo,
+            'ultima_varredura': self.ultima_varredura,
+            'cursor_eventos': self.cursor_eventos,
+            'replicadas': dict(self.replicadas),
+        }
+
+    def _aplicar_persistidos(self, dados):
+        self.ultimo_ciclo = dados.get('ultimo_ciclo')
+        self.ultima_varredura = dados.get('ultima_varredura')
+        self.cursor_eventos = dados.get('cursor_eventos')
+        self.replicadas = dados.get('replicadas', {})
+
+
+class ReplicadorPendencias:
+    """Copia para o PostgreSQL as pendências alteradas nas pastas JSON"""
+
+    # Pendências por transação
+    LOTE_REPLICACAO = 200
+
+    # Segundos entre varreduras completas das pastas (no intervalo, só o diário de eventos)
+    INTERVALO_VARREDURA = 3600
+
+    def __init__(self, origem=None, destino=None):
+        """
+        Inicializa o replicador
+
+        Args:
+            origem: GerenciadorPendenciasJSON das pastas (None = ConfiguracaoRede)
+            destino: GerenciadorPendenciasPostgres (None = ConfiguracaoRede)
+        """
+        if destino is None:
+            try:
+                from gerenciador_pendencias_postgres import GerenciadorPendenciasPostgres
+            except ImportError:
+                from .gerenciador_pendencias_postgres import GerenciadorPendenciasPostgres
+            destino = GerenciadorPendenciasPostgres()
+
+        self.origem = origem or GerenciadorPendenciasJSON()
+        self.destino = destino
+        self.marca = MarcaReplicacao(self.origem.pasta_registros / self.origem.PASTA_INDICES)
+
+    def pendentes(self):
+        """
+        Compara as pastas (ou só os números dos eventos novos) com a marca d'água
+
+        Returns:
+            tuple: (lista de (numero, pasta, caminho) a copiar, lista de números a apagar,
+                    cursor do diário coberto por esta comparação, True se varreu as pastas)
+        """
+        diario = self.origem.diario_eventos
+        cursor = self.marca.cursor_eventos
+        if (diario is not None and cursor is not None
+                and time.time() - (self.marca.ultima_varredura or 0) < self.INTERVALO_VARREDURA):
+            eventos, cursor_novo, completo = diario.ler_novos(cursor)
+            if completo:
+                alteradas, removidas = self._pendentes_dos_eventos(eventos)
+                return alteradas, removidas, cursor_novo, False
+
+        # Posiciona antes de listar: o que for gravado durante a varredura vem no próximo ciclo
+        cursor_novo = diario.cursor_atual() if diario is not None else None
+        alteradas, removidas = self._pendentes_das_pastas()
+        return alteradas, removidas, cursor_novo, True
+
+    def _pendentes_dos_eventos(self, eventos):
+        """
+        Compara com a marca só as pendências citadas nos eventos
+
+        Returns:
+            tuple: (lista de (numero, pasta, caminho) a copiar, lista de números a apagar)
+        """
+        alteradas = []
+        removidas = []
+        for numero in sorted({evento['numero'] for evento in eventos if evento.get('numero')}):
+            arquivo, pasta = self.origem._localizar_pendencia(numero)
+            try:
+                st = arquivo.stat() if arquivo is not None else None
+            except FileNotFoundError:
+                st = None
+            if st is None:
+                if self.marca.versao(numero) is not None:
+                    removidas.append(numero)
+                continue
+            if self.marca.versao(numero) != [pasta, *chave_stat(st)]:
+                alteradas.append((numero, pasta, arquivo))
+        return alteradas, removidas
+
+    def _pendentes_das_pastas(self):
+        """
+        Compara todas as pastas (relistadas pelo catálogo) com a marca d'água
+
+        Returns:
+            tuple: (lista de (numero, pasta, caminho) a copiar, lista de números a apagar)
+        """
+        catalogo = self.origem.catalogo
+        catalogo.sincronizar(forcar=True)
+
+        entradas = catalogo.entradas_copia()
+
+        alteradas = []
+        for numero, entrada in entradas.items():
+            if self.marca.versao(numero) != [entrada['pasta'], entrada['tamanho'], entrada['mtime_ns']]:
+                alteradas.append((numero, entrada['pasta'], catalogo.pasta_registros / entrada['arquivo']))
+
+        # Empacotadas em segmentos (fora do catálogo; o arquivo solto, se existir, vale mais)
+        pasta = self.origem.PASTA_COMPACTADA
+        for registro in self.origem.segmentos.registros():
+            if registro.numero in entradas:
+                continue
+            entradas[registro.numero] = None
+            if self.marca.versao(registro.numero) != [pasta, *chave_stat(registro.stat())]:
+                alteradas.append((registro.numero, pasta, registro))
+
+        removidas = [numero for numero in list(self.marca.replicadas) if numero not in entradas]
+        # Mais antigas primeiro: um ciclo interrompido avança pela ordem de criação
+        alteradas.sort()
+        return alteradas, removidas
+
+    def _ler_lote(self, lote):
+        """
+        Lê os documentos de um lote (fora da transação)
+
+        Returns:
+            tuple: (lista de (numero, pasta, documento, versão), quantidade de erros)
+        """
+        lidos = []
+        erros = 0
+        for numero, pasta, caminho in lote:
+            try:
+                st = caminho.stat()
+                # Histórico completo: o banco guarda o diário e o final do JSON numa tabela só
+                documento = self.origem._expandir_historico(self.origem._ler_documento(caminho, st, copiar=False))
+            except FileNotFoundError:
+                # Movido/apagado desde a listagem: o próximo ciclo resolve
+                continue
+            except Exception as e:
+                print(f"❌ Erro ao ler {caminho.name} para replicação: {e}")
+                erros += 1
+                continue
+            tamanho, mtime_ns = chave_stat(st)
+            lidos.append((numero, pasta, documento, [pasta, tamanho, mtime_ns]))
+        return lidos, erros
+
+    def _gravar_lote(self, lidos):
+        """
+        Grava um lote numa transação; se falhar, grava um a um
+
+        Assim uma pendência que o banco recusa não trava o lote inteiro
+        (a marca dela não avança e o erro se repete a cada ciclo).
+
+        Returns:
+            tuple: (quantidade copiada, quantidade de erros)
+        """
+        try:
+            with self.destino._transacao() as cursor:
+                for numero, pasta, documento, _ in lidos:
+                    self.destino._gravar_documento(cursor, numero, pasta, documento)
+            self.marca.confirmar({numero: versao for numero, _, _, versao in lidos})
+            return len(lidos), 0
+        except Exception as e:
+            if len(lidos) == 1:
+                print(f"❌ Erro ao replicar {lidos[0][0]}: {e}")
+                return 0, 1
+
+        copiadas = erros = 0
+        for item in lidos:
+            copiada, falha = self._gravar_lote([item])
+            copiadas += copiada
+            erros += falha
+        return copiadas, erros
+
+    def ciclo(self):
+        """
+        Executa um ciclo de replicação
+
+        Returns:
+            dict: {'copiadas': int, 'removidas': int, 'erros': int}
+        """
+        resultado = {'copiadas': 0, 'removidas': 0, 'erros': 0}
+        alteradas, removidas, cursor_eventos, varredura = self.pendentes()
+
+        for inicio in range(0, len(alteradas), self.LOTE_REPLICACAO):
+            lidos, erros = self._ler_lote(alteradas[inicio:inicio + self.LOTE_REPLICACAO])
+            resultado['erros'] += erros
+            if not lidos:
+                continue
+            copiadas, erros = self._gravar_lote(lidos)
+            resultado['copiadas'] += copiadas
+            resultado['erros'] += erros
+
+        for inicio in range(0, len(removidas), self.LOTE_REPLICACAO):
+            lote = removidas[inicio:inicio + self.LOTE_REPLICACAO]
+            try:
+                with self.destino._transacao() as cursor:
+                    self.destino._executar(
+                        cursor, "DELETE FROM nexus.pendencias WHERE numero = ANY(%s)", [list(lote)]
+                    )
+            except Exception as e:
+                print(f"❌ Erro ao remover pendências replicadas: {e}")
+                resultado['erros'] += len(lote)
+                continue
+            self.marca.confirmar({}, lote)
+            resultado['removidas'] += len(lote)
+
+        # Com erros o cursor não avança: os mesmos eventos são conferidos no próximo ciclo
+        self.marca.concluir_ciclo(None if resultado['erros'] else cursor_eventos, varredura)
+        if resultado['copiadas'] or resultado['removidas'] or resultado['erros']:
+            print(f"✓ Replicação: {resultado['copiadas']} copiadas, {resultado['removidas']} removidas, "
+                  f"{resultado['erros']} erros")
+        return resultado
+
+    def executar(self, intervalo=None, parar=None):
+        """
+        Replica continuamente até parar ser sinalizado
+
+        Args:
+            intervalo: Segundos entre ciclos (None = ConfiguracaoRede.INTERVALO_REPLICACAO_POSTGRES)
+            parar: threading.Event que encerra o laço (None = roda até Ctrl+C)
+        """
+        if intervalo is None:
+            intervalo = _obter_configuracao('INTERVALO_REPLICACAO_POSTGRES', 30)
+        parar = parar or threading.Event()
+
+        while not parar.is_set():
+            try:
+                self.ciclo()
+            except Exception as e:
+                print(f"⚠️ Erro no ciclo de replicação: {e}")
+            parar.wait(intervalo)
+
+
+if __name__ == '__main__':
+    replicador = ReplicadorPendencias()
+    if len(sys.argv) > 1 and sys.argv[1] == 'uma-vez':
+        replicador.ciclo()
+    else:
+        try:
+            replicador.executar()
+        except KeyboardInterrupt:
+            print("✓ Replicação encerrada")
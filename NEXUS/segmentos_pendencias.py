@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Segmentos Compactados de Pendências Arquivadas
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+ARQUIVADAS só cresce, e cada "Mostrar Arquivadas" relista e relê milhares
+de arquivos pequenos pelo compartilhamento. As arquivadas há mais de
+DIAS_COMPACTAR_ARQUIVADAS dias são empacotadas num segmento por mês do
+número (AAMM):
+
+    _SEGMENTOS/ARQUIVADAS/AAMM-NNNN.seg    (NNNN = geração)
+
+Formato do segmento:
+
+    MAGICA | documento 1 (JSON compacto, zlib) | documento 2 | ...
+          | índice (zlib de {numero: [offset, tamanho, crc32]}) | rodapé
+
+O rodapé (16 bytes) diz onde está o índice. O arquivo é aberto uma vez com
+mmap; ler uma pendência é um corte no mapa + zlib.decompress, sem abrir
+arquivo nenhum na rede.
+
+Regras:
+- Segmentos nunca são alterados: uma regravação (nova compactação do mês,
+  remoção) publica a geração seguinte e apaga as anteriores quando nenhum
+  processo as estiver mapeando (no Windows um arquivo mapeado não pode ser
+  apagado; a próxima regravação tenta de novo)
+- Arquivo solto vale mais que o segmento: uma pendência empacotada que é
+  editada ou desarquivada volta a ser um arquivo solto, e a cópia do
+  segmento passa a ser ignorada (é descartada na próxima compactação do mês)
+
+Uso:
+    python segmentos_pendencias.py compactar [dias]
+"""
+
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+try:
+    from serializacao_json import carregar_json, gerar_json
+    from travas_arquivo import TravaArquivo, _publicar_novo
+except ImportError:
+    from .serializacao_json import carregar_json, gerar_json
+    from .travas_arquivo import TravaArquivo, _publicar_novo
+
+
+MAGICA = b'NXSEG01\n'
+# offset do índice, tamanho do índice, marca
+RODAPE = struct.Struct('<QI4s')
+MARCA_RODAPE = b'NXIX'
+
+_NOME_SEGMENTO = re.compile(r'^(\d{4})-(\d{4})\.seg$')
+
+
+def comprimir_documento(documento):
+    """Bytes de um documento dentro do segmento (JSON compacto + zlib)"""
+    return zlib.compress(
+        gerar_json(documento, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6
+    )
+
+
+class StatRegistro:
+    """Tamanho e versão de um documento empacotado (no lugar do os.stat_result)"""
+
+    __slots__ = ('st_size', 'st_mtime_ns')
+
+    def __init__(self, tamanho, crc):
+        self.st_size = tamanho
+        # O crc32 do conteúdo faz o papel do mtime: o mesmo documento
+        # regravado numa nova geração continua válido nos caches e índices
+        self.st_mtime_ns = crc
+
+
+class RegistroSegmento:
+    """
+    Pendência guardada num segmento (mesma interface usada do os.DirEntry)
+
+    'path' é o próprio registro: GerenciadorPendenciasJSON._ler_documento
+    reconhece o tipo e lê do segmento. str(registro) identifica o documento
+    nos caches ('.../AAMM.seg#numero', sem a geração).
+    """
+
+    __slots__ = ('name', 'numero', 'mes', '_colecao', '_stat', '_chave')
+
+    def __init__(self, colecao, numero, tamanho, crc, prefixo_chave=None):
+        self.numero = numero
+        self.mes = numero[:4]
+        self.name = f"{numero}.json"
+        self._colecao = colecao
+        self._stat = StatRegistro(tamanho, crc)
+        self._chave = f"{prefixo_chave or colecao.prefixo_chave(self.mes)}{numero}"
+
+    @property
+    def path(self):
+        return self
+
+    def stat(self):
+        """Tamanho comprimido e crc32 do documento"""
+        return self._stat
+
+    def ler(self):
+        """
+        Documento interpretado
+
+        Raises:
+            FileNotFoundError: Se o documento saiu do segmento (removido/regravado)
+        """
+        return self._colecao.ler(self.numero)
+
+    def __str__(self):
+        return self._chave
+
+    def __repr__(self):
+        return f"RegistroSegmento({self})"
+
+
+class SegmentoPendencias:
+    """Um arquivo de segmento aberto com mmap (documentos + índice de offsets)"""
+
+    def __init__(self, caminho):
+        """
+        Abre e valida o segmento
+
+        Raises:
+            ValueError: Se o arquivo não for um segmento válido
+        """
+        self.caminho = Path(caminho)
+        with open(self.caminho, 'rb') as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.indice = self._ler_indice()
+        except Exception:
+            self._mapa.close()
+            raise
+
+    def _ler_indice(self):
+        """Interpreta rodapé e índice"""
+        mapa = self._mapa
+        if len(mapa) < len(MAGICA) + RODAPE.size or mapa[:len(MAGICA)] != MAGICA:
+            raise ValueError(f"{self.caminho.name} não é um segmento de pendências")
+        inicio, tamanho, marca = RODAPE.unpack(mapa[-RODAPE.size:])
+        if marca != MARCA_RODAPE or inicio + tamanho > len(mapa) - RODAPE.size:
+            raise ValueError(f"Rodapé inválido em {self.caminho.name}")
+        return carregar_json(zlib.decompress(mapa[inicio:inicio + tamanho]))
+
+    def bruto(self, numero):
+        """Bytes comprimidos de um documento (KeyError se não estiver no segmento)"""
+        offset, tamanho, _ = self.indice[numero]
+        return self._mapa[offset:offset + tamanho]
+
+    def fechar(self):
+        """Libera o mapa (o arquivo pode então ser apagado)"""
+        self._mapa.close()
+
+    @staticmethod
+    def escrever(caminho, registros, sincronizar=False):
+        """
+        Grava um segmento novo (temporário + publicação sem sobrescrever)
+
+        Args:
+            caminho: Path do segmento (não pode existir)
+            registros: Dict numero -> bytes comprimidos (ver comprimir_documento)
+            sincronizar: fsync antes de publicar
+
+        Raises:
+            FileExistsError: Se o caminho já existir
+        """
+        caminho = Path(caminho)
+        temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        indice = {}
+        try:
+            with open(temporario, 'wb') as f:
+                f.write(MAGICA)
+                offset = len(MAGICA)
+                for numero in sorted(registros):
+                    dados = registros[numero]
+                    f.write(dados)
+                    indice[numero] = [offset, len(dados), zlib.crc32(dados)]
+                    offset += len(dados)
+                dados_indice = zlib.compress(
+                    gerar_json(indice, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+                f.write(dados_indice)
+                f.write(RODAPE.pack(offset, len(dados_indice), MARCA_RODAPE))
+                if sincronizar:
+                    f.flush()
+                    os.fsync(f.fileno())
+            _publicar_novo(temporario, caminho)
+        except BaseException:
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
+            raise
+
+
+class SegmentosPendencias:
+    """Segmentos mensais de uma pasta de status, com a geração mais recente de cada mês aberta"""
+
+    # Listagem feita a menos de N segundos do mtime da pasta não é definitiva
+    # (resolução do mtime em compartilhamentos de rede)
+    MARGEM_MTIME = 2.0
+
+    _instancias = {}
+    _instancias_lock = threading.Lock()
+
+    def __init__(self, pasta, sincronizar=False):
+        """
+        Inicializa a coleção
+
+        Args:
+            pasta: Path de _SEGMENTOS/<PASTA>
+            sincronizar: fsync ao gravar segmentos
+        """
+        self.pasta = Path(pasta)
+        self.sincronizar = bool(sincronizar)
+        # mes -> SegmentoPendencias (geração mais recente)
+        self._segmentos = {}
+        self._mtime_pasta = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def obter(cls, pasta, sincronizar=False):
+        """Retorna a coleção compartilhada do processo para a pasta (os mapas são reaproveitados)"""
+        chave = str(Path(pasta).resolve())
+        with cls._instancias_lock:
+            colecao = cls._instancias.get(chave)
+            if colecao is None:
+                colecao = cls(pasta, sincronizar)
+                cls._instancias[chave] = colecao
+            return colecao
+
+    def prefixo_chave(self, mes):
+        """Início de str(registro) dos documentos de um mês"""
+        return f"{self.pasta / mes}.seg#"
+
+    def _geracoes(self):
+        """
+        Segmentos existentes por mês
+
+        Returns:
+            dict: mes -> lista de (geração, Path), da mais antiga para a mais nova
+        """
+        geracoes = {}
+        try:
+            entradas = list(os.scandir(self.pasta))
+        except FileNotFoundError:
+            return {}
+        for entrada in entradas:
+            nome = _NOME_SEGMENTO.match(entrada.name)
+            if nome:
+                geracoes.setdefault(nome.group(1), []).append((int(nome.group(2)), Path(entrada.path)))
+        for lista in geracoes.values():
+            lista.sort()
+        return geracoes
+
+    def _atualizar(self, forcar=False):
+        """Abre a geração mais recente de cada mês (só relista se a pasta mudou)"""
+        try:
+            mtime = os.stat(self.pasta).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if (not forcar and mtime == self._mtime_pasta and mtime is not None
+                and time.time() - mtime / 1e9 > self.MARGEM_MTIME):
+            return
+
+        recentes = {mes: lista[-1][1] for mes, lista in self._geracoes().items()}
+        for mes in list(self._segmentos):
+            if recentes.get(mes) != self._segmentos[mes].caminho:
+                self._segmentos.pop(mes).fechar()
+        for mes, caminho in recentes.items():
+            if mes in self._segmentos:
+                continue
+            try:
+                self._segmentos[mes] = SegmentoPendencias(caminho)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Segmento {caminho.name} ignorado: {e}")
+        self._mtime_pasta = mtime
+
+    def localizar(self, numero):
+        """
+        Registro de uma pendência empacotada
+
+        Returns:
+            RegistroSegmento: Registro ou None se o número não está em nenhum segmento
+        """
+        numero = str(numero)
+        with self._lock:
+            self._atualizar()
+            segmento = self._segmentos.get(numero[:4])
+            entrada = segmento.indice.get(numero) if segmento else None
+        if entrada is None:
+            return None
+        return RegistroSegmento(self, numero, entrada[1], entrada[2])
+
+    def registros(self, mes_inicio=None, mes_fim=None):
+        """
+        Registros de todas as pendências empacotadas
+
+        Args:
+            mes_inicio: AAMM mínimo (None = sem limite)
+            mes_fim: AAMM máximo (None = sem limite)
+
+        Returns:
+            list: RegistroSegmento em ordem de número
+        """
+        registros = []
+        with self._lock:
+            self._atualizar()
+            for mes in sorted(self._segmentos):
+                if (mes_inicio and mes < mes_inicio) or (mes_fim and mes > mes_fim):
+                    continue
+                prefixo = self.prefixo_chave(mes)
+                for numero, (_, tamanho, crc) in sorted(self._segmentos[mes].indice.items()):
+                    registros.append(RegistroSegmento(self, numero, tamanho, crc, prefixo))
+        return registros
+
+    def ler(self, numero):
+        """
+        Documento de uma pendência empacotada
+
+        Raises:
+            FileNotFoundError: Se o número não estiver no segmento atual do mês
+        """
+        numero = str(numero)
+        with self._lock:
+            segmento = self._segmentos.get(numero[:4])
+            try:
+                dados = segmento.bruto(numero) if segmento else None
+            except KeyError:
+                dados = None
+        if dados is None:
+            raise FileNotFoundError(f"{numero} não está em {self.pasta}")
+        return carregar_json(zlib.decompress(dados))
+
+    def trava(self, mes):
+        """Trava de regravação dos segmentos de um mês (compactação/remoção)"""
+        return TravaArquivo(self.pasta / f"{mes}.lock")
+
+    def brutos(self, mes):
+        """
+        Documentos do segmento atual do mês, ainda comprimidos (para regravar)
+
+        Returns:
+            dict: numero -> bytes
+        """
+        with self._lock:
+            self._atualizar(forcar=True)
+            segmento = self._segmentos.get(mes)
+            if segmento is None:
+                return {}
+            return {numero: bytes(segmento.bruto(numero)) for numero in segmento.indice}
+
+    def gravar(self, mes, registros):
+        """
+        Publica a próxima geração do mês e apaga as anteriores (chamar com trava(mes))
+
+        Args:
+            mes: AAMM
+            registros: Dict numero -> bytes comprimidos (vazio = mês sem documentos)
+        """
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        anteriores = self._geracoes().get(mes, [])
+        if not registros and not anteriores:
+            return
+        # Sempre uma geração nova, mesmo vazia: é ela que esconde as anteriores.
+        # Apagá-las é só limpeza (no Windows falha enquanto outro processo as mapeia)
+        geracao = anteriores[-1][0] + 1 if anteriores else 1
+        caminho_novo = self.pasta / f"{mes}-{geracao:04d}.seg"
+        SegmentoPendencias.escrever(caminho_novo, registros, self.sincronizar)
+
+        restantes = 0
+        for _, caminho in anteriores:
+            try:
+                caminho.unlink()
+            except PermissionError:
+                # Ainda mapeado por outro processo (Windows): fica para a próxima regravação
+                restantes += 1
+            except FileNotFoundError:
+                pass
+        if not registros and not restantes:
+            # Nenhuma geração anterior sobrou para esconder: o segmento vazio pode sair
+            try:
+                caminho_novo.unlink()
+            except OSError:
+                pass
+
+        with self._lock:
+            self._atualizar(forcar=True)
+
+    def remover(self, numero):
+        """Tira uma pendência do segmento do seu mês (regrava o mês sem ela)"""
+        numero = str(numero)
+        mes = numero[:4]
+        with self.trava(mes):
+            registros = self.brutos(mes)
+            if registros.pop(numero, None) is not None:
+                self.gravar(mes, registros)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'compactar':
+        print(f"Uso: python {Path(__file__).name} compactar [dias]")
+        sys.exit(1)
+
+    try:
+        from gerenciador_pendencias_json import GerenciadorPendenciasJSON
+    except ImportError:
+        from .gerenciador_pendencias_json import GerenciadorPendenciasJSON
+    dias = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    GerenciadorPendenciasJSON().compactar_arquivadas(dias)
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+Serialização JSON (orjson/msgspec quando instalados)
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+json.loads/json.dumps dominam a CPU de listar_pendencias e de
+normalizar_registros em pastas grandes; com indent=2 o json da biblioteca
+padrão nem usa o codificador em C. Este módulo usa orjson ou msgspec
+quando um deles está instalado e o json da biblioteca padrão caso
+contrário (ConfiguracaoRede.SERIALIZADOR_JSON).
+
+O texto gerado é byte a byte o mesmo do json.dumps (ensure_ascii=False,
+com indent=2 ou separators=(',', ':')): computadores sem as bibliotecas
+continuam lendo e gravando os mesmos arquivos. Onde os formatos divergem
+o json da biblioteca padrão decide:
+
+- Gravação: floats em notação exponencial (1e-05 x 0.00001), NaN/Infinity,
+  chaves não-texto, tipos que só o acelerador aceita (datetime...). A saída
+  rápida é conferida (relida e comparada com o original) e descartada se
+  não bater.
+- Leitura: BOM, NaN, inteiros enormes, surrogates soltos. O acelerador
+  recusa (ou, no caso do orjson e de inteiros com 19+ dígitos, nem é
+  tentado) e o json.loads lê.
+
+Conferência dos aceleradores instalados contra o json (casos de divergência):
+
+    python serializacao_json.py conferir
+
+Vazão de carregar_json/gerar_json de cada biblioteca instalada contra o json
+(documentos de pendência gerados, no formato gravado em disco):
+
+    python serializacao_json.py medir [quantidade]
+"""
+
+import json
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+SERIALIZADORES = ('auto', 'orjson', 'msgspec', 'json')
+
+# Conferências com bytes.translate + 'in' (em C): expressões regulares custam mais
+# que a própria interpretação nestes documentos cheios de datas
+_DIGITOS = bytes.maketrans(b'123456789', b'000000000')
+# Floats que o json escreve em notação exponencial (|x| < 1e-4 ou >= 1e16) e o acelerador
+# escreve de outro jeito (1e-05 x 0.00001, 1e+16 x 1e16). Texto parecido só custa o fallback.
+_EXPOENTES = (b'0e0', b'0e-0', b'0e+0', b'0E0', b'0E-0', b'0E+0', b'0' * 17 + b'.')
+# Inteiro fora de [-2**63, 2**64): o orjson lê como float. Já com 19 dígitos
+# (-9999999999999999999 < -2**63); a conferência do sinal e do valor custaria mais
+_INTEIRO_LONGO = b'0' * 19
+
+_serializador = 'json'
+_gerar = None
+_carregar = None
+
+
+def _gerar_orjson(dados, indentado):
+    return orjson.dumps(dados, option=orjson.OPT_INDENT_2 if indentado else 0)
+
+
+def _carregar_orjson(dados):
+    if isinstance(dados, str):
+        dados = dados.encode('utf-8')
+    if _INTEIRO_LONGO in dados.translate(_DIGITOS):
+        return json.loads(dados)
+    return orjson.loads(dados)
+
+
+def _gerar_msgspec(dados, indentado):
+    saida = msgspec.json.encode(dados)
+    return msgspec.json.format(saida, indent=2) if indentado else saida
+
+
+def _carregar_msgspec(dados):
+    return msgspec.json.decode(dados)
+
+
+def _float_divergente(saida):
+    """True se a saída do acelerador pode ter um float escrito diferente do json"""
+    if b'0.0000' in saida:
+        return True
+    normalizada = saida.translate(_DIGITOS)
+    return any(expoente in normalizada for expoente in _EXPOENTES)
+
+
+def usar_serializador(nome='auto'):
+    """
+    Escolhe a biblioteca usada por gerar_json/carregar_json
+
+    Args:
+        nome: 'auto' (msgspec, orjson ou json, o primeiro instalado), 'orjson',
+              'msgspec' ou 'json'. Uma biblioteca pedida e não instalada vira 'json'.
+
+    Returns:
+        str: Biblioteca em uso
+    """
+    global _serializador, _gerar, _carregar
+    nome = str(nome or 'auto').lower()
+    if nome not in SERIALIZADORES:
+        print(f"⚠️ Serializador JSON '{nome}' desconhecido, usando 'auto'")
+        nome = 'auto'
+
+    # msgspec primeiro: lê mais rápido e não precisa conferir inteiros longos
+    if nome in ('auto', 'msgspec') and msgspec is not None:
+        _serializador, _gerar, _carregar = 'msgspec', _gerar_msgspec, _carregar_msgspec
+    elif nome in ('auto', 'orjson') and orjson is not None:
+        _serializador, _gerar, _carregar = 'orjson', _gerar_orjson, _carregar_orjson
+    else:
+        _serializador, _gerar, _carregar = 'json', None, None
+    return _serializador
+
+
+def serializador_em_uso():
+    """Nome da biblioteca em uso ('orjson', 'msgspec' ou 'json')"""
+    return _serializador
+
+
+def _forma_rapida(opcoes_json):
+    """True (indent=2), False (compacto) ou None (só o json produz essa saída)"""
+    if opcoes_json.get('ensure_ascii', True) is not False:
+        return None
+    resto = {chave: valor for chave, valor in opcoes_json.items() if chave != 'ensure_ascii'}
+    if resto == {'indent': 2}:
+        return True
+    if resto == {'separators': (',', ':')}:
+        return False
+    return None
+
+
+def gerar_json(dados, **opcoes_json):
+    """
+    Mesmo texto que json.dumps(dados, **opcoes_json)
+
+    Args:
+        dados: Objeto serializável
+        **opcoes_json: Opções do json.dumps (ensure_ascii=False com indent=2 ou
+                       separators=(',', ':') usam o acelerador)
+
+    Returns:
+        str: JSON
+    """
+    indentado = _forma_rapida(opcoes_json)
+    if _gerar is not None and indentado is not None:
+        try:
+            saida = _gerar(dados, indentado)
+            if not _float_divergente(saida) and _carregar(saida) == dados:
+                return saida.decode('utf-8')
+        except Exception:
+            pass
+    return json.dumps(dados, **opcoes_json)
+
+
+def carregar_json(dados):
+    """
+    Mesmo resultado que json.loads(dados)
+
+    Args:
+        dados: bytes ou str
+
+    Raises:
+        ValueError: JSON inválido (json.JSONDecodeError, como no json.loads)
+    """
+    if _carregar is not None:
+        try:
+            return _carregar(dados)
+        except Exception:
+            pass
+    return json.loads(dados)
+
+
+def _configurar():
+    """Aplica ConfiguracaoRede.SERIALIZADOR_JSON (padrão 'auto')"""
+    try:
+        from config_rede import ConfiguracaoRede
+    except ImportError:
+        try:
+            from .config_rede import ConfiguracaoRede
+        except ImportError:
+            ConfiguracaoRede = None
+    usar_serializador(getattr(ConfiguracaoRede, 'SERIALIZADOR_JSON', 'auto'))
+
+
+# Documentos em que os formatos divergem (ver docstring do módulo)
+_CASOS_CONFERENCIA = [
+    {'numero': '2610180001', 'total': 1234.5, 'itens': [1, -2, 0, 3.25], 'texto': 'ação — "aspas"\n'},
+    {'pequeno': 1e-05, 'grande': 1e16, 'limite': 1e+22, 'negativo': -0.0001, 'zero': 0.0, 'menos_zero': -0.0},
+    {'i64': -2 ** 63, 'u64': 2 ** 64 - 1, 'alem_i64': -2 ** 63 - 1, 'alem_u64': 2 ** 64,
+     'negativo_19': -9999999999999999999, 'positivo_19': 9999999999999999999, 'longo': 10 ** 30},
+    {'lista': [], 'objeto': {}, 'nulo': None, 'booleanos': [True, False], 'unicode': '\u00e7\U0001F600'},
+]
+_TEXTOS_CONFERENCIA = [
+    b'{"a": -9999999999999999999}', b'{"a": -9223372036854775809}', b'{"a": 18446744073709551616}',
+    b'{"a": 123456789012345678901234567890}', b'{"a": NaN, "b": Infinity}', b'\xef\xbb\xbf{"a": 1}',
+    b'{"a": 1e400}', b'{"a": "\\ud800"}', b'{"a": 1.0E-5, "b": -0}',
+]
+
+
+def conferir():
+    """
+    Compara gerar_json/carregar_json de cada biblioteca instalada com o json
+
+    Returns:
+        list: Divergências encontradas (vazia = compatível)
+    """
+    anterior = _serializador
+    divergencias = []
+    try:
+        for nome in SERIALIZADORES[1:]:
+            if usar_serializador(nome) != nome:
+                continue
+            for dados in _CASOS_CONFERENCIA:
+                for opcoes in ({'indent': 2}, {'separators': (',', ':')}):
+                    esperado = json.dumps(dados, ensure_ascii=False, **opcoes)
+                    if gerar_json(dados, ensure_ascii=False, **opcoes) != esperado:
+                        divergencias.append((nome, 'gerar_json', esperado))
+                    if repr(carregar_json(esperado.encode('utf-8'))) != repr(dados):
+                        divergencias.append((nome, 'carregar_json', esperado))
+            for texto in _TEXTOS_CONFERENCIA:
+                try:
+                    esperado = repr(json.loads(texto))
+                except ValueError as e:
+                    esperado = type(e).__name__
+                try:
+                    obtido = repr(carregar_json(texto))
+                except ValueError as e:
+                    obtido = type(e).__name__
+                if obtido != esperado:
+                    divergencias.append((nome, 'carregar_json', texto))
+    finally:
+        usar_serializador(anterior)
+    return divergencias
+
+
+def medir(quantidade=10000, repeticoes=3):
+    """
+    Tempo de carregar_json e gerar_json (indent=2) sobre `quantidade` documentos
+
+    Returns:
+        list: Dicts {'serializador', 'carregar_s', 'gerar_s'} (o json primeiro)
+    """
+    try:
+        from formato_pendencias import corpus_sintetico
+    except ImportError:
+        from .formato_pendencias import corpus_sintetico
+    documentos = corpus_sintetico(quantidade, entradas_historico=10)
+    textos = [json.dumps(documento, ensure_ascii=False, indent=2).encode('utf-8') for documento in documentos]
+
+    anterior = _serializador
+    resultados = []
+    try:
+        for nome in ('json',) + SERIALIZADORES[1:3]:
+            if usar_serializador(nome) != nome:
+                continue
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                for texto in textos:
+                    carregar_json(texto)
+            carregar = (time.perf_counter() - inicio) / repeticoes
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                for documento in documentos:
+                    gerar_json(documento, ensure_ascii=False, indent=2)
+            gerar = (time.perf_counter() - inicio) / repeticoes
+            resultados.append({'serializador': nome, 'carregar_s': carregar, 'gerar_s': gerar})
+    finally:
+        usar_serializador(anterior)
+    return resultados
+
+
+_configurar()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ('conferir', 'medir'):
+        print("Uso: python serializacao_json.py conferir")
+        print("     python serializacao_json.py medir [quantidade]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'medir':
+        quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        resultados = medir(quantidade)
+        carregar_json_s, gerar_json_s = resultados[0]['carregar_s'], resultados[0]['gerar_s']
+        print(f"{quantidade} documentos (média de 3 rodadas)")
+        print(f"{'biblioteca':10} {'carregar s':>10} {'docs/s':>8} {'gerar s':>8} {'docs/s':>8}")
+        for linha in resultados:
+            print(f"{linha['serializador']:10} {linha['carregar_s']:10.3f} {quantidade / linha['carregar_s']:8.0f} "
+                  f"{linha['gerar_s']:8.3f} {quantidade / linha['gerar_s']:8.0f}  "
+                  f"({carregar_json_s / linha['carregar_s']:.1f}x / {gerar_json_s / linha['gerar_s']:.1f}x)")
+        sys.exit(0)
+
+    instalados = [nome for nome, modulo in (('orjson', orjson), ('msgspec', msgspec)) if modulo is not None]
+    print(f"Bibliotecas instaladas: {', '.join(instalados) or 'nenhuma'} (em uso: {serializador_em_uso()})")
+    falhas = conferir()
+    for nome, funcao, caso in falhas:
+        print(f"❌ {nome}.{funcao}: {caso!r}")
+    if falhas:
+        sys.exit(1)
+    print("✓ Mesmos resultados do json em todos os casos")
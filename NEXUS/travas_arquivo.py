@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+Travas de Arquivo para Acesso Multi-usuário
+Sistema de Propostas Comerciais - Olivo Guindastes
+
+Trava exclusiva baseada em arquivo de lock criado com O_EXCL, que funciona
+igual em disco local e em compartilhamento de rede (SMB), sem depender de
+fcntl/msvcrt. Locks abandonados (programa fechado no meio da operação)
+expiram após alguns segundos.
+
+Cada aquisição grava um token único no lock. Um lock só é apagado (ao
+liberar ou por estar abandonado) depois de renomeado para o lado e
+conferido o token: um lock com o token de outro dono nunca é apagado, e
+sim devolvido ao lugar. Enquanto ele está de lado (só quando o lock foi
+trocado entre a leitura do token e a renomeação) um terceiro processo
+pode adquirir a trava ao mesmo tempo que o dono; a devolução espera esse
+terceiro liberar.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+
+try:
+    from serializacao_json import gerar_json
+except ImportError:
+    from .serializacao_json import gerar_json
+
+
+class TravaArquivo:
+    """Trava exclusiva entre processos/computadores via arquivo .lock"""
+
+    def __init__(self, caminho, timeout=10.0, expiracao=30.0, intervalo=0.05):
+        """
+        Inicializa a trava
+
+        Args:
+            caminho: Path do arquivo de lock
+            timeout: Segundos aguardando a trava antes de desistir
+            expiracao: Idade (segundos) a partir da qual um lock é considerado abandonado
+            intervalo: Pausa entre tentativas
+        """
+        self.caminho = Path(caminho)
+        self.timeout = timeout
+        self.expiracao = expiracao
+        self.intervalo = intervalo
+        self._adquirida = False
+        self._token = None
+
+    def adquirir(self):
+        """
+        Adquire a trava (bloqueia até conseguir ou estourar o timeout)
+
+        Raises:
+            TimeoutError: Se não conseguir a trava dentro do timeout
+        """
+        limite = time.monotonic() + self.timeout
+        dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}".encode('utf-8')
+
+        while True:
+            try:
+                fd = os.open(self.caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                try:
+                    os.write(fd, dono)
+                finally:
+                    os.close(fd)
+                self._adquirida = True
+                self._token = dono
+                return
+            except FileExistsError:
+                self._remover_se_abandonada()
+            except FileNotFoundError:
+                self.caminho.parent.mkdir(parents=True, exist_ok=True)
+                continue
+
+            if time.monotonic() >= limite:
+                raise TimeoutError(f"Trava ocupada: {self.caminho.name}")
+            time.sleep(self.intervalo)
+
+    def liberar(self):
+        """Libera a trava (se adquirida e ainda for deste dono)"""
+        if not self._adquirida:
+            return
+        self._adquirida = False
+        token, self._token = self._token, None
+        # Segurada além da expiração: o lock pode já ser de outro dono
+        if self._ler_token() != token or not self._remover_lock(token):
+            print(f"⚠️ Trava {self.caminho.name} expirou e foi assumida por outro processo")
+
+    def _ler_token(self):
+        """Conteúdo do lock (None se não existir)"""
+        try:
+            with open(self.caminho, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _remover_se_abandonada(self):
+        """Remove o lock se ele for mais antigo que o tempo de expiração"""
+        token = self._ler_token()
+        try:
+            idade = time.time() - os.stat(self.caminho).st_mtime
+        except OSError:
+            return
+        if token is not None and idade > self.expiracao and self._remover_lock(token):
+            print(f"⚠️ Trava abandonada removida: {self.caminho.name}")
+
+    def _remover_lock(self, token, tentativas=10):
+        """
+        Apaga o lock só se ele ainda tiver o token informado
+
+        Renomeia o lock para o lado (atômico) e confere o token no arquivo
+        renomeado. Se outro dono criou um lock novo depois da leitura do
+        token, o lock é devolvido (ver _devolver_lock), nunca apagado.
+
+        Returns:
+            bool: True se o lock com o token foi apagado
+        """
+        de_lado = self.caminho.with_name(f".{self.caminho.name}.{uuid.uuid4().hex}.removendo")
+        for tentativa in range(tentativas):
+            try:
+                os.rename(self.caminho, de_lado)
+                break
+            except PermissionError:
+                # Windows: outro processo está lendo o lock neste instante
+                if tentativa == tentativas - 1:
+                    return False
+                time.sleep(self.intervalo)
+            except OSError:
+                return False
+
+        try:
+            with open(de_lado, 'rb') as f:
+                removido = f.read() == token
+        except OSError:
+            removido = False
+        if not removido:
+            self._devolver_lock(de_lado)
+            return False
+        try:
+            os.unlink(de_lado)
+        except OSError:
+            pass
+        return True
+
+    def _devolver_lock(self, de_lado):
+        """
+        Recoloca no lugar um lock de outro dono renomeado por engano
+
+        Sem sobrescrever: se um terceiro adquiriu a trava enquanto o lock
+        estava de lado, espera ele liberar (até o timeout). Se não der, o
+        arquivo fica de lado (com o token do dono) e é avisado.
+        """
+        limite = time.monotonic() + self.timeout
+        while True:
+            try:
+                _publicar_novo(de_lado, self.caminho)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                pass
+            try:
+                # Link feito, só a remoção do nome de lado falhou
+                if os.path.samefile(de_lado, self.caminho):
+                    os.unlink(de_lado)
+                    return
+            except OSError:
+                pass
+            if time.monotonic() >= limite:
+                print(f"⚠️ Trava {self.caminho.name} de outro processo não pôde ser devolvida "
+                      f"(ficou em {de_lado.name})")
+                return
+            time.sleep(self.intervalo)
+
+    def __enter__(self):
+        self.adquirir()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.liberar()
+        return False
+
+
+def escrever_json_atomico(caminho, dados, sincronizar=False, modo='substituir', **opcoes_json):
+    """
+    Grava JSON em arquivo temporário na mesma pasta e substitui com os.replace
+
+    Leitores concorrentes veem o arquivo antigo ou o novo, nunca um parcial.
+
+    Args:
+        caminho: Path do arquivo de destino
+        dados: Objeto serializável
+        sincronizar: Se True, força o conteúdo para o disco (fsync) antes de publicar
+        modo: 'substituir' (cria ou sobrescreve), 'criar' (só se não existir) ou
+              'atualizar' (só se já existir)
+        **opcoes_json: Opções do json.dumps (ver serializacao_json.gerar_json)
+
+    Raises:
+        FileExistsError: modo='criar' e o arquivo já existe
+        FileNotFoundError: modo='atualizar' e o arquivo não existe
+    """
+    _escrever_atomico(caminho, lambda f: f.write(gerar_json(dados, **opcoes_json)), False, sincronizar, modo)
+
+
+def escrever_bytes_atomico(caminho, dados, sincronizar=False, modo='substituir'):
+    """
+    Igual a escrever_json_atomico, para conteúdo já serializado
+
+    Args:
+        caminho: Path do arquivo de destino
+        dados: bytes a gravar
+        sincronizar: Se True, força o conteúdo para o disco (fsync) antes de publicar
+        modo: 'substituir', 'criar' ou 'atualizar' (ver escrever_json_atomico)
+    """
+    _escrever_atomico(caminho, lambda f: f.write(dados), True, sincronizar, modo)
+
+
+def _escrever_atomico(caminho, gravar, binario, sincronizar, modo):
+    """Temporário na mesma pasta (gravar(f) escreve o conteúdo) + publicação conforme o modo"""
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with (open(temporario, 'wb') if binario else open(temporario, 'w', encoding='utf-8')) as f:
+            gravar(f)
+            if sincronizar:
+                f.flush()
+                os.fsync(f.fileno())
+
+        if modo == 'criar':
+            _publicar_novo(temporario, caminho)
+        else:
+            if modo == 'atualizar':
+                # Removido/movido por outro computador: não recriar no lugar antigo
+                os.stat(caminho)
+            substituir_arquivo(temporario, caminho)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
+
+
+def substituir_arquivo(temporario, caminho, tentativas=10, intervalo=0.05):
+    """
+    os.replace com novas tentativas (também usado para mover entre pastas)
+
+    No Windows a substituição falha (PermissionError) enquanto outro
+    processo está com o destino aberto para leitura; a leitura é curta,
+    então basta tentar de novo.
+    """
+    for tentativa in range(tentativas):
+        try:
+            os.replace(temporario, caminho)
+            return
+        except PermissionError:
+            if tentativa == tentativas - 1:
+                raise
+            time.sleep(intervalo)
+
+
+def _publicar_novo(temporario, caminho):
+    """
+    Publica o temporário em caminho sem sobrescrever (FileExistsError se existir)
+
+    os.link é atômico e falha se o destino existir. Onde não há hard link
+    (alguns compartilhamentos), verifica a existência e substitui.
+    """
+    try:
+        os.link(temporario, caminho)
+    except FileExistsError:
+        raise
+    except OSError:
+        if os.path.exists(caminho):
+            raise FileExistsError(str(caminho))
+        substituir_arquivo(temporario, caminho)
+        return
+    os.unlink(temporario)